@@ -0,0 +1,158 @@
+# app/compression.py
+
+import zlib
+from typing import List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# wbits selecting the container for each coding
+_WBITS = {"gzip": 16 + zlib.MAX_WBITS, "deflate": zlib.MAX_WBITS}
+_COMPRESSIBLE = ("text/", "application/json", "application/javascript", "application/xml")
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """The coding to use for an ``Accept-Encoding`` value: gzip, deflate or None."""
+    best, best_q = None, 0.0
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding == "*":
+            coding = best or "gzip"
+        # on a tie the earlier of gzip/deflate in _WBITS wins
+        if coding in _WBITS and (q > best_q or (q == best_q and q > 0 and coding == "gzip")):
+            best, best_q = coding, q
+    return best if best_q > 0 else None
+
+
+def _weak(etag: str) -> str:
+    return etag if etag.startswith("W/") else "W/" + etag
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware for ``Accept-Encoding`` negotiated gzip/deflate.
+
+    Ordinary responses are compressed once the body reaches ``min_size``
+    bytes; smaller ones, and bodies already encoded or of binary types,
+    pass through untouched. ``text/event-stream`` responses get one
+    compressor for the whole stream with a ``Z_SYNC_FLUSH`` after every
+    event, so each event reaches the client as soon as it is sent instead
+    of waiting in the compressor's window. Strong ETags become weak on
+    compressed responses, since the bytes differ from the identity form.
+    """
+
+    def __init__(self, app: ASGIApp, min_size: int = 1024, level: int = 6, sse: bool = True):
+        self.app = app
+        self.min_size = min_size
+        self.level = level
+        self.sse = sse
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressingSend(self, coding, send).run(scope, receive)
+
+
+class _CompressingSend:
+    def __init__(self, mw: CompressionMiddleware, coding: str, send: Send):
+        self.mw = mw
+        self.coding = coding
+        self.send = send
+        self.start: Optional[Message] = None
+        self.mode = ""  # "" undecided, "identity", "buffer", "stream"
+        self.pending: List[bytes] = []
+        self.pending_size = 0
+        self.compressor = None
+
+    async def run(self, scope: Scope, receive: Receive) -> None:
+        await self.mw.app(scope, receive, self)
+
+    def _eligible(self, headers: Headers) -> Tuple[bool, bool]:
+        """(compress at all, as an event stream)"""
+        if "content-encoding" in headers or self.start["status"] in (204, 304):
+            return False, False
+        content_type = headers.get("content-type", "")
+        if content_type.startswith("text/event-stream"):
+            return self.mw.sse, True
+        if not content_type.startswith(_COMPRESSIBLE) and not content_type.endswith("+json"):
+            return False, False
+        length = headers.get("content-length")
+        if length is not None and int(length) < self.mw.min_size:
+            return False, False
+        return True, False
+
+    def _begin(self) -> MutableHeaders:
+        self.compressor = zlib.compressobj(self.mw.level, zlib.DEFLATED, _WBITS[self.coding])
+        headers = MutableHeaders(raw=list(self.start["headers"]))
+        headers["Content-Encoding"] = self.coding
+        headers.add_vary_header("Accept-Encoding")
+        if "etag" in headers:
+            headers["ETag"] = _weak(headers["etag"])
+        del headers["content-length"]
+        self.start["headers"] = headers.raw
+        return headers
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            compress, stream = self._eligible(Headers(raw=message["headers"]))
+            if not compress:
+                self.mode = "identity"
+                await self.send(message)
+            elif stream:
+                self.mode = "stream"
+                self._begin()
+                await self.send(self.start)
+            else:
+                self.mode = "buffer"
+            return
+        if message["type"] != "http.response.body" or self.mode == "identity":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more = message.get("more_body", False)
+        if self.mode == "stream":
+            chunk = self.compressor.compress(body)
+            chunk += self.compressor.flush(zlib.Z_SYNC_FLUSH if more else zlib.Z_FINISH)
+            await self.send({"type": "http.response.body", "body": chunk, "more_body": more})
+            return
+
+        # buffer until we know the body is worth compressing
+        self.pending.append(body)
+        self.pending_size += len(body)
+        if self.compressor is None:
+            if not more and self.pending_size < self.mw.min_size:
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": b"".join(self.pending)})
+                return
+            if self.pending_size < self.mw.min_size:
+                return
+            headers = self._begin()
+            if not more:
+                data = self.compressor.compress(b"".join(self.pending)) + self.compressor.flush()
+                headers["Content-Length"] = str(len(data))
+                self.start["headers"] = headers.raw
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": data})
+                return
+            await self.send(self.start)
+        data = self.compressor.compress(b"".join(self.pending))
+        self.pending.clear()
+        if not more:
+            data += self.compressor.flush()
+        if data or not more:
+            await self.send({"type": "http.response.body", "body": data, "more_body": more})
@@ -0,0 +1,127 @@
+# app/config.py
+
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.environ.get(name, default))
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# ─── CANDIDATE SEARCH CACHE ──────────────────────────────────────────
+# Set MCP_SEARCH_CACHE_SIZE=0 to disable the cache entirely.
+SEARCH_CACHE_SIZE = _env_int("MCP_SEARCH_CACHE_SIZE", 1024)
+SEARCH_CACHE_TTL = _env_float("MCP_SEARCH_CACHE_TTL", 60.0)
+SEARCH_CACHE_MAX_ROWS = _env_int("MCP_SEARCH_CACHE_MAX_ROWS", 10_000)
+SEARCH_CACHE_EXPERIENCE_BUCKET = _env_int("MCP_SEARCH_CACHE_EXPERIENCE_BUCKET", 5)
+# ──────────────────────────────────────────────────────────────────────
+
+# ─── CONTEXT NODE STORE ──────────────────────────────────────────────
+# "memory" (per-process) or "sqlite:///path/to/contexts.db" to share the
+# registry between uvicorn workers and keep it across restarts.
+CONTEXT_STORE_URL = os.environ.get("MCP_CONTEXT_STORE", "memory")
+# ──────────────────────────────────────────────────────────────────────
+
+# ─── FREE-TEXT CANDIDATE SEARCH ──────────────────────────────────────
+# Keep an inverted index over candidate profiles next to the main index.
+TEXT_INDEX_ENABLED = _env_bool("MCP_TEXT_INDEX", True)
+# ──────────────────────────────────────────────────────────────────────
+
+# ─── CANDIDATE SNAPSHOT ──────────────────────────────────────────────
+# Path to a snapshot built with `python -m app.services.candidate_snapshot
+# build`. When set, every worker maps it read-only instead of holding its
+# own copy of the candidate pool; the pool is then read-only.
+CANDIDATE_SNAPSHOT = os.environ.get("MCP_CANDIDATE_SNAPSHOT", "")
+# ──────────────────────────────────────────────────────────────────────
+
+# ─── CANDIDATE INGESTION ─────────────────────────────────────────────
+# CSV, JSONL or snapshot file to load the candidate pool from at startup
+# and on POST /candidates/reload. With a watch interval (seconds) > 0 the
+# file is polled and reloaded whenever it changes.
+CANDIDATE_SOURCE = os.environ.get("MCP_CANDIDATE_SOURCE", "")
+CANDIDATE_WATCH_INTERVAL = _env_float("MCP_CANDIDATE_WATCH_INTERVAL", 0.0)
+# Load CSV/JSONL sources straight into numpy columns: an order of
+# magnitude less memory per worker, but the pool is then read-only.
+CANDIDATE_COLUMNAR = _env_bool("MCP_CANDIDATE_COLUMNAR", False)
+# ──────────────────────────────────────────────────────────────────────
+
+# ─── SSE STREAM ADMISSION CONTROL ────────────────────────────────────
+# Open search streams allowed in total and per subject (JWT `sub`, else
+# client IP); 0 disables a limit.
+MAX_STREAMS = _env_int("MCP_MAX_STREAMS", 256)
+MAX_STREAMS_PER_SUBJECT = _env_int("MCP_MAX_STREAMS_PER_SUBJECT", 16)
+# Token buckets on new streams (per second, burst); rate 0 disables.
+STREAM_RATE = _env_float("MCP_STREAM_RATE", 200.0)
+STREAM_BURST = _env_int("MCP_STREAM_BURST", 400)
+SUBJECT_STREAM_RATE = _env_float("MCP_SUBJECT_STREAM_RATE", 20.0)
+SUBJECT_STREAM_BURST = _env_int("MCP_SUBJECT_STREAM_BURST", 40)
+# Requests that find the global limits exhausted wait in a short FIFO
+# queue; beyond its size or timeout they get 503 + Retry-After.
+ADMISSION_QUEUE_SIZE = _env_int("MCP_ADMISSION_QUEUE_SIZE", 64)
+ADMISSION_QUEUE_TIMEOUT = _env_float("MCP_ADMISSION_QUEUE_TIMEOUT", 2.0)
+# ──────────────────────────────────────────────────────────────────────
+
+# ─── RESUMABLE SSE STREAMS ───────────────────────────────────────────
+# Seconds between keepalive comments on idle streams; 0 turns them off.
+SSE_HEARTBEAT = _env_float("MCP_SSE_HEARTBEAT", 15.0)
+# Replay buffer for Last-Event-ID resumption: how many streams are kept,
+# the bytes of recent events kept per stream, and how long an idle stream
+# stays resumable. MCP_SSE_REPLAY_STREAMS=0 turns resumption off.
+SSE_REPLAY_STREAMS = _env_int("MCP_SSE_REPLAY_STREAMS", 256)
+SSE_REPLAY_BYTES = _env_int("MCP_SSE_REPLAY_BYTES", 512 * 1024)
+SSE_REPLAY_TTL = _env_float("MCP_SSE_REPLAY_TTL", 300.0)
+# ──────────────────────────────────────────────────────────────────────
+
+# ─── SEARCH EXECUTION ────────────────────────────────────────────────
+# Where candidate searches run: "inline" (on the event loop), "thread"
+# (a thread pool, keeps the loop responsive) or "process" (the pool is
+# split into shards scanned in parallel by worker processes). Each worker
+# holds only its own shards, so process mode costs about one extra copy
+# of the pool in total, rebuilt on every dataset version; snapshot pools
+# are read from the mapped file by the workers instead of being sent.
+SEARCH_EXECUTOR = os.environ.get("MCP_SEARCH_EXECUTOR", "thread")
+SEARCH_WORKERS = _env_int("MCP_SEARCH_WORKERS", 4)
+# Shards for "process" mode; 0 means one per worker.
+SEARCH_SHARDS = _env_int("MCP_SEARCH_SHARDS", 0)
+# ──────────────────────────────────────────────────────────────────────
+
+# ─── FEDERATED CANDIDATE BACKENDS ────────────────────────────────────
+# Comma-separated backends for /tools/candidate/federated/sse, each
+# "[name=]memory", "[name=]sqlite:///path/to/candidates.db" or
+# "[name=]https://host/tools/candidate/search" (another server's JSON
+# search endpoint). Each backend gets BACKEND_TIMEOUT seconds to answer.
+CANDIDATE_BACKENDS = os.environ.get("MCP_CANDIDATE_BACKENDS", "memory")
+BACKEND_TIMEOUT = _env_float("MCP_BACKEND_TIMEOUT", 2.0)
+# ──────────────────────────────────────────────────────────────────────
+
+# ─── RESPONSE COMPRESSION ────────────────────────────────────────────
+# gzip/deflate negotiated from Accept-Encoding. Responses smaller than
+# COMPRESS_MIN_SIZE bytes go out as-is; SSE streams, whose size isn't
+# known up front, are compressed per event when COMPRESS_SSE is on.
+COMPRESSION_ENABLED = _env_bool("MCP_COMPRESSION", True)
+COMPRESS_MIN_SIZE = _env_int("MCP_COMPRESS_MIN_SIZE", 1024)
+COMPRESS_SSE = _env_bool("MCP_COMPRESS_SSE", True)
+COMPRESS_LEVEL = _env_int("MCP_COMPRESS_LEVEL", 6)
+# ──────────────────────────────────────────────────────────────────────
+
+# ─── REQUEST PROFILING ───────────────────────────────────────────────
+# Off unless a token or a sample rate is set. Requests sending
+# "X-MCP-Profile: <PROFILE_TOKEN>" are profiled, as is a random
+# PROFILE_SAMPLE_RATE fraction (0-1) of all requests. PROFILE_TRACEMALLOC
+# adds an allocation diff to each profile (slows the request noticeably).
+# The last PROFILE_KEEP profiles are served from /debug/profiles.
+PROFILE_TOKEN = os.environ.get("MCP_PROFILE_TOKEN", "")
+PROFILE_SAMPLE_RATE = _env_float("MCP_PROFILE_SAMPLE_RATE", 0.0)
+PROFILE_TRACEMALLOC = _env_bool("MCP_PROFILE_TRACEMALLOC", False)
+PROFILE_KEEP = _env_int("MCP_PROFILE_KEEP", 32)
+# ──────────────────────────────────────────────────────────────────────
@@ -1,13 +1,21 @@
 # app/auth/keycloak.py
 
+import asyncio
+import hashlib
 import time
-from typing import Dict, Any
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Any, Optional
 import logging
-import httpx
-from jose import jwt, JWTError
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from app.metrics import JWKS_FETCHES, JWKS_FETCH_LATENCY, TOKEN_VERIFY_LATENCY
+
+# httpx and jose (which drags in its crypto backends) are imported on
+# first use, so importing the app stays cheap until auth is exercised.
+if TYPE_CHECKING:
+    import httpx
+
 # ─── YOUR KEYCLOAK CONFIG ────────────────────────────────────────────
 ISSUER     = "https://uat-auth.peoplestrong.com/auth/realms/3"
 AUDIENCE   = "mcp"
@@ -18,49 +26,199 @@ OIDC_BASE  = "https://mcp.paypal.com"
 logger = logging.getLogger("uvicorn")
 bearer_scheme = HTTPBearer(auto_error=False)
 
-# Simple in-process JWKS cache (rotate every 24h)
-_jwks_cache: Dict[str, Any] = {}
-_jwks_cache_ts: float = 0
+# JWKS is rotated every 24h; refresh in the background during the last hour
 _JWKS_TTL = 60 * 60 * 24
+_JWKS_REFRESH_AHEAD = 60 * 60
+# At most one refetch per interval when a token names a kid we don't know
+_UNKNOWN_KID_REFETCH_INTERVAL = 30
+_TOKEN_CACHE_SIZE = 10_000
+
+# Long-lived pooled client, opened at app startup
+_http_client: Optional["httpx.AsyncClient"] = None
+
+
+def _new_client() -> "httpx.AsyncClient":
+    import httpx
+    return httpx.AsyncClient(timeout=5.0)
+
+
+async def startup() -> None:
+    global _http_client
+    if _http_client is None:
+        _http_client = _new_client()
+
+
+async def shutdown() -> None:
+    global _http_client
+    _jwks.cancel_refresh()
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
+def _client() -> "httpx.AsyncClient":
+    # Requests that arrive before startup (e.g. tests without lifespan)
+    # still get a pooled client.
+    global _http_client
+    if _http_client is None:
+        _http_client = _new_client()
+    return _http_client
 
-async def _get_jwks() -> Dict[str, Any]:
-    global _jwks_cache, _jwks_cache_ts
-    now = time.time()
-    if not _jwks_cache or now - _jwks_cache_ts > _JWKS_TTL:
-        async with httpx.AsyncClient() as client:
-            logger.info("Fetching JWKS from %s", JWKS_URL)
-            r = await client.get(JWKS_URL, timeout=5.0)
+
+class _JwksCache:
+    """
+    JWKS indexed by ``kid`` with single-flight refresh.
+
+    One fetch is in flight at a time; callers arriving during a refresh wait
+    on the same task. Shortly before the TTL runs out the refresh is kicked
+    off in the background so requests never block on it.
+    """
+
+    def __init__(self):
+        self.jwks: Dict[str, Any] = {}
+        self.keys_by_kid: Dict[str, Dict[str, Any]] = {}
+        self.fetched_at: float = 0
+        self.fetch_count = 0
+        self._last_unknown_kid_refetch: float = 0
+        self._inflight: Optional[asyncio.Task] = None
+
+    def _expired(self, now: float) -> bool:
+        return not self.jwks or now - self.fetched_at > _JWKS_TTL
+
+    async def _fetch(self) -> None:
+        logger.info("Fetching JWKS from %s", JWKS_URL)
+        started = time.perf_counter()
+        try:
+            r = await _client().get(JWKS_URL)
             r.raise_for_status()
-            _jwks_cache = r.json()
-            _jwks_cache_ts = now
-    return _jwks_cache
+            jwks = r.json()
+        except Exception:
+            JWKS_FETCHES.inc(labels=("error",))
+            raise
+        finally:
+            JWKS_FETCH_LATENCY.observe(time.perf_counter() - started)
+        JWKS_FETCHES.inc(labels=("ok",))
+        self.keys_by_kid = {k["kid"]: k for k in jwks.get("keys", []) if "kid" in k}
+        self.jwks = jwks
+        self.fetched_at = time.time()
+        self.fetch_count += 1
+
+    def _start_refresh(self) -> asyncio.Task:
+        task = self._inflight
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = self._inflight = asyncio.ensure_future(self._fetch())
+            # a failed background refresh is retried by the next caller
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
+    async def refresh(self) -> None:
+        await asyncio.shield(self._start_refresh())
+
+    def cancel_refresh(self) -> None:
+        if self._inflight is not None and not self._inflight.done():
+            self._inflight.cancel()
+        self._inflight = None
+
+    async def get(self) -> Dict[str, Any]:
+        now = time.time()
+        if self._expired(now):
+            await self.refresh()
+        elif now - self.fetched_at > _JWKS_TTL - _JWKS_REFRESH_AHEAD:
+            self._start_refresh()
+        return self.jwks
+
+    async def get_key(self, kid: str) -> Optional[Dict[str, Any]]:
+        await self.get()
+        key = self.keys_by_kid.get(kid)
+        if key is None:
+            now = time.time()
+            if now - self._last_unknown_kid_refetch > _UNKNOWN_KID_REFETCH_INTERVAL:
+                self._last_unknown_kid_refetch = now
+                await self.refresh()
+                key = self.keys_by_kid.get(kid)
+        return key
+
+
+class _VerifiedTokenCache:
+    """Bounded LRU of verified token payloads, keyed by token hash, valid until ``exp``."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = self._key(token)
+        payload = self._entries.get(key)
+        if payload is None:
+            return None
+        if payload["exp"] <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return payload
+
+    def put(self, token: str, payload: Dict[str, Any]) -> None:
+        # Only tokens with an expiry can be cached safely
+        if not isinstance(payload.get("exp"), (int, float)):
+            return
+        self._entries[self._key(token)] = payload
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_jwks = _JwksCache()
+_verified_tokens = _VerifiedTokenCache(_TOKEN_CACHE_SIZE)
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
 
 
 async def verify_access_token(
     creds: HTTPAuthorizationCredentials = Depends(bearer_scheme)
 ) -> Dict[str, Any]:
     if not creds or creds.scheme.lower() != "bearer":
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing or invalid Authorization header",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthorized("Missing or invalid Authorization header")
     token = creds.credentials
-    jwks = await _get_jwks()
-    logger.info("VERIFY ACCESS TOKEN %s", token)
+    started = time.perf_counter()
+
+    payload = _verified_tokens.get(token)
+    if payload is not None:
+        TOKEN_VERIFY_LATENCY.observe(time.perf_counter() - started, ("hit",))
+        return payload
+
+    from jose import JWTError, jwt
+    try:
+        kid = jwt.get_unverified_header(token).get("kid")
+    except JWTError:
+        raise _unauthorized("Token validation failed")
+    if kid is None:
+        key = await _jwks.get()
+    else:
+        key = await _jwks.get_key(kid)
+        if key is None:
+            raise _unauthorized("Token validation failed")
     try:
         payload = jwt.decode(
             token,
-            jwks,
+            key,
             algorithms=["RS256"],
             issuer=ISSUER,
             audience=AUDIENCE,
         )
     except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token validation failed",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthorized("Token validation failed")
+    _verified_tokens.put(token, payload)
+    TOKEN_VERIFY_LATENCY.observe(time.perf_counter() - started, ("miss",))
     return payload
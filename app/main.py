@@ -11,15 +11,18 @@ starlette.responses.Response.init_headers = _safe_init
 # —————————————————————————————————————————————————————————
 
 import logging
-from fastapi import FastAPI, Depends, status, Query
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi import FastAPI, Depends, Request, status, Query
+from fastapi.responses import JSONResponse, PlainTextResponse, RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.schema.common import ContextNode
 from app.schema.tool import ToolListResponse
-from app.routers import register, tools
-from app.routers.register import list_contexts_alias, STORE
-from app.keycloak import verify_access_token, ISSUER, OIDC_BASE
+from app.routers import candidates, jsonrpc, profiles, register, tools
+from app.routers.register import ensure_default_contexts, list_contexts_alias, STORE
+from app.services import candidate_backends, candidate_ingest, search_executor
+from app.services.discovery_cache import cached_json_response
+from app import config, keycloak, metrics, profiling
+from app.compression import CompressionMiddleware
+from app.keycloak import ISSUER, OIDC_BASE
 
 import fastapi.applications
 fastapi.applications.FastAPI.debug = False
@@ -42,18 +45,52 @@ try:
 except RuntimeError:
     logger.warning("Skipping CORS (already started)")
 
-# Seed built-in context
+# gzip/deflate for JSON and SSE responses (see config COMPRESS_*)
+if config.COMPRESSION_ENABLED:
+    try:
+        app.add_middleware(
+            CompressionMiddleware,
+            min_size=config.COMPRESS_MIN_SIZE,
+            level=config.COMPRESS_LEVEL,
+            sse=config.COMPRESS_SSE,
+        )
+    except RuntimeError:
+        logger.warning("Skipping compression (already started)")
+
+# Per-route request metrics (see /metrics)
+try:
+    app.add_middleware(metrics.MetricsMiddleware)
+except RuntimeError:
+    logger.warning("Skipping metrics middleware (already started)")
+
+# Opt-in request profiling, outermost so it covers every other layer
+if profiling.enabled():
+    try:
+        app.add_middleware(
+            profiling.ProfilingMiddleware,
+            token=config.PROFILE_TOKEN,
+            sample_rate=config.PROFILE_SAMPLE_RATE,
+            trace_allocations=config.PROFILE_TRACEMALLOC,
+        )
+    except RuntimeError:
+        logger.warning("Skipping profiling (already started)")
+
+# Pooled Keycloak client lives for the lifetime of the app
+app.add_event_handler("startup", keycloak.startup)
+app.add_event_handler("shutdown", keycloak.shutdown)
+
+# Candidate pool from MCP_CANDIDATE_SOURCE, optionally watched for changes
+app.add_event_handler("startup", candidate_ingest.startup)
+app.add_event_handler("shutdown", candidate_ingest.shutdown)
+app.add_event_handler("shutdown", search_executor.shutdown)
+app.add_event_handler("shutdown", candidate_backends.shutdown)
+
+# Seed built-in context at startup rather than on import; the listing
+# endpoints also seed on demand for apps served without a lifespan.
 def _seed():
-    ctx = ContextNode(
-        id="candidate_search",
-        name="Candidate Search",
-        description="Search candidates by experience, location, and department",
-        prompt="",
-        parameters={}
-    )
-    STORE.setdefault(ctx.id, ctx)
+    ensure_default_contexts()
     logger.info("Seeded built-in context")
-_seed()
+app.add_event_handler("startup", _seed)
 
 # 1) OAuth-protected resource metadata
 @app.get(
@@ -157,7 +194,10 @@ def oidc_discovery_complete():
     response_class=JSONResponse,
     status_code=status.HTTP_200_OK,
 )
-async def mcp_tools_discovery():
+async def mcp_tools_discovery(request: Request):
+    return cached_json_response(request, "mcp-tools", STORE.version, _build_mcp_tools)
+
+def _build_mcp_tools():
     tools_map = {}
     for ctx in STORE.values():
         tools_map[ctx.id] = {
@@ -200,8 +240,8 @@ def claude_start_auth(
     response_model=ToolListResponse,
     status_code=200,
 )
-def mcp_discovery():
-    return list_contexts_alias()
+def mcp_discovery(request: Request):
+    return list_contexts_alias(request)
 
 app.add_api_route(
     "/mcp.json",
@@ -214,9 +254,25 @@ app.add_api_route(
 # 6) Mount your existing register & tools routers
 app.include_router(register.router, prefix="", tags=["register"])
 app.include_router(tools.router,    prefix="/tools", tags=["tools"])
+app.include_router(jsonrpc.router,  prefix="",       tags=["mcp"])
+app.include_router(candidates.router, prefix="",     tags=["candidates"])
+app.include_router(profiles.router,   prefix="",     tags=["debug"])
 
 # 7) Health & root
 @app.get("/",    summary="Root health",   status_code=200)
 def root():    return {"message": "MCP SSE Server is up"}
 @app.get("/health", summary="Health check", status_code=200)
 def health():  return {"status": "ok"}
+
+# 8) Prometheus metrics
+@app.get(
+    "/metrics",
+    summary="Prometheus metrics",
+    response_class=PlainTextResponse,
+    status_code=200,
+)
+def prometheus_metrics():
+    return PlainTextResponse(
+        metrics.REGISTRY.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -0,0 +1,267 @@
+# app/metrics.py
+
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Latency buckets in seconds, from 100µs up to 10s
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+Labels = Tuple[str, ...]
+
+
+def _fmt_labels(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """
+    Monotonic counter. Updates are plain dict adds with no lock: under the
+    GIL a racing thread can at worst lose an increment, which is an
+    acceptable trade for keeping the hot path at a few hundred nanoseconds.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, labels: Labels = ()) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        for labels, value in list(self._values.items()):
+            lines.append(f"{self.name}{_fmt_labels(self.label_names, labels)} {_fmt_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Point-in-time value, either set directly or read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Labels, float] = {}
+        self._function: Optional[Callable[[], float]] = None
+
+    def inc(self, amount: float = 1, labels: Labels = ()) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, amount: float = 1, labels: Labels = ()) -> None:
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        self._values[labels] = value
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        self._function = fn
+
+    def value(self, labels: Labels = ()) -> float:
+        if self._function is not None:
+            return self._function()
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        if self._function is not None:
+            lines.append(f"{self.name} {_fmt_value(self._function())}")
+            return lines
+        for labels, value in list(self._values.items()):
+            lines.append(f"{self.name}{_fmt_labels(self.label_names, labels)} {_fmt_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram; ``observe`` is one bisect and three adds."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Labels, list] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def count(self, labels: Labels = ()) -> int:
+        series = self._series.get(labels)
+        return series[2] if series else 0
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        bounds = self.buckets + (float("inf"),)
+        for labels, (counts, total, n) in list(self._series.items()):
+            cumulative = 0
+            for bound, c in zip(bounds, counts):
+                cumulative += c
+                le = 'le="%s"' % _fmt_value(bound)
+                lines.append(f"{self.name}_bucket{_fmt_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_fmt_labels(self.label_names, labels)} {_fmt_value(total)}")
+            lines.append(f"{self.name}_count{_fmt_labels(self.label_names, labels)} {n}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "mcp_http_requests_total", "HTTP requests by route and status", ("method", "route", "status"))
+HTTP_LATENCY = REGISTRY.histogram(
+    "mcp_http_request_duration_seconds", "HTTP request latency by route", ("method", "route"))
+SSE_OPEN_STREAMS = REGISTRY.gauge(
+    "mcp_sse_open_streams", "Server-Sent Event streams currently open")
+SSE_FIRST_EVENT = REGISTRY.histogram(
+    "mcp_sse_time_to_first_event_seconds", "Time from request start to the first SSE event", ("route",))
+JWKS_FETCHES = REGISTRY.counter(
+    "mcp_jwks_fetch_total", "JWKS fetches from Keycloak", ("outcome",))
+JWKS_FETCH_LATENCY = REGISTRY.histogram(
+    "mcp_jwks_fetch_duration_seconds", "JWKS fetch latency")
+TOKEN_VERIFY_LATENCY = REGISTRY.histogram(
+    "mcp_token_verify_duration_seconds", "Access token verification time", ("cache",))
+SEARCH_ROWS_SCANNED = REGISTRY.counter(
+    "mcp_search_rows_scanned_total",
+    "Candidate rows read from the index buckets by searches and pages")
+SEARCH_ROWS_RETURNED = REGISTRY.counter(
+    "mcp_search_rows_returned_total", "Candidate rows returned by search_candidates")
+CONTEXT_STORE_SIZE = REGISTRY.gauge(
+    "mcp_context_store_size", "Registered context nodes in STORE")
+ADMISSION_REJECTIONS = REGISTRY.counter(
+    "mcp_admission_rejections_total", "SSE streams turned away by admission control", ("reason",))
+ADMISSION_QUEUE_DEPTH = REGISTRY.gauge(
+    "mcp_admission_queue_depth", "SSE stream requests waiting for admission")
+ADMISSION_WAIT = REGISTRY.histogram(
+    "mcp_admission_wait_seconds", "Time SSE stream requests spent in the admission queue")
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route request counts and latency, plus
+    open-stream and time-to-first-event figures for ``text/event-stream``
+    responses. Routes are labelled by their path template so ids in the
+    URL don't explode the label set.
+    """
+
+    _MAX_ROUTE_CACHE = 4096
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._route_cache: Dict[Tuple[str, str], str] = {}
+
+    def _route(self, scope: Scope) -> str:
+        key = (scope["method"], scope["path"])
+        route = self._route_cache.get(key)
+        if route is not None:
+            return route
+        route = "<unmatched>"
+        router = scope.get("router")
+        if router is not None:
+            for candidate in router.routes:
+                match, _ = candidate.matches(scope)
+                if match == Match.FULL:
+                    route = candidate.path
+                    break
+        if len(self._route_cache) < self._MAX_ROUTE_CACHE:
+            self._route_cache[key] = route
+        return route
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = "500"
+        streaming = False
+        first_event = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, streaming, first_event
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+                for name, value in message.get("headers", ()):
+                    if name == b"content-type" and value.startswith(b"text/event-stream"):
+                        streaming = True
+                        SSE_OPEN_STREAMS.inc()
+                        break
+            elif streaming and not first_event and message.get("body"):
+                first_event = True
+                SSE_FIRST_EVENT.observe(time.perf_counter() - start, (self._route(scope),))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if streaming:
+                SSE_OPEN_STREAMS.dec()
+            route = self._route(scope)
+            HTTP_REQUESTS.inc(labels=(scope["method"], route, status))
+            HTTP_LATENCY.observe(time.perf_counter() - start, (scope["method"], route))
@@ -0,0 +1,245 @@
+# app/profiling.py
+
+import cProfile
+import hmac
+import io
+import marshal
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from contextvars import ContextVar
+from itertools import count
+from typing import Any, Callable, Dict, List, Optional
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import config
+
+PROFILE_HEADER = "x-mcp-profile"
+PROFILE_ID_HEADER = "X-MCP-Profile-Id"
+
+# Profile of the request being handled, if it is being profiled
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("mcp_profile", default=None)
+_ids = count(1)
+
+
+def current() -> Optional["RequestProfile"]:
+    return _current.get()
+
+
+def enabled() -> bool:
+    return bool(config.PROFILE_TOKEN) or config.PROFILE_SAMPLE_RATE > 0
+
+
+class RequestProfile:
+    """
+    cProfile data (and optionally a tracemalloc diff) for one request.
+
+    The profiler runs on the event loop thread for the whole request,
+    response streaming included, so it sees the middleware stack,
+    ``verify_access_token``, ``event_generator`` and inline searches.
+    Searches handed to the thread pool are profiled in the worker through
+    ``wrap`` and merged in. Other requests interleaved on the loop show up
+    too; profile on a quiet worker when that matters.
+    """
+
+    def __init__(self, method: str, path: str, trigger: str, trace_allocations: bool = False):
+        self.id = next(_ids)
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.status = 0
+        self.started = time.time()
+        self.duration = 0.0
+        self.allocations: Optional[List[Dict[str, Any]]] = None
+        self.stats: Optional[pstats.Stats] = None
+        self._trace = trace_allocations
+        self._profiler = cProfile.Profile()
+        self._workers: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._t0 = 0.0
+
+    def start(self) -> None:
+        if self._trace:
+            _tracing.acquire()
+            self._baseline = tracemalloc.take_snapshot()
+        self._t0 = time.perf_counter()
+        self._profiler.enable()
+
+    def stop(self, top: int = 25) -> None:
+        self._profiler.disable()
+        self.duration = time.perf_counter() - self._t0
+        if self._trace:
+            diff = tracemalloc.take_snapshot().compare_to(self._baseline, "lineno")
+            _tracing.release()
+            self._baseline = None
+            self.allocations = [
+                {
+                    "where": str(stat.traceback[0]),
+                    "size_diff": stat.size_diff,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in diff[:top]
+            ]
+        stats = pstats.Stats(self._profiler)
+        with self._lock:
+            for worker in self._workers:
+                stats.add(worker)
+            self._workers.clear()
+        self.stats = stats
+
+    def wrap(self, fn: Callable) -> Callable:
+        """``fn`` profiled in whatever thread ends up running it."""
+        def run(*args):
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                return fn(*args)
+            finally:
+                profiler.disable()
+                with self._lock:
+                    self._workers.append(profiler)
+        return run
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "trigger": self.trigger,
+            "started": self.started,
+            "duration_ms": round(self.duration * 1000, 3),
+            "allocations": self.allocations,
+        }
+
+    def report(self, sort: str = "cumulative", limit: int = 60) -> str:
+        out = io.StringIO()
+        stats = pstats.Stats(stream=out)
+        stats.add(self.stats)
+        stats.sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def dump(self) -> bytes:
+        """The stats in ``pstats``' file format (what ``Stats.dump_stats`` writes)."""
+        return marshal.dumps(self.stats.stats)
+
+
+class _Tracing:
+    """Reference-counted tracemalloc, so overlapping traced requests share one session."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._users = 0
+        self._started = False
+
+    def acquire(self) -> None:
+        with self._lock:
+            if not self._users and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started = True
+            self._users += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self._users -= 1
+            if not self._users and self._started:
+                tracemalloc.stop()
+                self._started = False
+
+
+_tracing = _Tracing()
+
+
+class ProfileRing:
+    """The last ``size`` finished profiles, by id."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._profiles: "OrderedDict[int, RequestProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self.size:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: int) -> Optional[RequestProfile]:
+        return self._profiles.get(profile_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            profiles = list(self._profiles.values())
+        return [p.summary() for p in reversed(profiles)]
+
+
+PROFILES = ProfileRing(config.PROFILE_KEEP)
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling requests that carry the admin header or win
+    the sampling draw; the profile id is returned in ``X-MCP-Profile-Id``.
+
+    Only installed when profiling is configured (see ``enabled``), so a
+    default deployment doesn't pay for it at all; elsewhere the one check
+    on the request path is ``SearchExecutor.call`` testing ``current()``.
+    cProfile allows one profiler per thread, so while a request is being
+    profiled, others that would be selected run unprofiled.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        token: str = "",
+        sample_rate: float = 0.0,
+        trace_allocations: bool = False,
+        ring: Optional[ProfileRing] = None,
+    ):
+        self.app = app
+        self.token = token.encode("latin-1")
+        self.sample_rate = sample_rate
+        self.trace_allocations = trace_allocations
+        self.ring = ring if ring is not None else PROFILES
+        self._busy = threading.Lock()
+
+    def _trigger(self, scope: Scope) -> Optional[str]:
+        if self.token:
+            supplied = Headers(scope=scope).get(PROFILE_HEADER)
+            if supplied is not None and hmac.compare_digest(supplied.encode("latin-1"), self.token):
+                return "header"
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        trigger = self._trigger(scope) if scope["type"] == "http" else None
+        if trigger is None or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"], trigger, self.trace_allocations)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (PROFILE_ID_HEADER.lower().encode("latin-1"), str(profile.id).encode("latin-1"))
+                ]
+            await send(message)
+
+        reset = _current.set(profile)
+        profile.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile.stop()
+            _current.reset(reset)
+            self._busy.release()
+            self.ring.add(profile)
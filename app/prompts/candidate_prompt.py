@@ -4,4 +4,11 @@ def generate_candidate_prompt(experience: int, location: str, department: str) -
         f"located in {location}, "
         f"in the {department} department. "
         "Return comprehensive candidate profiles."
-    )
\ No newline at end of file
+    )
+
+def generate_text_search_prompt(query: str) -> str:
+    return (
+        f"Find candidates matching: {query}. "
+        "Results are ranked by relevance. "
+        "Return comprehensive candidate profiles."
+    )
@@ -0,0 +1,50 @@
+# app/routers/candidates.py
+
+import logging
+from fastapi import APIRouter, HTTPException
+
+from app import config
+from app.schema.candidate import IngestRequest, IngestResponse
+from app.services import candidate_ingest
+from app.services.candidate_service import ingest
+
+logger = logging.getLogger("candidates")
+router = APIRouter()
+
+
+@router.post(
+    "/candidates/ingest",
+    response_model=IngestResponse,
+    status_code=200,
+    summary="Upsert and delete candidates without a restart"
+)
+def ingest_candidates(body: IngestRequest):
+    """
+    Applies the batch atomically: deletes first, then upserts (insert or
+    replace by id). Searches see either the pool before the batch or after
+    it, never part of it, and the dataset version moves on so cached
+    results are dropped. Send changes in batches; each one copies the id
+    map and every index bucket it touches.
+    """
+    try:
+        store, deleted = ingest((c.dict() for c in body.upsert), body.delete)
+    except TypeError as exc:
+        raise HTTPException(409, str(exc))
+    logger.info("Ingested %d upserts, %d deletes (version %d)", len(body.upsert), deleted, store.version)
+    return IngestResponse(version=store.version, size=len(store), upserted=len(body.upsert), deleted=deleted)
+
+
+@router.post(
+    "/candidates/reload",
+    response_model=IngestResponse,
+    status_code=200,
+    summary="Reload the candidate pool from MCP_CANDIDATE_SOURCE"
+)
+def reload_candidates():
+    if not config.CANDIDATE_SOURCE:
+        raise HTTPException(400, "No candidate source configured (MCP_CANDIDATE_SOURCE)")
+    try:
+        store = candidate_ingest.reload(config.CANDIDATE_SOURCE)
+    except (OSError, ValueError, KeyError) as exc:
+        raise HTTPException(400, f"Could not load {config.CANDIDATE_SOURCE}: {exc}")
+    return IngestResponse(version=store.version, size=len(store), upserted=len(store), deleted=0)
@@ -0,0 +1,306 @@
+# app/routers/jsonrpc.py
+
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, Response
+
+from app.routers.register import STORE, ensure_default_contexts
+from app.services.candidate_service import (
+    DEFAULT_SORT,
+    SORTS,
+    candidate_facets,
+    decode_cursor,
+    encode_cursor,
+    text_index_enabled,
+    text_search,
+)
+from app.services.search_executor import SEARCH_EXECUTOR
+
+logger = logging.getLogger("jsonrpc")
+router = APIRouter()
+
+PROTOCOL_VERSION = "2025-03-26"
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+def _error(req_id: Any, code: int, message: str, data: Any = None) -> Dict[str, Any]:
+    err: Dict[str, Any] = {"code": code, "message": message}
+    if data is not None:
+        err["data"] = data
+    return {"jsonrpc": "2.0", "id": req_id, "error": err}
+
+
+#
+# — tool implementations —
+#
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+# A tools/call answer is one JSON-RPC response, so searches come back in pages
+SEARCH_PAGE_DEFAULT = 100
+SEARCH_PAGE_MAX = 1000
+
+CANDIDATE_SEARCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "experience": {"type": "integer", "minimum": 0, "description": "Minimum years of experience"},
+        "location": {"type": "string", "description": "Candidate location"},
+        "department": {"type": "string", "description": "Functional department"},
+        "limit": {"type": "integer", "minimum": 1, "maximum": SEARCH_PAGE_MAX, "default": SEARCH_PAGE_DEFAULT,
+                  "description": "Page size"},
+        "sort": {"type": "string", "enum": list(SORTS), "default": DEFAULT_SORT},
+        "cursor": {"type": "string", "description": "next_cursor from the previous page"},
+    },
+    "required": ["experience", "location", "department"],
+}
+
+
+async def _call_candidate_search(args: Dict[str, Any]) -> Any:
+    experience = args.get("experience")
+    location = args.get("location")
+    department = args.get("department")
+    limit = args.get("limit", SEARCH_PAGE_DEFAULT)
+    sort = args.get("sort", DEFAULT_SORT)
+    cursor = args.get("cursor")
+    if (
+        not isinstance(experience, int) or isinstance(experience, bool) or experience < 0
+        or not isinstance(location, str) or not isinstance(department, str)
+        or not _is_int(limit) or not 1 <= limit <= SEARCH_PAGE_MAX
+        or sort not in SORTS
+        or (cursor is not None and not isinstance(cursor, str))
+    ):
+        raise RpcError(
+            INVALID_PARAMS,
+            f"candidate_search needs experience (int >= 0), location and department, "
+            f"and takes limit (1-{SEARCH_PAGE_MAX}), sort ({', '.join(SORTS)}) and cursor",
+        )
+    try:
+        after = decode_cursor(cursor, sort) if cursor else None
+    except ValueError as exc:
+        raise RpcError(INVALID_PARAMS, str(exc))
+    rows, next_after = await SEARCH_EXECUTOR.page(experience, location, department, sort, limit, after)
+    return {
+        "candidates": rows,
+        "next_cursor": encode_cursor(sort, next_after) if next_after else None,
+    }
+
+
+CANDIDATE_TEXT_SEARCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "query": {"type": "string", "description": "Free-text query"},
+        "limit": {"type": "integer", "minimum": 1, "maximum": 1000, "default": 20},
+        "match": {"type": "string", "enum": ["any", "all"], "default": "any"},
+    },
+    "required": ["query"],
+}
+
+
+async def _call_candidate_text_search(args: Dict[str, Any]) -> Any:
+    query = args.get("query")
+    limit = args.get("limit", 20)
+    match = args.get("match", "any")
+    if (
+        not isinstance(query, str) or not query
+        or not isinstance(limit, int) or isinstance(limit, bool) or not 1 <= limit <= 1000
+        or match not in ("any", "all")
+    ):
+        raise RpcError(INVALID_PARAMS, "candidate_text_search needs a query, limit 1-1000 and match any|all")
+    if not text_index_enabled():
+        raise RpcError(INTERNAL_ERROR, "Text index is disabled")
+    hits = await SEARCH_EXECUTOR.call(text_search, query, limit, match)
+    return [dict(candidate, score=score) for score, candidate in hits]
+
+
+CANDIDATE_FACETS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "experience": {"type": "integer", "minimum": 0, "default": 0, "description": "Minimum years of experience"},
+        "max_experience": {"type": "integer", "minimum": 0, "description": "Maximum years of experience"},
+        "location": {"type": "string", "description": "Only this location"},
+        "department": {"type": "string", "description": "Only this department"},
+        "bucket": {"type": "integer", "minimum": 1, "maximum": 100, "default": 5,
+                   "description": "Width of the experience buckets, in years"},
+    },
+}
+
+
+async def _call_candidate_facets(args: Dict[str, Any]) -> Any:
+    experience = args.get("experience", 0)
+    max_experience = args.get("max_experience")
+    location = args.get("location")
+    department = args.get("department")
+    bucket = args.get("bucket", 5)
+    if (
+        not _is_int(experience) or experience < 0
+        or (max_experience is not None and (not _is_int(max_experience) or max_experience < 0))
+        or (location is not None and not isinstance(location, str))
+        or (department is not None and not isinstance(department, str))
+        or not _is_int(bucket) or not 1 <= bucket <= 100
+    ):
+        raise RpcError(
+            INVALID_PARAMS,
+            "candidate_facets takes experience and max_experience (int >= 0), "
+            "location, department and bucket (1-100)",
+        )
+    return candidate_facets(experience, max_experience, location, department, bucket)
+
+
+# tool name -> (input schema, handler)
+TOOLS: Dict[str, Tuple[Dict[str, Any], Callable[[Dict[str, Any]], Awaitable[Any]]]] = {
+    "candidate_search": (CANDIDATE_SEARCH_SCHEMA, _call_candidate_search),
+    "candidate_text_search": (CANDIDATE_TEXT_SEARCH_SCHEMA, _call_candidate_text_search),
+    "candidate_facets": (CANDIDATE_FACETS_SCHEMA, _call_candidate_facets),
+}
+
+
+def _input_schema(node) -> Dict[str, Any]:
+    if node.id in TOOLS:
+        return TOOLS[node.id][0]
+    return {
+        "type": "object",
+        "properties": {**node.parameters},
+        "required": list(node.parameters.keys()),
+    }
+
+
+#
+# — MCP methods —
+#
+async def _initialize(params: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "protocolVersion": PROTOCOL_VERSION,
+        "capabilities": {"tools": {"listChanged": False}},
+        "serverInfo": {"name": "mcp-candidate-portal", "version": "1.0.0"},
+    }
+
+
+async def _ping(params: Dict[str, Any]) -> Dict[str, Any]:
+    return {}
+
+
+async def _tools_list(params: Dict[str, Any]) -> Dict[str, Any]:
+    ensure_default_contexts()
+    return {
+        "tools": [
+            {"name": node.id, "description": node.description, "inputSchema": _input_schema(node)}
+            for node in STORE.values()
+        ]
+    }
+
+
+async def _tools_call(params: Dict[str, Any]) -> Dict[str, Any]:
+    name = params.get("name")
+    args = params.get("arguments") or {}
+    if not isinstance(name, str) or not isinstance(args, dict):
+        raise RpcError(INVALID_PARAMS, "tools/call needs a tool name and an arguments object")
+    tool = TOOLS.get(name)
+    if tool is None:
+        raise RpcError(INVALID_PARAMS, f"Unknown tool: {name}")
+    result = await tool[1](args)
+    return {
+        "content": [{"type": "text", "text": json.dumps(result)}],
+        "isError": False,
+    }
+
+
+METHODS: Dict[str, Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]] = {
+    "initialize": _initialize,
+    "ping": _ping,
+    "tools/list": _tools_list,
+    "tools/call": _tools_call,
+}
+
+
+async def _dispatch(message: Any) -> Optional[Dict[str, Any]]:
+    """Run one JSON-RPC message. Returns None for notifications."""
+    if not isinstance(message, dict) or message.get("jsonrpc") != "2.0" or not isinstance(message.get("method"), str):
+        return _error(message.get("id") if isinstance(message, dict) else None, INVALID_REQUEST, "Invalid Request")
+    is_notification = "id" not in message
+    req_id = message.get("id")
+    params = message.get("params") or {}
+    handler = METHODS.get(message["method"])
+    try:
+        if handler is None:
+            if message["method"].startswith("notifications/"):
+                return None
+            raise RpcError(METHOD_NOT_FOUND, f"Method not found: {message['method']}")
+        if not isinstance(params, dict):
+            raise RpcError(INVALID_PARAMS, "params must be an object")
+        result = await handler(params)
+    except RpcError as exc:
+        response = _error(req_id, exc.code, exc.message, exc.data)
+    except Exception:
+        logger.exception("JSON-RPC %s failed", message["method"])
+        response = _error(req_id, INTERNAL_ERROR, "Internal error")
+    else:
+        response = {"jsonrpc": "2.0", "id": req_id, "result": result}
+    return None if is_notification else response
+
+
+def _wants_stream(request: Request) -> bool:
+    return "text/event-stream" in request.headers.get("accept", "")
+
+
+async def _stream(tasks: List["asyncio.Task"]):
+    # Responses go out in completion order; clients match them on id
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            response = await next_done
+            if response is not None:
+                yield {"event": "message", "data": json.dumps(response)}
+    finally:
+        # client went away mid-batch
+        for task in tasks:
+            task.cancel()
+
+
+@router.post(
+    "/mcp",
+    status_code=200,
+    summary="MCP JSON-RPC 2.0 endpoint (tools/list, tools/call)"
+)
+async def mcp_jsonrpc(request: Request):
+    """
+    Accepts a single JSON-RPC message or a batch array. Batch entries run
+    concurrently. With ``Accept: text/event-stream`` every response is
+    streamed as its own ``message`` event as soon as it completes;
+    otherwise the responses are returned together as JSON.
+    """
+    try:
+        payload = json.loads(await request.body())
+    except ValueError:
+        return JSONResponse(_error(None, PARSE_ERROR, "Parse error"))
+
+    batch = isinstance(payload, list)
+    messages = payload if batch else [payload]
+    if batch and not messages:
+        return JSONResponse(_error(None, INVALID_REQUEST, "Invalid Request"))
+
+    tasks = [asyncio.ensure_future(_dispatch(m)) for m in messages]
+    if _wants_stream(request):
+        from sse_starlette.sse import EventSourceResponse
+        return EventSourceResponse(_stream(tasks))
+
+    responses = [r for r in await asyncio.gather(*tasks) if r is not None]
+    if not responses:
+        return Response(status_code=202)
+    return JSONResponse(responses if batch else responses[0])
@@ -0,0 +1,51 @@
+# app/routers/profiles.py
+
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse, Response
+
+from app.keycloak import verify_access_token
+from app.profiling import PROFILES
+
+router = APIRouter(dependencies=[Depends(verify_access_token)])
+
+
+@router.get(
+    "/debug/profiles",
+    status_code=200,
+    summary="Recent request profiles"
+)
+def list_profiles():
+    """Newest first; see MCP_PROFILE_TOKEN / MCP_PROFILE_SAMPLE_RATE for what gets profiled."""
+    return {"profiles": PROFILES.list()}
+
+
+@router.get(
+    "/debug/profiles/{profile_id}",
+    status_code=200,
+    summary="Download one request profile"
+)
+def get_profile(
+    profile_id: int,
+    format: str = Query("text", regex="^(text|pstats|json)$",
+                        description="`text` report, `pstats` file or `json` summary"),
+    sort:   str = Query("cumulative", regex="^(cumulative|tottime|ncalls)$",
+                        description="Sort order of the text report"),
+) -> Any:
+    """
+    `format=pstats` returns the raw stats for `python -m pstats`,
+    snakeviz and friends; `text` is the top of the sorted report.
+    """
+    profile = PROFILES.get(profile_id)
+    if profile is None:
+        raise HTTPException(404, "Unknown or expired profile")
+    if format == "pstats":
+        return Response(
+            profile.dump(),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.pstats"'},
+        )
+    if format == "json":
+        return profile.summary()
+    return PlainTextResponse(profile.report(sort))
@@ -1,17 +1,66 @@
 # app/routers/register.py
 
+import json
 import logging
-from fastapi import APIRouter, HTTPException
-from typing import Dict, List
+from fastapi import APIRouter, HTTPException, Query, Request
+from pydantic import ValidationError
+from typing import Any, List, Optional, Tuple
 
+from app import config
+from app.metrics import CONTEXT_STORE_SIZE
 from app.schema.common import ContextNode
-from app.schema.tool import ToolListResponse
+from app.schema.tool import (
+    BulkItemStatus,
+    BulkRegisterResponse,
+    ResolveResponse,
+    ToolListResponse,
+)
+from app.services.context_store import ContextStore, open_context_store
+from app.services.discovery_cache import cached_json_response
 
 logger = logging.getLogger("register")
 router = APIRouter()
 
-# Shared in-memory store
-STORE: Dict[str, ContextNode] = {}
+# Shared store; backend chosen by MCP_CONTEXT_STORE
+STORE: ContextStore = open_context_store(config.CONTEXT_STORE_URL)
+CONTEXT_STORE_SIZE.set_function(lambda: len(STORE))
+
+# Built-in tools listed by discovery and tools/list
+DEFAULT_CONTEXTS = [
+    ContextNode(
+        id="candidate_search",
+        name="Candidate Search",
+        description="Search candidates by experience, location, and department",
+        prompt="",
+        parameters={}
+    ),
+    ContextNode(
+        id="candidate_text_search",
+        name="Candidate Text Search",
+        description="Free-text candidate search ranked by relevance, "
+                    'e.g. "python backend Bengaluru senior"',
+        prompt="",
+        parameters={}
+    ),
+    ContextNode(
+        id="candidate_facets",
+        name="Candidate Facets",
+        description="Count candidates matching a filter, grouped by location, "
+                    "department and experience bucket",
+        prompt="",
+        parameters={}
+    ),
+]
+
+# Built-ins that only work with the free-text index on (MCP_TEXT_INDEX)
+TEXT_INDEX_CONTEXTS = {"candidate_text_search"}
+
+def ensure_default_contexts() -> None:
+    for ctx in DEFAULT_CONTEXTS:
+        if ctx.id in TEXT_INDEX_CONTEXTS and not config.TEXT_INDEX_ENABLED:
+            continue
+        if ctx.id not in STORE:
+            STORE.insert(ctx)
 
 #
 # — ChatMCP–style “alias” endpoints —
@@ -24,28 +73,117 @@ STORE: Dict[str, ContextNode] = {}
 )
 async def register_context_alias(node: ContextNode):
     logger.info("[alias] registering %s", node.id)
-    if node.id in STORE:
+    if not STORE.insert(node):
         raise HTTPException(400, "Node already exists")
-    STORE[node.id] = node
     return node
 
+def _parse_bulk_body(request: Request, raw: bytes) -> List[Tuple[Optional[Any], Optional[str]]]:
+    """
+    Split a bulk body into ``(item, parse_error)`` pairs. Accepts a JSON
+    array, or NDJSON (one node per line) when sent as application/x-ndjson.
+    """
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        items = []
+        for line in raw.splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append((json.loads(line), None))
+            except ValueError as exc:
+                items.append((None, f"Invalid JSON: {exc}"))
+        return items
+    try:
+        data = json.loads(raw)
+    except ValueError as exc:
+        raise HTTPException(400, f"Invalid JSON: {exc}")
+    if not isinstance(data, list):
+        raise HTTPException(400, "Expected a JSON array of context nodes")
+    return [(item, None) for item in data]
+
+async def _register_bulk(request: Request, atomic: bool) -> BulkRegisterResponse:
+    raw = await request.body()
+    statuses: List[BulkItemStatus] = []
+    nodes: List[ContextNode] = []
+    node_status: List[BulkItemStatus] = []
+    seen = set()
+    for index, (item, error) in enumerate(_parse_bulk_body(request, raw)):
+        item_id = item.get("id") if isinstance(item, dict) else None
+        if not isinstance(item_id, str):
+            item_id = None
+        st = BulkItemStatus(index=index, id=item_id, status="invalid", detail=error)
+        statuses.append(st)
+        if error is not None:
+            continue
+        try:
+            node = ContextNode.parse_obj(item)
+        except ValidationError as exc:
+            st.detail = exc.errors()
+            continue
+        st.status = "pending"
+        if node.id in seen:
+            st.status, st.detail = "conflict", "Duplicate id in batch"
+            continue
+        seen.add(node.id)
+        nodes.append(node)
+        node_status.append(st)
+
+    invalid = sum(st.status == "invalid" for st in statuses)
+    batch_conflicts = sum(st.status == "conflict" for st in statuses)
+    if atomic and (invalid or batch_conflicts):
+        conflicts = set()
+    else:
+        conflicts = STORE.insert_many(nodes, atomic=atomic)
+    applied = not (atomic and (invalid or batch_conflicts or conflicts))
+
+    for node, st in zip(nodes, node_status):
+        if node.id in conflicts:
+            st.status, st.detail = "conflict", "Node already exists"
+        elif applied:
+            st.status = "created"
+        else:
+            st.status = "skipped"
+
+    return BulkRegisterResponse(
+        applied=applied,
+        created=sum(st.status == "created" for st in statuses),
+        conflicts=sum(st.status == "conflict" for st in statuses),
+        invalid=invalid,
+        items=statuses,
+    )
+
+@router.post(
+    "/context/bulk",
+    response_model=BulkRegisterResponse,
+    status_code=200,
+    summary="Register many tool/context nodes at once (alias)"
+)
+async def register_contexts_bulk_alias(
+    request: Request,
+    atomic: bool = Query(False, description="Apply all nodes or none"),
+):
+    """
+    Body is a JSON array of context nodes, or NDJSON with
+    ``Content-Type: application/x-ndjson``. Every item gets a status of
+    ``created``, ``conflict``, ``invalid`` or, when an atomic batch is
+    rejected, ``skipped``.
+    """
+    result = await _register_bulk(request, atomic)
+    logger.info("[alias] bulk registered %d of %d", result.created, len(result.items))
+    return result
+
 @router.get(
     "/context",
     response_model=ToolListResponse,
     status_code=200,
     summary="List all registered context nodes (alias)"
 )
-def list_contexts_alias():
-    logger.info("[alias] listing contexts")
-    default = ContextNode(
-        id="candidate_search",
-        name="Candidate Search",
-        description="Search candidates by experience, location, and department",
-        prompt="",
-        parameters={}
+def list_contexts_alias(request: Request):
+    ensure_default_contexts()
+    return cached_json_response(
+        request, "context", STORE.version,
+        lambda: ToolListResponse(tools=list(STORE.values())),
     )
-    STORE.setdefault(default.id, default)
-    return ToolListResponse(tools=list(STORE.values()))
 
 @router.get(
     "/context/{node_id}",
@@ -71,33 +209,57 @@ def get_context_alias(node_id: str):
 )
 async def register_context(node: ContextNode):
     logger.info("[mcp] registering %s", node.id)
-    if node.id in STORE:
+    if not STORE.insert(node):
         raise HTTPException(400, "Node already exists")
-    STORE[node.id] = node
     return node
 
+@router.post(
+    "/register/bulk",
+    response_model=BulkRegisterResponse,
+    status_code=200,
+    summary="Register many tool/context nodes at once"
+)
+async def register_contexts_bulk(
+    request: Request,
+    atomic: bool = Query(False, description="Apply all nodes or none"),
+):
+    result = await _register_bulk(request, atomic)
+    logger.info("[mcp] bulk registered %d of %d", result.created, len(result.items))
+    return result
+
 @router.get(
     "/context-all",
     response_model=List[ContextNode],
     status_code=200,
     summary="List all registered context nodes (flat)"
 )
-def list_contexts_mcp_server():
-    logger.info("[mcp] listing contexts flat")
-    return list(STORE.values())
+def list_contexts_mcp_server(request: Request):
+    return cached_json_response(
+        request, "context-all", STORE.version, lambda: list(STORE.values())
+    )
 
 @router.post(
     "/resolve",
-    response_model=Dict[str, List[ContextNode]],
+    response_model=ResolveResponse,
+    response_model_exclude_none=True,
     status_code=200,
     summary="Resolve a bundle of context node IDs"
 )
-def resolve_bundle(ids: List[str]):
+def resolve_bundle(
+    ids: List[str],
+    partial: bool = Query(False, description="Return found nodes plus a `missing` list instead of 404"),
+):
     logger.info("[mcp] resolving bundle %s", ids)
     bundle: List[ContextNode] = []
+    missing: List[str] = []
     for node_id in ids:
         node = STORE.get(node_id)
         if not node:
-            raise HTTPException(404, f"Node {node_id} not found")
+            if not partial:
+                raise HTTPException(404, f"Node {node_id} not found")
+            missing.append(node_id)
+            continue
         bundle.append(node)
-    return {"bundle": bundle}
+    if partial:
+        return ResolveResponse(bundle=bundle, missing=missing)
+    return ResolveResponse(bundle=bundle)
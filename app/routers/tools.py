@@ -1,32 +1,201 @@
 import json
-from fastapi import APIRouter, Query
-from sse_starlette.sse import EventSourceResponse
-from app.services.candidate_service import search_candidates
-from app.prompts.candidate_prompt import generate_candidate_prompt
-import asyncio
+import math
+from typing import Any, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.types import Receive, Scope, Send
+from app.keycloak import bearer_scheme, verify_access_token
+from app import config
+from app.services.admission import ADMISSION, AdmissionRejected, Ticket
+from app.services.sse_replay import REPLAY_BUFFER
+from app.services.candidate_service import (
+    DEFAULT_SORT,
+    SORTS,
+    candidate_facets,
+    decode_cursor,
+    encode_candidates,
+    encode_cursor,
+    iter_candidates,
+    text_index_enabled,
+    text_search,
+)
+from app.services.search_cache import SEARCH_CACHE, cached_search
+from app.services.search_executor import SEARCH_EXECUTOR, take
+from app.services import candidate_backends
+from app.prompts.candidate_prompt import generate_candidate_prompt, generate_text_search_prompt
 
 router = APIRouter()
 
-async def event_generator(experience: int, location: str, department: str):
+DEFAULT_BATCH_SIZE = 100
+
+# Pre-framed "results" event; the candidates' JSON goes between the two
+_RESULTS_PREFIX = b"event: results\r\ndata: "
+_EVENT_END = b"\r\n\r\n"
+
+# Sent on idle streams; a comment line, so EventSource clients ignore it
+_KEEPALIVE = b": keepalive\r\n\r\n"
+
+def _event_source(events) -> Response:
+    # sse_starlette pulls in uvicorn; load it with the first stream, not at startup
+    from sse_starlette.sse import EventSourceResponse
+    # sse_starlette always runs its ping loop and spins on an interval of
+    # 0, so "off" is an interval that never elapses
+    interval = config.SSE_HEARTBEAT if config.SSE_HEARTBEAT > 0 else math.inf
+    return EventSourceResponse(events, ping=interval, ping_message_factory=lambda: _KEEPALIVE)
+
+def _resumable(request: Request, subject: str, make_events):
+    """
+    Numbered events for a new stream from ``make_events()``, or, when the
+    client reconnects with a resumable ``Last-Event-ID``, the rest of the
+    stream it was reading, without searching again.
+    """
+    last_event_id = request.headers.get("last-event-id")
+    resumed = REPLAY_BUFFER.resume(last_event_id, subject) if last_event_id else None
+    if resumed is None:
+        stream, after = REPLAY_BUFFER.open(subject, make_events()), 0
+    else:
+        stream, after = resumed
+    return REPLAY_BUFFER.events(stream, after)
+
+class _AdmittedResponse(Response):
+    """Sends ``response`` and frees its admission ticket however the stream ends."""
+
+    def __init__(self, response: Response, ticket: Ticket):
+        self._response = response
+        self._ticket = ticket
+        self.status_code = response.status_code
+
+    @property
+    def background(self):
+        return self._response.background
+
+    @background.setter
+    def background(self, value):
+        self._response.background = value
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self._response(scope, receive, send)
+        finally:
+            self._ticket.release()
+
+async def stream_subject(
+    request: Request,
+    creds: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+) -> str:
+    """Who a stream counts against: the token's ``sub`` if one is sent, else the client IP."""
+    if creds is not None:
+        payload = await verify_access_token(creds)
+        if payload.get("sub"):
+            return f"sub:{payload['sub']}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+async def _admit(subject: str) -> Ticket:
+    try:
+        return await ADMISSION.acquire(subject)
+    except AdmissionRejected as exc:
+        raise HTTPException(
+            exc.status,
+            f"Too many streams ({exc.reason})",
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
+def results_event(batch) -> bytes:
+    """A complete SSE ``results`` frame built from the pre-encoded records."""
+    return encode_candidates(batch, _RESULTS_PREFIX, _EVENT_END)
+
+async def event_generator(
+    experience: int,
+    location: str,
+    department: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    sort: str = DEFAULT_SORT,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[Any, str]] = None,
+):
     """
-    Yields two Server-Sent Events:
+    Yields Server-Sent Events:
 
     1) prompt — the natural-language instruction sent to the LLM or other agent
        Event name: "prompt"
        Data payload: str
 
-    2) results — the list of candidate records matching the criteria
+    2) results — one event per batch of up to ``batch_size`` matching records
        Event name: "results"
        Data payload: List[Dict[str, Any]]
+
+    3) done — emitted once the matches are exhausted
+       Event name: "done"
+       Data payload: {"total": int}, plus "next_cursor" (str or null) for
+       paged requests
+
+    Matches are pulled lazily from the store one batch at a time, so memory
+    per stream stays bounded by the batch size. The next batch is only
+    produced once the previous event has been sent, which gives us the
+    client's backpressure for free. When the search cache is enabled (or
+    searches run on worker processes) the matches come from the cached
+    result list instead, unless there are more than the cache keeps. Those
+    are streamed lazily, and with worker processes each batch is a page
+    scanned across the shards, so large scans still use every core. A
+    paged request (``limit``, a cursor, or a non-default ``sort``) is
+    answered from the index directly, starting right after ``after``.
+
+    Searches and batch pulls run on ``SEARCH_EXECUTOR`` (a thread pool by
+    default), so a large scan doesn't hold up the event loop.
     """
     # Step 1: stream the generated prompt
     prompt = generate_candidate_prompt(experience, location, department)
     yield {"event": "prompt", "data": prompt}
-    await asyncio.sleep(1)
 
-    # Step 2: stream the search results
-    results = search_candidates(experience, location, department)
-    yield {"event": "results", "data": json.dumps(results)}
+    # Step 2: stream the search results in batches
+    paged = limit is not None or after is not None or sort != DEFAULT_SORT
+    next_after = None
+    if paged:
+        rows, next_after = await SEARCH_EXECUTOR.page(experience, location, department, sort, limit, after)
+        matches = iter(rows)
+
+        async def next_batch():
+            return take(matches, batch_size)
+    elif (
+        (SEARCH_CACHE.enabled or SEARCH_EXECUTOR.mode == "process")
+        and SEARCH_CACHE.fits(experience, location, department)
+    ):
+        matches = iter(await cached_search(experience, location, department))
+
+        async def next_batch():
+            return take(matches, batch_size)
+    elif SEARCH_EXECUTOR.mode == "process":
+        shard_after, exhausted = None, False
+
+        async def next_batch():
+            nonlocal shard_after, exhausted
+            if exhausted:
+                return []
+            batch, shard_after = await SEARCH_EXECUTOR.page(
+                experience, location, department, DEFAULT_SORT, batch_size, shard_after)
+            exhausted = shard_after is None
+            return batch
+    else:
+        matches = iter_candidates(experience, location, department)
+
+        async def next_batch():
+            return await SEARCH_EXECUTOR.call(take, matches, batch_size)
+    total = 0
+    while True:
+        batch = await next_batch()
+        if not batch and total:
+            break
+        total += len(batch)
+        yield results_event(batch)
+        if len(batch) < batch_size:
+            break
+
+    # Step 3: tell the client we are finished
+    done = {"total": total}
+    if paged:
+        done["next_cursor"] = encode_cursor(sort, next_after) if next_after else None
+    yield {"event": "done", "data": json.dumps(done)}
 
 
 @router.get(
@@ -35,23 +204,221 @@ async def event_generator(experience: int, location: str, department: str):
     summary="Search candidates with Server-Sent Events"
 )
 async def candidate_search_sse(
+    request:    Request,
     experience: int = Query(..., ge=0, description="Minimum years of experience"),
     location:   str = Query(...,       description="Candidate location"),
-    department: str = Query(...,       description="Functional department")
-) -> EventSourceResponse:
+    department: str = Query(...,       description="Functional department"),
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=10_000,
+                            description="Maximum candidates per results event"),
+    limit:      Optional[int] = Query(None, ge=1, le=10_000,
+                                      description="Page size; omit for every match"),
+    sort:       str = Query(DEFAULT_SORT, description="One of: " + ", ".join(SORTS)),
+    cursor:     Optional[str] = Query(None, description="`next_cursor` from the previous page"),
+    subject:    str = Depends(stream_subject),
+) -> Response:
     """
-    Streams a two-step SSE:
+    Streams the search as SSE:
       1) **prompt**:
          - Event name: "prompt"
          - Data:    a string instruction, e.g.
                     "Find candidates with at least 5 years of experience, located in Mumbai, in the Engineering department."
 
-      2) **results**:
+      2) **results** (one or more):
          - Event name: "results"
-         - Data:    a JSON array of candidate objects matching the criteria, e.g.
+         - Data:    a JSON array of up to `batch_size` candidate objects, e.g.
            [
              {"id":"1","name":"Alice",…},
              {"id":"3","name":"Charlie",…}
            ]
+         A search with no matches still sends a single empty batch.
+
+      3) **done**:
+         - Event name: "done"
+         - Data:    {"total": <number of candidates streamed>}
+                    Paged requests also get "next_cursor"; pass it back as
+                    `cursor` (with the same `sort`) for the next page. It is
+                    null on the last page.
+
+    Every event carries an id (`<stream>-<n>`). A client that reconnects
+    with `Last-Event-ID` gets the events after that one from a replay
+    buffer and the stream carries on from there; if the stream has expired
+    from the buffer the search starts over. Idle streams get keepalive
+    comments every MCP_SSE_HEARTBEAT seconds.
+
+    Streams are admission controlled per subject (the bearer token's `sub`,
+    or the client IP) and globally; see `/candidate/search/admission`.
+    Over-limit requests get 429 (this subject) or 503 (server busy) with
+    a `Retry-After` header.
+    """
+    if sort not in SORTS:
+        raise HTTPException(400, f"sort must be one of: {', '.join(SORTS)}")
+    try:
+        after = decode_cursor(cursor, sort) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(400, str(exc))
+    ticket = await _admit(subject)
+    events = _resumable(
+        request, subject,
+        lambda: event_generator(experience, location, department, batch_size, sort, limit, after),
+    )
+    return _AdmittedResponse(_event_source(events), ticket)
+
+
+async def text_event_generator(query: str, limit: int, match: str):
+    """
+    Yields the prompt, one results event with the ranked candidates (each
+    with a "score"), and done.
+    """
+    yield {"event": "prompt", "data": generate_text_search_prompt(query)}
+    hits = await SEARCH_EXECUTOR.call(text_search, query, limit, match)
+    ranked = [dict(candidate, score=score) for score, candidate in hits]
+    yield {"event": "results", "data": json.dumps(ranked)}
+    yield {"event": "done", "data": json.dumps({"total": len(ranked)})}
+
+
+@router.get(
+    "/candidate/text-search/sse",
+    status_code=200,
+    summary="Free-text candidate search with Server-Sent Events"
+)
+async def candidate_text_search_sse(
+    request: Request,
+    q:     str = Query(..., min_length=1, description='Free text, e.g. "python backend Bengaluru senior"'),
+    limit: int = Query(20, ge=1, le=1000, description="Maximum candidates to return"),
+    match: str = Query("any", regex="^(any|all)$",
+                       description="`all` requires every term, `any` ranks partial matches too"),
+    subject: str = Depends(stream_subject),
+) -> Response:
+    """
+    Streams prompt, results and done events like `/candidate/search/sse`,
+    and is resumable the same way.
+    Results are ranked by BM25 over the candidate profile fields; years of
+    experience are also indexed as "junior", "mid" or "senior".
+    """
+    if not text_index_enabled():
+        raise HTTPException(503, "Text index is disabled")
+    ticket = await _admit(subject)
+    events = _resumable(request, subject, lambda: text_event_generator(q, limit, match))
+    return _AdmittedResponse(_event_source(events), ticket)
+
+
+@router.get(
+    "/candidate/search",
+    status_code=200,
+    summary="Search candidates (JSON)"
+)
+async def candidate_search(
+    experience: int = Query(..., ge=0, description="Minimum years of experience"),
+    location:   str = Query(...,       description="Candidate location"),
+    department: str = Query(...,       description="Functional department"),
+):
+    """
+    Every match as one JSON array, sorted by (experience, id). This is the
+    protocol ``HTTPBackend`` speaks, so servers can federate each other.
+    """
+    return Response(
+        encode_candidates(await cached_search(experience, location, department)),
+        media_type="application/json",
+    )
+
+
+@router.get(
+    "/candidate/facets",
+    status_code=200,
+    summary="Candidate counts by location, department and experience"
+)
+def candidate_facets_endpoint(
+    experience:     int           = Query(0, ge=0,     description="Minimum years of experience"),
+    max_experience: Optional[int] = Query(None, ge=0,  description="Maximum years of experience"),
+    location:       Optional[str] = Query(None,        description="Only this location"),
+    department:     Optional[str] = Query(None,        description="Only this department"),
+    bucket:         int           = Query(5, ge=1, le=100,
+                                          description="Width of the experience buckets, in years"),
+):
+    """
+    Counts of the candidates matching the filter, grouped by location,
+    department and experience bucket, e.g. Engineering candidates per city
+    with 5+ years:
+
+        GET /tools/candidate/facets?department=Engineering&experience=5
+
+        {"total": 2,
+         "location": {"Bengaluru": 1, "Mumbai": 1},
+         "department": {"Engineering": 2},
+         "experience": {"5-9": 2}}
+
+    Served from count tables kept alongside the candidate index; no rows
+    are read.
+    """
+    return candidate_facets(experience, max_experience, location, department, bucket)
+
+
+async def federated_event_generator(experience: int, location: str, department: str, batch_size: int):
     """
-    return EventSourceResponse(event_generator(experience, location, department))
+    Yields the prompt, then for each backend as soon as it answers its
+    results (in batches, ids already sent by another backend dropped) and
+    a "shard" event with its status, count and latency. The "done" event
+    carries the total, whether any backend failed or timed out
+    ("partial"), and every backend's status.
+    """
+    yield {"event": "prompt", "data": generate_candidate_prompt(experience, location, department)}
+    seen = set()
+    total = 0
+    shards = []
+    async for shard in candidate_backends.FEDERATION.as_completed(experience, location, department):
+        rows = [c for c in shard.rows if c["id"] not in seen]
+        seen.update(c["id"] for c in rows)
+        for start in range(0, len(rows), batch_size):
+            yield results_event(rows[start:start + batch_size])
+        total += len(rows)
+        shards.append(shard.summary())
+        yield {"event": "shard", "data": json.dumps(shards[-1])}
+    done = {"total": total, "partial": any(s["status"] != "ok" for s in shards), "backends": shards}
+    yield {"event": "done", "data": json.dumps(done)}
+
+
+@router.get(
+    "/candidate/federated/sse",
+    status_code=200,
+    summary="Search every configured candidate backend with Server-Sent Events"
+)
+async def candidate_federated_sse(
+    request:    Request,
+    experience: int = Query(..., ge=0, description="Minimum years of experience"),
+    location:   str = Query(...,       description="Candidate location"),
+    department: str = Query(...,       description="Functional department"),
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=10_000,
+                            description="Maximum candidates per results event"),
+    subject:    str = Depends(stream_subject),
+) -> Response:
+    """
+    Fans the search out to every backend in MCP_CANDIDATE_BACKENDS at once
+    and streams each one's matches as it answers (see
+    `federated_event_generator`). Backends that fail or exceed
+    MCP_BACKEND_TIMEOUT are reported rather than failing the stream.
+    Admission control and resumption work as for `/candidate/search/sse`.
+    """
+    ticket = await _admit(subject)
+    events = _resumable(
+        request, subject,
+        lambda: federated_event_generator(experience, location, department, batch_size),
+    )
+    return _AdmittedResponse(_event_source(events), ticket)
+
+
+@router.get(
+    "/candidate/search/cache",
+    status_code=200,
+    summary="Candidate search cache statistics"
+)
+def candidate_search_cache_stats():
+    return SEARCH_CACHE.stats()
+
+
+@router.get(
+    "/candidate/search/admission",
+    status_code=200,
+    summary="SSE stream admission control state"
+)
+def candidate_search_admission_stats():
+    return ADMISSION.stats()
@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+class Candidate(BaseModel):
+    id: str
+    name: str
+    experience: int = Field(..., ge=0)
+    location: str
+    department: str
+
+    class Config:
+        # extra profile fields (skills, titles, ...) are kept and text-indexed
+        extra = "allow"
+
+class IngestRequest(BaseModel):
+    upsert: List[Candidate] = []
+    delete: List[str] = []
+
+class IngestResponse(BaseModel):
+    version: int
+    size: int
+    upserted: int
+    deleted: int
@@ -1,9 +1,26 @@
 from pydantic import BaseModel
-from typing import List
+from typing import Any, List, Optional
 from .common import ContextNode
 
 class ToolRegistration(BaseModel):
     node: ContextNode
 
 class ToolListResponse(BaseModel):
-    tools: List[ContextNode]
\ No newline at end of file
+    tools: List[ContextNode]
+
+class BulkItemStatus(BaseModel):
+    index: int
+    id: Optional[str] = None
+    status: str  # "created" | "conflict" | "invalid" | "skipped"
+    detail: Optional[Any] = None
+
+class BulkRegisterResponse(BaseModel):
+    applied: bool
+    created: int
+    conflicts: int
+    invalid: int
+    items: List[BulkItemStatus]
+
+class ResolveResponse(BaseModel):
+    bundle: List[ContextNode]
+    missing: Optional[List[str]] = None
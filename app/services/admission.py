@@ -0,0 +1,251 @@
+# app/services/admission.py
+
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from app import config
+from app.metrics import ADMISSION_QUEUE_DEPTH, ADMISSION_REJECTIONS, ADMISSION_WAIT
+
+
+class TokenBucket:
+    """``rate`` tokens per second, holding at most ``burst``."""
+
+    __slots__ = ("rate", "burst", "_tokens", "_updated", "_clock")
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._clock = clock
+        self._updated = clock()
+
+    def take(self) -> float:
+        """Take a token and return 0, or return the seconds until one is available."""
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status: int, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+        # whole seconds, as Retry-After wants
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class Ticket:
+    """An admitted stream; ``release`` is idempotent."""
+
+    __slots__ = ("_controller", "subject", "_released")
+
+    def __init__(self, controller: "AdmissionController", subject: str):
+        self._controller = controller
+        self.subject = subject
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._controller._release(self.subject)
+
+
+class AdmissionController:
+    """
+    Admission control for long-lived streams.
+
+    Per subject, a token bucket limits how fast new streams are opened
+    and a cap limits how many are open or queued at once; either one
+    rejects straight away with 429. Globally, a token bucket and a cap on
+    open streams apply the same way, but a request that finds them
+    exhausted waits in a bounded FIFO queue for up to ``queue_timeout``
+    seconds. It is rejected with 503 when the queue is full or the wait
+    runs out. Any limit set to 0 is off.
+    """
+
+    def __init__(
+        self,
+        max_streams: int = 0,
+        max_per_subject: int = 0,
+        rate: float = 0.0,
+        burst: int = 1,
+        subject_rate: float = 0.0,
+        subject_burst: int = 1,
+        queue_size: int = 0,
+        queue_timeout: float = 0.0,
+        max_subjects: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_streams = max_streams
+        self.max_per_subject = max_per_subject
+        self.subject_rate = subject_rate
+        self.subject_burst = subject_burst
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.max_subjects = max_subjects
+        self._clock = clock
+        self._bucket = TokenBucket(rate, burst, clock) if rate > 0 else None
+        # least recently seen first; an evicted subject just starts over
+        self._subject_buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._open = 0
+        # streams open or queued, per subject
+        self._by_subject: Dict[str, int] = {}
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.admitted = 0
+        self.queued = 0
+        self.rejected: Dict[str, int] = {}
+
+    # ─── admission ────────────────────────────────────────────────────
+    async def acquire(self, subject: str) -> Ticket:
+        """Admit a stream for ``subject`` or raise ``AdmissionRejected``."""
+        self._enter_subject(subject)
+        try:
+            if not self._waiters and self._take_global() == 0:
+                self._open += 1
+            else:
+                await self._wait()
+        except BaseException:
+            self._leave_subject(subject)
+            raise
+        self.admitted += 1
+        return Ticket(self, subject)
+
+    def _enter_subject(self, subject: str) -> None:
+        if self.max_per_subject and self._by_subject.get(subject, 0) >= self.max_per_subject:
+            self._reject(429, "subject_concurrency", 1)
+        if self.subject_rate > 0:
+            bucket = self._subject_buckets.get(subject)
+            if bucket is None:
+                bucket = self._subject_buckets[subject] = TokenBucket(
+                    self.subject_rate, self.subject_burst, self._clock)
+                if len(self._subject_buckets) > self.max_subjects:
+                    self._subject_buckets.popitem(last=False)
+            else:
+                self._subject_buckets.move_to_end(subject)
+            wait = bucket.take()
+            if wait:
+                self._reject(429, "subject_rate", wait)
+        self._by_subject[subject] = self._by_subject.get(subject, 0) + 1
+
+    def _leave_subject(self, subject: str) -> None:
+        n = self._by_subject.get(subject, 0) - 1
+        if n > 0:
+            self._by_subject[subject] = n
+        else:
+            self._by_subject.pop(subject, None)
+
+    def _take_global(self) -> float:
+        """0 if a global slot and token were taken, else a wait hint in seconds."""
+        if self.max_streams and self._open >= self.max_streams:
+            return self.queue_timeout or 1
+        if self._bucket is not None:
+            return self._bucket.take()
+        return 0.0
+
+    async def _wait(self) -> None:
+        if self.queue_depth() >= self.queue_size:
+            self._reject(503, "queue_full", self.queue_timeout)
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        self.queued += 1
+        started = self._clock()
+        try:
+            self._drain()
+            await asyncio.wait_for(asyncio.shield(fut), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if fut.done() and not fut.cancelled():
+                # admitted just as the wait ran out
+                return
+            fut.cancel()
+            self._reject(503, "queue_timeout", self.queue_timeout)
+        except BaseException:
+            # cancelled while queued or right after being admitted
+            if fut.done() and not fut.cancelled():
+                self._release_global()
+            fut.cancel()
+            raise
+        finally:
+            ADMISSION_WAIT.observe(self._clock() - started)
+
+    def _drain(self) -> None:
+        """Admit queued requests, oldest first, while the global limits allow."""
+        while self._waiters:
+            fut = self._waiters[0]
+            if fut.done():
+                self._waiters.popleft()
+                continue
+            wait = self._take_global()
+            if wait:
+                if self._timer is None and not (self.max_streams and self._open >= self.max_streams):
+                    # out of tokens rather than slots: retry once one accrues
+                    self._timer = asyncio.get_running_loop().call_later(wait, self._on_timer)
+                return
+            self._waiters.popleft()
+            self._open += 1
+            fut.set_result(None)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._drain()
+
+    def _release(self, subject: str) -> None:
+        self._leave_subject(subject)
+        self._release_global()
+
+    def _release_global(self) -> None:
+        self._open -= 1
+        if self._waiters:
+            self._drain()
+
+    def _reject(self, status: int, reason: str, retry_after: float) -> None:
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        ADMISSION_REJECTIONS.inc(labels=(reason,))
+        raise AdmissionRejected(status, reason, retry_after)
+
+    # ─── introspection ────────────────────────────────────────────────
+    def queue_depth(self) -> int:
+        return sum(1 for f in self._waiters if not f.done())
+
+    def stats(self) -> Dict[str, Any]:
+        busiest = sorted(self._by_subject.items(), key=lambda kv: -kv[1])[:10]
+        return {
+            "open": self._open,
+            "queued": self.queue_depth(),
+            "subjects": len(self._by_subject),
+            "busiest_subjects": dict(busiest),
+            "admitted": self.admitted,
+            "queued_total": self.queued,
+            "rejected": dict(self.rejected),
+            "limits": {
+                "max_streams": self.max_streams,
+                "max_per_subject": self.max_per_subject,
+                "rate": self._bucket.rate if self._bucket is not None else 0,
+                "burst": self._bucket.burst if self._bucket is not None else 0,
+                "subject_rate": self.subject_rate,
+                "subject_burst": self.subject_burst,
+                "queue_size": self.queue_size,
+                "queue_timeout": self.queue_timeout,
+            },
+        }
+
+
+ADMISSION = AdmissionController(
+    max_streams=config.MAX_STREAMS,
+    max_per_subject=config.MAX_STREAMS_PER_SUBJECT,
+    rate=config.STREAM_RATE,
+    burst=config.STREAM_BURST,
+    subject_rate=config.SUBJECT_STREAM_RATE,
+    subject_burst=config.SUBJECT_STREAM_BURST,
+    queue_size=config.ADMISSION_QUEUE_SIZE,
+    queue_timeout=config.ADMISSION_QUEUE_TIMEOUT,
+)
+ADMISSION_QUEUE_DEPTH.set_function(lambda: ADMISSION.queue_depth())
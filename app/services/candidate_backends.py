@@ -0,0 +1,258 @@
+# app/services/candidate_backends.py
+
+import asyncio
+import heapq
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app import config
+from app.services.search_cache import cached_search
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger("candidate_backends")
+
+
+class CandidateBackend(ABC):
+    """
+    An async source of candidates. ``search`` returns the matches for the
+    usual (experience floor, location, department) query, sorted by
+    (experience, id). ``timeout`` overrides the federation's default.
+    A backend without ``search`` fails when it's instantiated.
+    """
+
+    name: str
+    timeout: Optional[float] = None
+
+    @abstractmethod
+    async def search(self, experience: int, location: str, department: str) -> List[Dict]:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryBackend(CandidateBackend):
+    """This process's own candidate pool, through the search cache and executor."""
+
+    def __init__(self, name: str = "memory", timeout: Optional[float] = None):
+        self.name = name
+        self.timeout = timeout
+
+    async def search(self, experience: int, location: str, department: str) -> List[Dict]:
+        return await cached_search(experience, location, department)
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    experience INTEGER NOT NULL,
+    location TEXT NOT NULL,
+    department TEXT NOT NULL,
+    location_key TEXT NOT NULL,
+    department_key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS candidates_query
+    ON candidates (location_key, department_key, experience, id);
+"""
+
+
+def write_sqlite(path: str, candidates: Iterable[Dict]) -> None:
+    """Create or update a candidates database that ``SQLiteBackend`` can serve."""
+    conn = sqlite3.connect(path)
+    try:
+        with conn:
+            conn.executescript(_SQLITE_SCHEMA)
+            conn.executemany(
+                "INSERT OR REPLACE INTO candidates VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (c["id"], c["name"], c["experience"], c["location"], c["department"],
+                     c["location"].casefold(), c["department"].casefold())
+                    for c in candidates
+                ),
+            )
+    finally:
+        conn.close()
+
+
+class SQLiteBackend(CandidateBackend):
+    """
+    A local SQLite file laid out by ``write_sqlite``. One read-only
+    connection is shared and queries run in the default thread pool.
+    """
+
+    _QUERY = (
+        "SELECT id, name, experience, location, department FROM candidates "
+        "WHERE location_key = ? AND department_key = ? AND experience >= ? "
+        "ORDER BY experience, id"
+    )
+
+    def __init__(self, path: str, name: str = "sqlite", timeout: Optional[float] = None):
+        self.name = name
+        self.path = path
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+
+    def _search(self, experience: int, location: str, department: str) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                self._QUERY, (location.casefold(), department.casefold(), experience)).fetchall()
+        return [
+            {"id": cid, "name": name, "experience": exp, "location": loc, "department": dept}
+            for cid, name, exp, loc, dept in rows
+        ]
+
+    async def search(self, experience: int, location: str, department: str) -> List[Dict]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._search, experience, location, department)
+
+    async def close(self) -> None:
+        self._conn.close()
+
+
+# One pooled client for every HTTP backend, created on first use
+_http_client: Optional["httpx.AsyncClient"] = None
+
+
+def _client() -> "httpx.AsyncClient":
+    global _http_client
+    if _http_client is None:
+        import httpx
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=httpx.Timeout(10.0, connect=2.0),
+        )
+    return _http_client
+
+
+class HTTPBackend(CandidateBackend):
+    """
+    A remote source answering ``GET url?experience=&location=&department=``
+    with a JSON array of candidates, such as another server's
+    ``/tools/candidate/search``.
+    """
+
+    def __init__(self, url: str, name: str = "http", timeout: Optional[float] = None):
+        self.name = name
+        self.url = url
+        self.timeout = timeout
+
+    async def search(self, experience: int, location: str, department: str) -> List[Dict]:
+        r = await _client().get(
+            self.url, params={"experience": experience, "location": location, "department": department})
+        r.raise_for_status()
+        rows = r.json()
+        if not isinstance(rows, list):
+            raise ValueError(f"{self.url} did not return a JSON array")
+        # the remote's order isn't trusted for the merge
+        rows.sort(key=lambda c: (c["experience"], c["id"]))
+        return rows
+
+
+class ShardResult(NamedTuple):
+    backend: str
+    status: str  # "ok" | "timeout" | "error"
+    rows: List[Dict]
+    elapsed: float
+    error: Optional[str] = None
+
+    def summary(self) -> Dict[str, Any]:
+        out = {
+            "backend": self.backend,
+            "status": self.status,
+            "count": len(self.rows),
+            "elapsed_ms": round(self.elapsed * 1000, 1),
+        }
+        if self.error:
+            out["error"] = self.error
+        return out
+
+
+class Federation:
+    """
+    Scatter-gather over several backends. Every backend is queried at
+    once and given its own timeout; a backend that fails or times out
+    contributes no rows and is reported in its ``ShardResult``, so callers
+    get partial results instead of an error.
+    """
+
+    def __init__(self, backends: List[CandidateBackend], timeout: float):
+        self.backends = backends
+        self.timeout = timeout
+
+    async def _query(self, backend: CandidateBackend, experience: int, location: str, department: str) -> ShardResult:
+        started = time.perf_counter()
+        try:
+            rows = await asyncio.wait_for(
+                backend.search(experience, location, department), backend.timeout or self.timeout)
+        except asyncio.TimeoutError:
+            return ShardResult(backend.name, "timeout", [], time.perf_counter() - started)
+        except Exception as exc:
+            logger.warning("Backend %s failed: %s", backend.name, exc)
+            return ShardResult(backend.name, "error", [], time.perf_counter() - started, str(exc))
+        return ShardResult(backend.name, "ok", rows, time.perf_counter() - started)
+
+    async def as_completed(self, experience: int, location: str, department: str) -> AsyncIterator[ShardResult]:
+        """Each backend's result as soon as it answers (or gives up)."""
+        tasks = [
+            asyncio.ensure_future(self._query(b, experience, location, department))
+            for b in self.backends
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def search(self, experience: int, location: str, department: str) -> Tuple[List[Dict], List[ShardResult]]:
+        """All matches merged in (experience, id) order, first copy of each id kept."""
+        shards = [s async for s in self.as_completed(experience, location, department)]
+        seen = set()
+        merged = []
+        for c in heapq.merge(*(s.rows for s in shards), key=lambda c: (c["experience"], c["id"])):
+            if c["id"] not in seen:
+                seen.add(c["id"])
+                merged.append(c)
+        return merged, shards
+
+    async def close(self) -> None:
+        global _http_client
+        for backend in self.backends:
+            await backend.close()
+        if _http_client is not None:
+            await _http_client.aclose()
+            _http_client = None
+
+
+def open_backend(spec: str, timeout: Optional[float] = None) -> CandidateBackend:
+    """``[name=]memory``, ``[name=]sqlite:///path`` or ``[name=]http(s)://...``."""
+    name, sep, url = spec.partition("=")
+    if not sep or "://" in name:
+        name, url = "", spec
+    url = url.strip()
+    if url == "memory":
+        return MemoryBackend(name or "memory", timeout)
+    if url.startswith("sqlite:///"):
+        return SQLiteBackend(url[len("sqlite:///"):], name or "sqlite", timeout)
+    if url.startswith(("http://", "https://")):
+        return HTTPBackend(url, name or url, timeout)
+    raise ValueError(f"Unsupported candidate backend: {spec!r}")
+
+
+def open_federation(specs: str, timeout: float) -> Federation:
+    return Federation([open_backend(s.strip()) for s in specs.split(",") if s.strip()], timeout)
+
+
+FEDERATION = open_federation(config.CANDIDATE_BACKENDS, config.BACKEND_TIMEOUT)
+
+
+async def shutdown() -> None:
+    await FEDERATION.close()
@@ -0,0 +1,373 @@
+# app/services/candidate_columns.py
+
+import csv
+import json
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.candidate_service import CandidateStore, _norm, _versions
+
+FIELDS = ("id", "name", "experience", "location", "department")
+
+# Rows per step when gathering string bytes, to bound the index arrays
+_GATHER_ROWS = 1 << 16
+
+
+class StringColumn:
+    """Variable-width strings packed into one UTF-8 buffer plus offsets."""
+
+    def __init__(self, offsets: np.ndarray, data: bytes):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return bytes(self.data[start:end]).decode("utf-8")
+
+    @property
+    def nbytes(self) -> int:
+        return self.offsets.nbytes + len(self.data)
+
+
+class _Dictionary:
+    """Maps normalized categorical values to dense integer codes."""
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+        for v in values:
+            self.encode(v)
+
+    def encode(self, value: str) -> int:
+        key = _norm(value)
+        code = self._codes.get(key)
+        if code is None:
+            code = self._codes[key] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, value: str) -> Optional[int]:
+        return self._codes.get(_norm(value))
+
+
+class _Builder:
+    def __init__(self):
+        self.ids = bytearray()
+        self.id_offsets = array("q", [0])
+        self.names = bytearray()
+        self.name_offsets = array("q", [0])
+        self.experience = array("i")
+        self.location = array("I")
+        self.department = array("I")
+        self.locations = _Dictionary()
+        self.departments = _Dictionary()
+
+    def append(self, cid: str, name: str, experience: int, location: str, department: str) -> None:
+        self.ids += cid.encode("utf-8")
+        self.id_offsets.append(len(self.ids))
+        self.names += name.encode("utf-8")
+        self.name_offsets.append(len(self.names))
+        self.experience.append(int(experience))
+        self.location.append(self.locations.encode(location))
+        self.department.append(self.departments.encode(department))
+
+    def build(self) -> "CandidateColumns":
+        return CandidateColumns(
+            ids=StringColumn(np.frombuffer(self.id_offsets, dtype=np.int64), bytes(self.ids)),
+            names=StringColumn(np.frombuffer(self.name_offsets, dtype=np.int64), bytes(self.names)),
+            experience=np.frombuffer(self.experience, dtype=np.int32),
+            location=np.frombuffer(self.location, dtype=np.uint32),
+            department=np.frombuffer(self.department, dtype=np.uint32),
+            locations=self.locations.values,
+            departments=self.departments.values,
+        )
+
+
+class CandidateColumns:
+    """
+    Columnar candidate pool.
+
+    Experience is an int32 array, location and department are dictionary
+    encoded uint32 codes, and id/name live in packed string columns.
+    Filters run as vectorized boolean masks over the arrays.
+    """
+
+    def __init__(
+        self,
+        ids: StringColumn,
+        names: StringColumn,
+        experience: np.ndarray,
+        location: np.ndarray,
+        department: np.ndarray,
+        locations: List[str],
+        departments: List[str],
+    ):
+        self.ids = ids
+        self.names = names
+        self.experience = experience
+        self.location = location
+        self.department = department
+        self.locations = _Dictionary(locations)
+        self.departments = _Dictionary(departments)
+
+    def __len__(self) -> int:
+        return len(self.experience)
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.ids.nbytes + self.names.nbytes + self.experience.nbytes
+            + self.location.nbytes + self.department.nbytes
+        )
+
+    # ─── loaders ──────────────────────────────────────────────────────
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "CandidateColumns":
+        b = _Builder()
+        for r in records:
+            b.append(r["id"], r["name"], r["experience"], r["location"], r["department"])
+        return b.build()
+
+    @classmethod
+    def from_csv(cls, path: str) -> "CandidateColumns":
+        b = _Builder()
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            idx = [header.index(name) for name in FIELDS]
+            for row in reader:
+                if row:
+                    b.append(*(row[i] for i in idx))
+        return b.build()
+
+    @classmethod
+    def from_jsonl(cls, path: str) -> "CandidateColumns":
+        b = _Builder()
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    r = json.loads(line)
+                    b.append(r["id"], r["name"], r["experience"], r["location"], r["department"])
+        return b.build()
+
+    # ─── queries ──────────────────────────────────────────────────────
+    def mask(self, experience: int, location: str, department: str) -> np.ndarray:
+        loc = self.locations.lookup(location)
+        dept = self.departments.lookup(department)
+        if loc is None or dept is None:
+            return np.zeros(len(self), dtype=bool)
+        return (self.location == loc) & (self.department == dept) & (self.experience >= experience)
+
+    def record(self, i: int) -> Dict:
+        return {
+            "id": self.ids[i],
+            "name": self.names[i],
+            "experience": int(self.experience[i]),
+            "location": self.locations.values[self.location[i]],
+            "department": self.departments.values[self.department[i]],
+        }
+
+    def search(self, experience: int, location: str, department: str) -> List[Dict]:
+        rows = np.flatnonzero(self.mask(experience, location, department))
+        return [self.record(i) for i in rows]
+
+
+# ─── store ────────────────────────────────────────────────────────────
+def _gather(col: StringColumn, rows: np.ndarray, width: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The bytes of ``col[rows]``, in that order: packed into one uint8 array
+    plus offsets, or, with ``width``, as an (n, width) zero-padded matrix.
+    Vectorized in chunks of rows so the index arrays stay small.
+    """
+    data = np.frombuffer(col.data, dtype=np.uint8)
+    starts = col.offsets[:-1][rows]
+    lengths = col.offsets[1:][rows] - starts
+    offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    if width is None:
+        out = np.empty(int(offsets[-1]), dtype=np.uint8)
+    else:
+        out = np.zeros((len(rows), width), dtype=np.uint8)
+    for lo in range(0, len(rows), _GATHER_ROWS):
+        hi = min(lo + _GATHER_ROWS, len(rows))
+        n = lengths[lo:hi]
+        # position of every byte within its string
+        within = np.arange(int(n.sum()), dtype=np.int64) - np.repeat(offsets[lo:hi] - offsets[lo], n)
+        src = np.repeat(starts[lo:hi], n) + within
+        if width is None:
+            out[offsets[lo]:offsets[hi]] = data[src]
+        else:
+            out[np.repeat(np.arange(lo, hi), n), within] = data[src]
+    return out, offsets
+
+
+def _sorted_columns(columns: CandidateColumns) -> CandidateColumns:
+    """
+    The rows sorted by (location, department, experience, id); a repeated
+    id keeps only its last row, as a later upsert would.
+
+    Ids are compared as fixed-width zero-padded byte strings, which sort
+    like the str ids (UTF-8 preserves code point order), so the dedupe and
+    the id ranks come from one ``np.unique`` and nothing is decoded.
+    """
+    n = len(columns)
+    if not n:
+        return columns
+    width = max(1, int(np.diff(columns.ids.offsets).max()))
+    keys, _ = _gather(columns.ids, np.arange(n), width)
+    keys = keys.view(f"S{width}").ravel()
+    # unique over the reversed rows finds each id's last occurrence, and
+    # returns the ids sorted, so the position is the id's rank
+    _, last = np.unique(keys[::-1], return_index=True)
+    keep = n - 1 - last
+    del keys
+    order = keep[np.lexsort((
+        np.arange(len(keep)), columns.experience[keep], columns.department[keep], columns.location[keep],
+    ))]
+    return _take_rows(columns, order)
+
+
+def _take_rows(columns: CandidateColumns, rows: np.ndarray) -> CandidateColumns:
+    """New columns holding ``rows`` of ``columns``, in that order."""
+
+    def take_strings(col: StringColumn) -> StringColumn:
+        data, offsets = _gather(col, rows)
+        return StringColumn(offsets, data.tobytes())
+
+    return CandidateColumns(
+        ids=take_strings(columns.ids),
+        names=take_strings(columns.names),
+        experience=columns.experience[rows],
+        location=columns.location[rows],
+        department=columns.department[rows],
+        locations=columns.locations.values,
+        departments=columns.departments.values,
+    )
+
+
+def take_shard(columns: CandidateColumns, shard: int, shards: int) -> CandidateColumns:
+    """
+    Every ``shards``-th row starting at ``shard``. Taking sorted rows in
+    order keeps them sorted, so the result needs only ``_bucket_ranges``.
+    """
+    return _take_rows(columns, np.arange(shard, len(columns), shards))
+
+
+def _bucket_ranges(columns: CandidateColumns) -> List[List[int]]:
+    """[location code, department code, first row, end row] per bucket of sorted columns."""
+    n = len(columns)
+    if not n:
+        return []
+    keys = columns.location.astype(np.int64) * (len(columns.departments.values) + 1) + columns.department
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+    ends = np.append(starts[1:], n)
+    return [
+        [int(columns.location[s]), int(columns.department[s]), int(s), int(e)]
+        for s, e in zip(starts, ends)
+    ]
+
+
+class _RowRange(Sequence):
+    """Rows ``start..end`` of the columns, materialized as dicts on access."""
+
+    def __init__(self, columns: CandidateColumns, start: int, end: int):
+        self._columns = columns
+        self._start = start
+        self._end = end
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._columns.record(self._start + j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self._columns.record(self._start + i)
+
+
+class _Permuted(Sequence):
+    """``get(row)`` for each row number in ``order``, computed on access."""
+
+    def __init__(self, get, order: np.ndarray):
+        self._get = get
+        self._order = order
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __getitem__(self, i):
+        return self._get(int(self._order[i]))
+
+
+class ColumnarCandidateStore(CandidateStore):
+    """
+    Read-only ``CandidateStore`` over ``CandidateColumns``.
+
+    The columns are kept sorted by (location, department, experience, id),
+    so every index bucket is a contiguous row range: searches and pages
+    run the same bisect logic as the in-memory store over array views,
+    facet counts come from the experience runs, and only the returned rows
+    are ever turned into dicts. A bucket's (name, id) order is a row
+    permutation built the first time it's paged by name. ``buckets`` (from
+    ``_bucket_ranges``) means the columns are already sorted.
+    """
+
+    def __init__(self, columns: CandidateColumns, buckets: Optional[List[List[int]]] = None):
+        if buckets is None:
+            columns = _sorted_columns(columns)
+            buckets = _bucket_ranges(columns)
+        self.columns = columns
+        locations, departments = columns.locations.values, columns.departments.values
+        self._ranges: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        self._counts = {}
+        self._labels = {}
+        self._names = {}
+        for loc, dept, start, end in buckets:
+            key = (_norm(locations[loc]), _norm(departments[dept]))
+            self._ranges[key] = (start, end)
+            exps, counts = np.unique(columns.experience[start:end], return_counts=True)
+            self._counts[key] = dict(zip(exps.tolist(), counts.tolist()))
+            self._labels[key] = (locations[loc], departments[dept])
+        self._size = len(columns)
+        self.text = None
+        self._encoded = {}
+        self.version = next(_versions)
+
+    def add(self, candidate: Dict) -> None:
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    def apply(self, upserts=(), deletes=()) -> CandidateStore:
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    def records(self):
+        return (self.columns.record(i) for i in range(self._size))
+
+
+    def _bucket(self, location: str, department: str) -> Optional[Tuple[Sequence[int], Sequence[Dict]]]:
+        span = self._ranges.get((_norm(location), _norm(department)))
+        if span is None:
+            return None
+        start, end = span
+        return self.columns.experience[start:end], _RowRange(self.columns, start, end)
+
+    def _name_key_at(self, i: int) -> Tuple[str, str]:
+        return (self.columns.names[i], self.columns.ids[i])
+
+    def _name_bucket(self, location: str, department: str) -> Optional[Tuple[Sequence[Tuple[str, str]], Sequence[Dict]]]:
+        key = (_norm(location), _norm(department))
+        span = self._ranges.get(key)
+        if span is None:
+            return None
+        order = self._names.get(key)
+        if order is None:
+            # read-only, so the permutation never goes stale
+            order = self._names[key] = np.array(sorted(range(*span), key=self._name_key_at), dtype=np.int64)
+        return _Permuted(self._name_key_at, order), _Permuted(self.columns.record, order)
@@ -0,0 +1,131 @@
+# app/services/candidate_ingest.py
+
+import asyncio
+import csv
+import json
+import logging
+import os
+from typing import Dict, Iterator, Optional, Tuple
+
+from app import config
+from app.services import candidate_service
+from app.services.candidate_service import CandidateStore
+
+logger = logging.getLogger("candidate_ingest")
+
+
+def read_candidates(path: str) -> Iterator[Dict]:
+    """Candidate records from a CSV (with a header row) or JSONL file."""
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                row["experience"] = int(row["experience"])
+                yield row
+    elif path.endswith((".jsonl", ".ndjson")):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        raise ValueError(f"Unsupported candidate file: {path}")
+
+
+def load_store(path: str) -> CandidateStore:
+    """
+    Build a complete store from ``path``; nothing is published. A repeated
+    id replaces the earlier record, as a later upsert would.
+    """
+    if path.endswith(".snap"):
+        from app.services.candidate_snapshot import SnapshotCandidateStore
+        return SnapshotCandidateStore(path)
+    if config.CANDIDATE_COLUMNAR:
+        # numpy only loads when columns are asked for
+        from app.services.candidate_columns import CandidateColumns, ColumnarCandidateStore
+        if path.endswith(".csv"):
+            return ColumnarCandidateStore(CandidateColumns.from_csv(path))
+        if path.endswith((".jsonl", ".ndjson")):
+            return ColumnarCandidateStore(CandidateColumns.from_jsonl(path))
+        raise ValueError(f"Unsupported candidate file: {path}")
+    return CandidateStore({c["id"]: c for c in read_candidates(path)}.values())
+
+
+def reload(path: str) -> CandidateStore:
+    """Replace the whole pool with the contents of ``path``."""
+    store = load_store(path)
+    candidate_service.replace(store)
+    logger.info("Loaded %d candidates from %s (version %d)", len(store), path, store.version)
+    return store
+
+
+class FileWatcher:
+    """
+    Polls a candidate file's mtime and size and reloads the pool when they
+    change. The new store is built in a worker thread and published with a
+    reference swap, so searches keep running against the old one meanwhile.
+    A file that fails to load is logged and the current pool kept.
+    """
+
+    def __init__(self, path: str, interval: float):
+        self.path = path
+        self.interval = interval
+        self.reloads = 0
+        self._seen: Optional[Tuple[int, int]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    async def poll(self) -> bool:
+        """Reload if the file changed since the last poll; True if it did."""
+        stamp = self._stamp()
+        if stamp is None or stamp == self._seen:
+            return False
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, reload, self.path)
+        except Exception:
+            logger.exception("Reloading candidates from %s failed", self.path)
+            return False
+        finally:
+            self._seen = stamp
+        self.reloads += 1
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.poll()
+
+    def start(self) -> None:
+        self._seen = self._stamp()
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+_watcher: Optional[FileWatcher] = None
+
+
+async def startup() -> None:
+    global _watcher
+    if not config.CANDIDATE_SOURCE:
+        return
+    await asyncio.get_running_loop().run_in_executor(None, reload, config.CANDIDATE_SOURCE)
+    if config.CANDIDATE_WATCH_INTERVAL > 0:
+        _watcher = FileWatcher(config.CANDIDATE_SOURCE, config.CANDIDATE_WATCH_INTERVAL)
+        _watcher.start()
+
+
+async def shutdown() -> None:
+    global _watcher
+    if _watcher is not None:
+        _watcher.stop()
+        _watcher = None
@@ -1,4 +1,14 @@
-from typing import List, Dict
+import base64
+import copy
+import json
+import threading
+from bisect import bisect_left, bisect_right
+from itertools import count
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from app import config
+from app.metrics import SEARCH_ROWS_RETURNED, SEARCH_ROWS_SCANNED
+from app.services.text_index import TextIndex
 
 # Mock candidate database
 CANDIDATES: List[Dict] = [
@@ -7,10 +17,471 @@ CANDIDATES: List[Dict] = [
     {"id": "3", "name": "Charlie", "experience": 7, "location": "Bengaluru", "department": "Engineering"},
 ]
 
+
+# Process-wide so a replaced store never reuses an older store's version
+_versions = count(1)
+
+DEFAULT_SORT = "experience_asc"
+SORTS = ("experience_asc", "experience_desc", "name")
+
+
+def _norm(value: str) -> str:
+    return value.casefold()
+
+
+def _name_key(candidate: Dict) -> Tuple[str, str]:
+    return (candidate["name"], candidate["id"])
+
+
+def sort_key(sort: str, candidate: Dict) -> Tuple[Any, str]:
+    if sort == "name":
+        return _name_key(candidate)
+    return (candidate["experience"], candidate["id"])
+
+
+class CandidateStore:
+    """
+    Candidate pool indexed on normalized (location, department).
+
+    Each index bucket keeps its candidates sorted by (experience, id), so
+    the ``experience >=`` filter is a bisect plus a slice instead of a scan,
+    and a page cursor on experience is a bisect too.
+
+    ``version`` changes on every mutation; caches of query results compare
+    it to decide whether an entry is still valid. With ``text_index`` the
+    store also keeps a free-text ``TextIndex`` over the same candidates.
+
+    Every candidate's JSON is encoded once when it is added, and result
+    payloads are assembled by joining those bytes (see ``encode_array``).
+
+    Published stores are never mutated: ``apply`` derives a new store that
+    shares every bucket the change doesn't touch, and ``ingest`` swaps it in.
+
+    Next to every bucket the store keeps an experience -> count table,
+    updated on add and discard, so ``facets`` aggregates without touching
+    a single row, and a second copy of the bucket sorted by (name, id), so
+    a name-ordered page cursor is a bisect as well.
+    """
+
+    def __init__(self, candidates: Iterable[Dict] = (), text_index: bool = config.TEXT_INDEX_ENABLED):
+        # (location, department) -> parallel lists of experience and candidates
+        self._index: Dict[Tuple[str, str], Tuple[List[int], List[Dict]]] = {}
+        self._size = 0
+        self.text: Optional[TextIndex] = TextIndex() if text_index else None
+        # id -> (candidate, its JSON bytes)
+        self._encoded: Dict[str, Tuple[Dict, bytes]] = {}
+        # (location, department) -> experience -> number of candidates, and the
+        # display labels the bucket was first seen with
+        self._counts: Dict[Tuple[str, str], Dict[int, int]] = {}
+        self._labels: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        # (location, department) -> parallel lists of (name, id) and candidates
+        self._names: Dict[Tuple[str, str], Tuple[List[Tuple[str, str]], List[Dict]]] = {}
+        # buckets this store may change in place; the others are shared
+        # with the store it was derived from
+        self._owned: Set[Tuple[str, str]] = set()
+        self.version = next(_versions)
+        for c in candidates:
+            self.add(c)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, candidate_id: str) -> bool:
+        return candidate_id in self._encoded
+
+    def records(self) -> Iterator[Dict]:
+        """Every candidate, in no particular order."""
+        return (entry[0] for entry in self._encoded.values())
+
+    def _writable_bucket(self, key: Tuple[str, str]) -> Tuple[List[int], List[Dict]]:
+        bucket = self._index.get(key)
+        if bucket is None:
+            bucket = self._index[key] = ([], [])
+            self._counts[key] = {}
+            self._names[key] = ([], [])
+        elif key not in self._owned:
+            bucket = self._index[key] = (list(bucket[0]), list(bucket[1]))
+            self._counts[key] = dict(self._counts[key])
+            names = self._names[key]
+            self._names[key] = (list(names[0]), list(names[1]))
+        self._owned.add(key)
+        return bucket
+
+    def add(self, candidate: Dict) -> None:
+        key = (_norm(candidate["location"]), _norm(candidate["department"]))
+        exps, rows = self._writable_bucket(key)
+        exp = candidate["experience"]
+        pos = self._position(exps, rows, exp, candidate["id"], after=True)
+        exps.insert(pos, exp)
+        rows.insert(pos, candidate)
+        counts = self._counts[key]
+        counts[exp] = counts.get(exp, 0) + 1
+        name_keys, named = self._names[key]
+        pos = bisect_left(name_keys, _name_key(candidate))
+        name_keys.insert(pos, _name_key(candidate))
+        named.insert(pos, candidate)
+        self._labels.setdefault(key, (candidate["location"], candidate["department"]))
+        self._encoded[candidate["id"]] = (candidate, json.dumps(candidate).encode("utf-8"))
+        self._size += 1
+        if self.text is not None:
+            self.text.add(candidate)
+        self.version = next(_versions)
+
+    def _discard(self, candidate_id: str) -> bool:
+        entry = self._encoded.pop(candidate_id, None)
+        if entry is None:
+            return False
+        candidate = entry[0]
+        key = (_norm(candidate["location"]), _norm(candidate["department"]))
+        exps, rows = self._writable_bucket(key)
+        pos = self._position(exps, rows, candidate["experience"], candidate_id, after=False)
+        del exps[pos]
+        del rows[pos]
+        counts = self._counts[key]
+        counts[candidate["experience"]] -= 1
+        if not counts[candidate["experience"]]:
+            del counts[candidate["experience"]]
+        name_keys, named = self._names[key]
+        pos = bisect_left(name_keys, _name_key(candidate))
+        del name_keys[pos]
+        del named[pos]
+        if not rows:
+            del self._index[key]
+            del self._counts[key]
+            del self._names[key]
+            del self._labels[key]
+            self._owned.discard(key)
+        self._size -= 1
+        if self.text is not None:
+            self.text.remove(candidate_id)
+        return True
+
+    def apply(self, upserts: Iterable[Dict] = (), deletes: Iterable[str] = ()) -> "CandidateStore":
+        """
+        A new store with ``deletes`` removed and ``upserts`` inserted or
+        replaced by id; this store is left untouched, and later changes to
+        it don't reach the new one either. Only the buckets a
+        change lands in are copied, so a batch costs a dict copy plus the
+        touched buckets, and streams still paging through this store never
+        see it change.
+        """
+        store = copy.copy(self)
+        store._index = dict(self._index)
+        store._owned = set()
+        # every bucket is shared now, so this store must copy before writing too
+        self._owned = set()
+        store._encoded = dict(self._encoded)
+        store._counts = dict(self._counts)
+        store._names = dict(self._names)
+        store._labels = dict(self._labels)
+        store.text = self.text.copy() if self.text is not None else None
+        for candidate_id in deletes:
+            store._discard(candidate_id)
+        for candidate in upserts:
+            store._discard(candidate["id"])
+            store.add(candidate)
+        store.version = next(_versions)
+        return store
+
+    def _bucket(self, location: str, department: str) -> Optional[Tuple[Sequence[int], Sequence[Dict]]]:
+        """The (experiences, candidates) bucket for a query, both sorted by (experience, id)."""
+        return self._index.get((_norm(location), _norm(department)))
+
+    def _name_bucket(self, location: str, department: str) -> Optional[Tuple[Sequence[Tuple[str, str]], Sequence[Dict]]]:
+        """The same bucket as (name keys, candidates), both sorted by (name, id)."""
+        return self._names.get((_norm(location), _norm(department)))
+
+    def facets(
+        self,
+        experience: int = 0,
+        max_experience: Optional[int] = None,
+        location: Optional[str] = None,
+        department: Optional[str] = None,
+        bucket_width: int = 5,
+    ) -> Dict[str, Any]:
+        """
+        How many candidates match the filter, broken down by location, by
+        department and by experience bucket (``bucket_width`` years wide).
+        Omitted filters match everything. Sums the per-bucket count tables,
+        so the cost grows with the distinct (location, department,
+        experience) values, not with the number of candidates.
+        """
+        loc = _norm(location) if location is not None else None
+        dept = _norm(department) if department is not None else None
+        if loc is not None and dept is not None:
+            keys: Iterable[Tuple[str, str]] = [(loc, dept)] if (loc, dept) in self._counts else []
+        else:
+            keys = [k for k in self._counts if (loc is None or k[0] == loc) and (dept is None or k[1] == dept)]
+
+        by_location: Dict[str, int] = {}
+        by_department: Dict[str, int] = {}
+        by_experience: Dict[int, int] = {}
+        total = 0
+        for key in keys:
+            matched = 0
+            for exp, n in self._counts[key].items():
+                if exp < experience or (max_experience is not None and exp > max_experience):
+                    continue
+                low = exp - exp % bucket_width
+                by_experience[low] = by_experience.get(low, 0) + n
+                matched += n
+            if not matched:
+                continue
+            loc_label, dept_label = self._labels[key]
+            by_location[loc_label] = by_location.get(loc_label, 0) + matched
+            by_department[dept_label] = by_department.get(dept_label, 0) + matched
+            total += matched
+
+        def ranked(counts: Dict[str, int]) -> Dict[str, int]:
+            return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+        def label(low: int) -> str:
+            return str(low) if bucket_width == 1 else f"{low}-{low + bucket_width - 1}"
+
+        return {
+            "total": total,
+            "location": ranked(by_location),
+            "department": ranked(by_department),
+            "experience": {label(low): by_experience[low] for low in sorted(by_experience)},
+        }
+
+    def encode_array(self, candidates: Iterable[Dict], prefix: bytes = b"", suffix: bytes = b"") -> bytes:
+        """
+        ``prefix + json.dumps(candidates) + suffix`` built from the
+        pre-encoded records with a single join, so there is no per-request
+        JSON encoding and no intermediate str. Records this store didn't
+        encode (or an older copy of one) fall back to ``json.dumps``.
+        """
+        encoded = self._encoded
+        parts = [prefix, b"["]
+        for c in candidates:
+            entry = encoded.get(c["id"])
+            parts.append(entry[1] if entry is not None and entry[0] is c else json.dumps(c).encode("utf-8"))
+            parts.append(b",")
+        if len(parts) > 2:
+            parts.pop()
+        parts.append(b"]")
+        parts.append(suffix)
+        return b"".join(parts)
+
+    @staticmethod
+    def _position(exps: List[int], rows: List[Dict], exp: int, cid: str, after: bool) -> int:
+        """
+        Index of the first row sorting after (``after=True``) or at-or-after
+        (``after=False``) the key (exp, cid).
+        """
+        lo, hi = bisect_left(exps, exp), bisect_right(exps, exp)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_id = rows[mid]["id"]
+            if mid_id < cid or (after and mid_id == cid):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def search(self, experience: int, location: str, department: str) -> List[Dict]:
+        bucket = self._bucket(location, department)
+        if bucket is None:
+            return []
+        exps, rows = bucket
+        result = rows[bisect_left(exps, experience):]
+        SEARCH_ROWS_SCANNED.inc(len(result))
+        SEARCH_ROWS_RETURNED.inc(len(result))
+        return result
+
+    def count(self, experience: int, location: str, department: str) -> int:
+        """How many candidates ``search`` would return, by bisect alone."""
+        bucket = self._bucket(location, department)
+        if bucket is None:
+            return 0
+        exps, rows = bucket
+        return len(rows) - bisect_left(exps, experience)
+
+    def iter_search(self, experience: int, location: str, department: str) -> Iterator[Dict]:
+        """Lazily yield matches without materializing the result list."""
+        bucket = self._bucket(location, department)
+        if bucket is None:
+            return
+        exps, rows = bucket
+        start = i = bisect_left(exps, experience)
+        try:
+            while i < len(rows):
+                yield rows[i]
+                i += 1
+        finally:
+            SEARCH_ROWS_SCANNED.inc(i - start)
+            SEARCH_ROWS_RETURNED.inc(i - start)
+
+    def page(
+        self,
+        experience: int,
+        location: str,
+        department: str,
+        sort: str = DEFAULT_SORT,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[Any, str]] = None,
+    ) -> Tuple[List[Dict], Optional[Tuple[Any, str]]]:
+        """
+        One page of matches in ``sort`` order, starting after the sort key
+        ``after``. Returns the rows and the key to resume from, or None
+        when this was the last page.
+
+        Experience orders come straight off the bucket: the cursor is a
+        bisect and the page a slice, so earlier pages are never revisited.
+        Name order does the same on the name-sorted copy of the bucket,
+        skipping rows under the experience floor as it walks forward.
+        """
+        bucket = self._bucket(location, department)
+        if bucket is None:
+            return [], None
+        exps, rows = bucket
+        floor = bisect_left(exps, experience)
+
+        if sort == "experience_asc":
+            start = floor if after is None else max(floor, self._position(exps, rows, *after, after=True))
+            end = len(rows) if limit is None else min(len(rows), start + limit)
+            result = rows[start:end]
+            scanned = len(result)
+            more = end < len(rows)
+        elif sort == "experience_desc":
+            end = len(rows) if after is None else self._position(exps, rows, *after, after=False)
+            start = floor if limit is None else max(floor, end - limit)
+            result = rows[start:end][::-1] if end > start else []
+            scanned = len(result)
+            more = start > floor
+        elif sort == "name":
+            name_keys, named = self._name_bucket(location, department)
+            start = i = 0 if after is None else bisect_right(name_keys, tuple(after))
+            want = len(named) if limit is None else limit + 1
+            result = []
+            while i < len(named) and len(result) < want:
+                c = named[i]
+                i += 1
+                if c["experience"] >= experience:
+                    result.append(c)
+            scanned = i - start
+            more = limit is not None and len(result) > limit
+            result = result[:limit]
+        else:
+            raise ValueError(f"Unknown sort: {sort}")
+
+        SEARCH_ROWS_SCANNED.inc(scanned)
+        SEARCH_ROWS_RETURNED.inc(len(result))
+        next_after = sort_key(sort, result[-1]) if more and result else None
+        return result, next_after
+
+
+def _initial_store() -> CandidateStore:
+    if config.CANDIDATE_SNAPSHOT:
+        # numpy/mmap only load when a snapshot is actually configured
+        from app.services.candidate_snapshot import SnapshotCandidateStore
+        return SnapshotCandidateStore(config.CANDIDATE_SNAPSHOT)
+    return CandidateStore(CANDIDATES)
+
+
+CANDIDATE_STORE = _initial_store()
+
+# Serializes writers; readers only ever load the CANDIDATE_STORE reference
+_ingest_lock = threading.Lock()
+
+
+def publish(store: CandidateStore) -> None:
+    """Make ``store`` the one searches use, with a single reference swap."""
+    global CANDIDATE_STORE
+    CANDIDATE_STORE = store
+
+
+def replace(store: CandidateStore) -> None:
+    """
+    Publish ``store`` as the whole pool, in order with ``ingest`` batches,
+    so a batch based on the old pool can't be published over it.
+    """
+    with _ingest_lock:
+        publish(store)
+
+
+def ingest(upserts: Iterable[Dict] = (), deletes: Iterable[str] = ()) -> Tuple[CandidateStore, int]:
+    """
+    Apply a batch of upserts and deletes to a copy of the current store
+    and publish it. Returns the new store and how many deletes matched.
+    Raises TypeError if the current store is read-only.
+    """
+    deletes = list(deletes)
+    with _ingest_lock:
+        current = CANDIDATE_STORE
+        deleted = sum(1 for cid in set(deletes) if cid in current)
+        store = current.apply(upserts, deletes)
+        publish(store)
+    return store, deleted
+
+
 def search_candidates(experience: int, location: str, department: str) -> List[Dict]:
-    return [
-        c for c in CANDIDATES
-        if c["experience"] >= experience
-        and c["location"].lower() == location.lower()
-        and c["department"].lower() == department.lower()
-    ]
\ No newline at end of file
+    return CANDIDATE_STORE.search(experience, location, department)
+
+
+def count_candidates(experience: int, location: str, department: str) -> int:
+    return CANDIDATE_STORE.count(experience, location, department)
+
+
+def iter_candidates(experience: int, location: str, department: str) -> Iterator[Dict]:
+    return CANDIDATE_STORE.iter_search(experience, location, department)
+
+
+def dataset_version() -> int:
+    return CANDIDATE_STORE.version
+
+
+def search_page(
+    experience: int,
+    location: str,
+    department: str,
+    sort: str = DEFAULT_SORT,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[Any, str]] = None,
+) -> Tuple[List[Dict], Optional[Tuple[Any, str]]]:
+    return CANDIDATE_STORE.page(experience, location, department, sort, limit, after)
+
+
+def candidate_facets(
+    experience: int = 0,
+    max_experience: Optional[int] = None,
+    location: Optional[str] = None,
+    department: Optional[str] = None,
+    bucket_width: int = 5,
+) -> Dict[str, Any]:
+    return CANDIDATE_STORE.facets(experience, max_experience, location, department, bucket_width)
+
+
+def encode_candidates(candidates: Iterable[Dict], prefix: bytes = b"", suffix: bytes = b"") -> bytes:
+    return CANDIDATE_STORE.encode_array(candidates, prefix, suffix)
+
+
+def text_index_enabled() -> bool:
+    return CANDIDATE_STORE.text is not None
+
+
+def text_search(query: str, limit: int = 20, match: str = "any") -> List[Tuple[float, Dict]]:
+    """BM25-ranked free-text search; raises LookupError if the text index is off."""
+    if CANDIDATE_STORE.text is None:
+        raise LookupError("Text index is disabled")
+    return CANDIDATE_STORE.text.search(query, limit, match)
+
+
+def encode_cursor(sort: str, key: Tuple[Any, str]) -> str:
+    """Opaque page cursor: the sort order and the last emitted sort key."""
+    raw = json.dumps([sort, *key], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, str]:
+    """Inverse of ``encode_cursor``; raises ValueError if it doesn't fit ``sort``."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, first, cid = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    expected = str if sort == "name" else int
+    if cursor_sort != sort or not isinstance(first, expected) or not isinstance(cid, str):
+        raise ValueError("Cursor does not match the requested sort")
+    return (first, cid)
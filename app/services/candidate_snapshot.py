@@ -0,0 +1,169 @@
+# app/services/candidate_snapshot.py
+"""
+Binary, mmap-able candidate snapshots.
+
+Layout (little endian):
+
+    b"MCPCSNP1"                 magic
+    uint32                      header length
+    header                      JSON: row count, column offsets, the
+                                location/department string dictionaries and
+                                the row range of every (location, department)
+    column blocks               8-byte aligned, fixed width:
+                                  experience int32, location/department
+                                  uint32 codes, id/name int64 offsets plus
+                                  their UTF-8 data
+
+Rows are sorted by (location, department, experience, id), so every index
+bucket is a contiguous row range already in search order. Workers map the
+file read-only and wrap the columns in ``SnapshotCandidateStore``: the page
+cache holds one physical copy for all of them and startup does no parsing.
+
+Build one with:
+
+    python -m app.services.candidate_snapshot build candidates.csv candidates.snap
+"""
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.candidate_columns import (
+    CandidateColumns,
+    ColumnarCandidateStore,
+    StringColumn,
+    _bucket_ranges,
+    _sorted_columns,
+)
+
+MAGIC = b"MCPCSNP1"
+_ALIGN = 8
+
+
+def write_snapshot(columns: CandidateColumns, path: str) -> None:
+    columns = _sorted_columns(columns)
+    blocks = [
+        ("experience", columns.experience.astype("<i4").tobytes()),
+        ("location", columns.location.astype("<u4").tobytes()),
+        ("department", columns.department.astype("<u4").tobytes()),
+        ("id_offsets", columns.ids.offsets.astype("<i8").tobytes()),
+        ("name_offsets", columns.names.offsets.astype("<i8").tobytes()),
+        ("id_data", bytes(columns.ids.data)),
+        ("name_data", bytes(columns.names.data)),
+    ]
+    header = {
+        "rows": len(columns),
+        "locations": columns.locations.values,
+        "departments": columns.departments.values,
+        "buckets": _bucket_ranges(columns),
+        "columns": {},
+    }
+    # Offsets depend on the header length, which depends on the offsets;
+    # lay out relative to the data start and record that separately.
+    offset = 0
+    for name, data in blocks:
+        header["columns"][name] = [offset, len(data)]
+        offset += len(data) + (-len(data) % _ALIGN)
+    raw_header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    data_start = len(MAGIC) + 4 + len(raw_header)
+    data_start += -data_start % _ALIGN
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(raw_header)))
+        f.write(raw_header)
+        f.write(b"\0" * (data_start - f.tell()))
+        for _, data in blocks:
+            f.write(data)
+            f.write(b"\0" * (-len(data) % _ALIGN))
+
+
+def load_snapshot(path: str) -> Tuple[CandidateColumns, Dict]:
+    """Map ``path`` read-only; the returned columns are views into the mapping."""
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mm[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a candidate snapshot")
+    (header_len,) = struct.unpack_from("<I", mm, len(MAGIC))
+    header_start = len(MAGIC) + 4
+    header = json.loads(mm[header_start:header_start + header_len])
+    data_start = header_start + header_len
+    data_start += -data_start % _ALIGN
+    rows = header["rows"]
+    view = memoryview(mm)
+
+    def array(name: str, dtype: str, count: int) -> np.ndarray:
+        offset, _ = header["columns"][name]
+        return np.frombuffer(mm, dtype=dtype, count=count, offset=data_start + offset)
+
+    def blob(name: str) -> memoryview:
+        offset, size = header["columns"][name]
+        return view[data_start + offset:data_start + offset + size]
+
+    columns = CandidateColumns(
+        ids=StringColumn(array("id_offsets", "<i8", rows + 1), blob("id_data")),
+        names=StringColumn(array("name_offsets", "<i8", rows + 1), blob("name_data")),
+        experience=array("experience", "<i4", rows),
+        location=array("location", "<u4", rows),
+        department=array("department", "<u4", rows),
+        locations=header["locations"],
+        departments=header["departments"],
+    )
+    return columns, header
+
+
+class SnapshotCandidateStore(ColumnarCandidateStore):
+    """
+    ``ColumnarCandidateStore`` served straight from a mapped snapshot; the
+    file is already sorted and carries its bucket ranges.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        columns, header = load_snapshot(path)
+        super().__init__(columns, header["buckets"])
+
+
+def build(source: str, dest: str) -> CandidateColumns:
+    if source.endswith(".csv"):
+        columns = CandidateColumns.from_csv(source)
+    elif source.endswith((".jsonl", ".ndjson")):
+        columns = CandidateColumns.from_jsonl(source)
+    else:
+        raise ValueError("source must be a .csv or .jsonl file")
+    write_snapshot(columns, dest)
+    return columns
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build or inspect candidate snapshots")
+    sub = parser.add_subparsers(dest="command", required=True)
+    b = sub.add_parser("build", help="build a snapshot from CSV or JSONL")
+    b.add_argument("source")
+    b.add_argument("dest")
+    i = sub.add_parser("info", help="print a snapshot's header summary")
+    i.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        columns = build(args.source, args.dest)
+        print(f"wrote {len(columns)} candidates to {args.dest}")
+    else:
+        columns, header = load_snapshot(args.path)
+        print(json.dumps({
+            "rows": header["rows"],
+            "locations": len(header["locations"]),
+            "departments": len(header["departments"]),
+            "buckets": len(header["buckets"]),
+            "bytes": columns.nbytes,
+        }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+# app/services/context_store.py
+
+import sqlite3
+from abc import ABC, abstractmethod
+import threading
+from itertools import count
+from typing import Dict, Iterator, List, MutableMapping, Set
+
+from app.schema.common import ContextNode
+
+# Process-wide so replacing a store never reuses an older store's version
+_versions = count(1)
+
+
+class ContextStore(MutableMapping, ABC):
+    """
+    Registry of context nodes, keyed by node id.
+
+    Behaves like a dict so the routers can keep using ``STORE[...]``.
+    ``version`` changes whenever the contents change, whether the write
+    came from this process or from another worker sharing the backend.
+    Backends must implement the mapping methods and ``insert``; one that
+    doesn't fails when it's instantiated.
+    """
+
+    version: int
+
+    @abstractmethod
+    def insert(self, node: ContextNode) -> bool:
+        """Add ``node`` unless its id is taken; return whether it was added."""
+
+    def insert_many(self, nodes: List[ContextNode], atomic: bool = False) -> Set[str]:
+        """
+        Add every node whose id is free and return the ids that conflicted.
+        With ``atomic`` nothing is added unless there are no conflicts.
+        """
+        if atomic:
+            conflicts = {n.id for n in nodes if n.id in self}
+            if conflicts:
+                return conflicts
+        return {n.id for n in nodes if not self.insert(n)}
+
+
+class MemoryContextStore(ContextStore):
+    """Plain per-process dict. Nothing survives a restart."""
+
+    def __init__(self):
+        self._nodes: Dict[str, ContextNode] = {}
+        self.version = next(_versions)
+
+    def __getitem__(self, node_id: str) -> ContextNode:
+        return self._nodes[node_id]
+
+    def __setitem__(self, node_id: str, node: ContextNode) -> None:
+        self._nodes[node_id] = node
+        self.version = next(_versions)
+
+    def __delitem__(self, node_id: str) -> None:
+        del self._nodes[node_id]
+        self.version = next(_versions)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def insert(self, node: ContextNode) -> bool:
+        if node.id in self._nodes:
+            return False
+        self[node.id] = node
+        return True
+
+    def clear(self) -> None:
+        self._nodes.clear()
+        self.version = next(_versions)
+
+
+class SQLiteContextStore(ContextStore):
+    """
+    SQLite (WAL) backed store shared by every worker pointing at the same file.
+
+    All rows are loaded into an in-memory dict at open. Reads are served
+    from that dict after checking ``PRAGMA data_version``, which only
+    changes when another connection commits and is answered from the WAL
+    index in shared memory, so a read never touches the disk unless the
+    data actually changed. ``version`` does the same check, so an ETag
+    built from it moves as soon as any worker commits.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS context_nodes (id TEXT PRIMARY KEY, body TEXT NOT NULL)"
+        )
+        self._nodes: Dict[str, ContextNode] = {}
+        self._data_version = -1
+        self._version = next(_versions)
+        self._sync()
+
+    @property
+    def version(self) -> int:
+        self._sync()
+        return self._version
+
+    def _sync(self) -> None:
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._data_version:
+                return
+            rows = self._conn.execute("SELECT id, body FROM context_nodes").fetchall()
+            self._nodes = {node_id: ContextNode.parse_raw(body) for node_id, body in rows}
+            self._data_version = data_version
+            self._version = next(_versions)
+
+    def _write(self, sql: str, *params) -> sqlite3.Cursor:
+        # caller holds self._lock
+        cur = self._conn.execute(sql, params)
+        self._version = next(_versions)
+        return cur
+
+    def __getitem__(self, node_id: str) -> ContextNode:
+        self._sync()
+        return self._nodes[node_id]
+
+    def __setitem__(self, node_id: str, node: ContextNode) -> None:
+        with self._lock:
+            self._sync()
+            self._write(
+                "INSERT OR REPLACE INTO context_nodes (id, body) VALUES (?, ?)", node_id, node.json()
+            )
+            self._nodes[node_id] = node
+
+    def __delitem__(self, node_id: str) -> None:
+        with self._lock:
+            self._sync()
+            if node_id not in self._nodes:
+                raise KeyError(node_id)
+            self._write("DELETE FROM context_nodes WHERE id = ?", node_id)
+            del self._nodes[node_id]
+
+    def __iter__(self) -> Iterator[str]:
+        self._sync()
+        return iter(list(self._nodes))
+
+    def __len__(self) -> int:
+        self._sync()
+        return len(self._nodes)
+
+    def __contains__(self, node_id) -> bool:
+        self._sync()
+        return node_id in self._nodes
+
+    def insert(self, node: ContextNode) -> bool:
+        with self._lock:
+            self._sync()
+            try:
+                self._write("INSERT INTO context_nodes (id, body) VALUES (?, ?)", node.id, node.json())
+            except sqlite3.IntegrityError:
+                return False
+            self._nodes[node.id] = node
+            return True
+
+    def insert_many(self, nodes: List[ContextNode], atomic: bool = False) -> Set[str]:
+        with self._lock:
+            self._sync()
+            conflicts: Set[str] = set()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for node in nodes:
+                    cur = self._conn.execute(
+                        "INSERT OR IGNORE INTO context_nodes (id, body) VALUES (?, ?)",
+                        (node.id, node.json()),
+                    )
+                    if cur.rowcount == 0:
+                        conflicts.add(node.id)
+                if atomic and conflicts:
+                    self._conn.execute("ROLLBACK")
+                    return conflicts
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            for node in nodes:
+                if node.id not in conflicts:
+                    self._nodes[node.id] = node
+            self._version = next(_versions)
+            return conflicts
+
+    def values(self):
+        self._sync()
+        return list(self._nodes.values())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._write("DELETE FROM context_nodes")
+            self._nodes = {}
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def open_context_store(url: str) -> ContextStore:
+    """
+    Build a store from a URL: ``memory`` or ``sqlite:///path/to/file.db``.
+    """
+    if url == "memory":
+        return MemoryContextStore()
+    if url.startswith("sqlite:///"):
+        return SQLiteContextStore(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported context store URL: {url}")
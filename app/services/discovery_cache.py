@@ -0,0 +1,61 @@
+# app/services/discovery_cache.py
+
+import hashlib
+import json
+from typing import Any, Callable, Dict, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+class DiscoveryCache:
+    """
+    Serialized discovery documents, rebuilt only when their source version
+    changes.
+
+    Each entry holds the encoded JSON bytes and a strong ETag computed from
+    them, so serving a document is a dict lookup and a header comparison.
+    """
+
+    def __init__(self):
+        # name -> (source_version, body, etag)
+        self._docs: Dict[str, Tuple[int, bytes, str]] = {}
+
+    def get(self, name: str, version: int, build: Callable[[], Any]) -> Tuple[bytes, str]:
+        entry = self._docs.get(name)
+        if entry is None or entry[0] != version:
+            body = json.dumps(jsonable_encoder(build()), separators=(",", ":")).encode("utf-8")
+            etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+            entry = self._docs[name] = (version, body, etag)
+        return entry[1], entry[2]
+
+    def clear(self) -> None:
+        self._docs.clear()
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison (RFC 7232): compressed responses carry W/ etags.
+    if if_none_match.strip() == "*":
+        return True
+    return any(_opaque(tag) == _opaque(etag) for tag in if_none_match.split(","))
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def cached_json_response(
+    request: Request, name: str, version: int, build: Callable[[], Any]
+) -> Response:
+    """Serve a cached document, answering ``If-None-Match`` with 304."""
+    body, etag = DISCOVERY_CACHE.get(name, version, build)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+DISCOVERY_CACHE = DiscoveryCache()
@@ -0,0 +1,178 @@
+# app/services/search_cache.py
+
+import asyncio
+import inspect
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Tuple, Union
+
+from app import config
+from app.services import candidate_service
+from app.services.search_executor import SEARCH_EXECUTOR
+
+Key = Tuple[str, str, int]
+Compute = Callable[[int, str, str], Union[List[Dict], Awaitable[List[Dict]]]]
+
+
+class SearchCache:
+    """
+    Bounded LRU + TTL cache of candidate search results.
+
+    Entries are keyed on the normalized query: case-folded location and
+    department plus the experience floor rounded down to ``bucket`` years.
+    A bucket entry holds every match at or above that floor, and narrower
+    queries in the same bucket are filtered from it. Each entry remembers
+    the dataset version it was computed against and is dropped once the
+    dataset moves on. Concurrent misses on the same key share one
+    computation, which runs in its own task so a caller that goes away
+    doesn't take the others down with it. Queries whose bucket holds more
+    than ``max_rows`` matches aren't cached (see ``fits``).
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        bucket: int = 1,
+        max_rows: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.bucket = max(1, bucket)
+        self.max_rows = max_rows
+        self._clock = clock
+        # key -> (expires_at, dataset_version, rows)
+        self._entries: "OrderedDict[Key, Tuple[float, int, List[Dict]]]" = OrderedDict()
+        self._inflight: Dict[Tuple[Key, int], "asyncio.Task"] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def key(self, experience: int, location: str, department: str) -> Key:
+        floor = experience - experience % self.bucket
+        return (location.casefold(), department.casefold(), floor)
+
+    def fits(self, experience: int, location: str, department: str) -> bool:
+        """Whether the entry for this query stays within ``max_rows``; counted, not searched."""
+        floor = self.key(experience, location, department)[2]
+        return candidate_service.count_candidates(floor, location, department) <= self.max_rows
+
+    async def get_or_compute(
+        self,
+        experience: int,
+        location: str,
+        department: str,
+        version: int,
+        compute: Compute,
+    ) -> List[Dict]:
+        """
+        Return the matches for the query, calling
+        ``compute(floor, location, department)`` on a miss. ``compute`` may
+        be a plain function or a coroutine function.
+        """
+        key = self.key(experience, location, department)
+        floor = key[2]
+        rows = self._lookup(key, version)
+        if rows is None:
+            rows = await self._single_flight(key, version, floor, location, department, compute)
+        if floor == experience:
+            return rows
+        return [c for c in rows if c["experience"] >= experience]
+
+    def _lookup(self, key: Key, version: int):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, entry_version, rows = entry
+        if entry_version != version:
+            del self._entries[key]
+            self.invalidations += 1
+            self.misses += 1
+            return None
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return rows
+
+    async def _single_flight(self, key, version, floor, location, department, compute):
+        flight = (key, version)
+        task = self._inflight.get(flight)
+        if task is None:
+            task = asyncio.ensure_future(self._compute(flight, floor, location, department, compute))
+            # mark retrieved so a flight whose callers all left doesn't log noise
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[flight] = task
+        else:
+            self.coalesced += 1
+        # Every caller, the first included, only ever cancels its own wait
+        return await asyncio.shield(task)
+
+    async def _compute(self, flight, floor, location, department, compute):
+        try:
+            rows = compute(floor, location, department)
+            if inspect.isawaitable(rows):
+                rows = await rows
+        finally:
+            self._inflight.pop(flight, None)
+        self._store(flight[0], flight[1], rows)
+        return rows
+
+    def _store(self, key: Key, version: int, rows: List[Dict]) -> None:
+        if len(rows) > self.max_rows:
+            return
+        self._entries[key] = (self._clock() + self.ttl, version, rows)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+SEARCH_CACHE = SearchCache(
+    maxsize=config.SEARCH_CACHE_SIZE,
+    ttl=config.SEARCH_CACHE_TTL,
+    bucket=config.SEARCH_CACHE_EXPERIENCE_BUCKET,
+    max_rows=config.SEARCH_CACHE_MAX_ROWS,
+)
+
+
+async def cached_search(experience: int, location: str, department: str) -> List[Dict]:
+    """
+    ``search_candidates`` through the shared cache, when it is enabled and
+    the query's bucket fits in it. Misses run on the search executor, off
+    the event loop.
+    """
+    if not SEARCH_CACHE.enabled or not SEARCH_CACHE.fits(experience, location, department):
+        return await SEARCH_EXECUTOR.search(experience, location, department)
+    return await SEARCH_CACHE.get_or_compute(
+        experience, location, department,
+        candidate_service.dataset_version(), SEARCH_EXECUTOR.search,
+    )
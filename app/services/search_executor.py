@@ -0,0 +1,212 @@
+# app/services/search_executor.py
+
+import asyncio
+import heapq
+import logging
+import zlib
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app import config, profiling
+from app.services import candidate_service
+from app.services.candidate_service import DEFAULT_SORT, CandidateStore, sort_key
+
+logger = logging.getLogger("search_executor")
+
+MODES = ("inline", "thread", "process")
+
+Page = Tuple[List[Dict], Optional[Tuple[Any, str]]]
+
+
+# ─── process workers ─────────────────────────────────────────────────
+# Each worker process holds only the shards it scans; tasks name the shard.
+_worker_shards: Dict[int, CandidateStore] = {}
+
+
+def _shard_store(part: Any, shard: int, shards: int) -> CandidateStore:
+    """
+    Build one shard from what ``SearchExecutor._partition`` sent: a list
+    of records, a column subset, or the path of a snapshot to map here
+    and take the shard's rows from, so nothing is pickled at all.
+    """
+    if isinstance(part, list):
+        return CandidateStore(part, text_index=False)
+    from app.services.candidate_columns import ColumnarCandidateStore, _bucket_ranges, take_shard
+    if isinstance(part, str):
+        from app.services.candidate_snapshot import load_snapshot
+        part = take_shard(load_snapshot(part)[0], shard, shards)
+    return ColumnarCandidateStore(part, _bucket_ranges(part))
+
+
+def _init_worker(parts: Dict[int, Any], shards: int) -> None:
+    global _worker_shards
+    _worker_shards = {shard: _shard_store(part, shard, shards) for shard, part in parts.items()}
+
+
+def _shard_search(shard: int, experience: int, location: str, department: str) -> List[Dict]:
+    return _worker_shards[shard].search(experience, location, department)
+
+
+def _shard_page(shard: int, *args) -> Page:
+    return _worker_shards[shard].page(*args)
+
+
+def shard_of(candidate_id: str, shards: int) -> int:
+    # stable across processes, unlike hash()
+    return zlib.crc32(candidate_id.encode("utf-8")) % shards
+
+
+def merge_pages(pages: List[Page], sort: str, limit: Optional[int]) -> Page:
+    """
+    Merge per-shard pages, each already in ``sort`` order, into one page.
+    Every shard returned its own first ``limit`` rows past the cursor, so
+    the first ``limit`` of the merge are the global ones.
+    """
+    merged = heapq.merge(
+        *(rows for rows, _ in pages),
+        key=partial(sort_key, sort),
+        reverse=sort == "experience_desc",
+    )
+    if limit is None:
+        return list(merged), None
+    rows = list(islice(merged, limit + 1))
+    more = len(rows) > limit or any(next_after is not None for _, next_after in pages)
+    rows = rows[:limit]
+    return rows, (sort_key(sort, rows[-1]) if more and rows else None)
+
+
+def take(matches: Iterator[Dict], n: int) -> List[Dict]:
+    return list(islice(matches, n))
+
+
+class SearchExecutor:
+    """
+    Runs candidate searches off the event loop.
+
+    ``thread`` mode hands each search, and each batch pulled from a lazy
+    match iterator, to a thread pool, so a large scan no longer stalls
+    every other request in the worker. ``process`` mode also partitions
+    the pool into ``shards`` and scans them in parallel worker processes,
+    merging the sorted shard results. Shard ``i`` lives only in worker
+    ``i % workers``, so the workers together hold one copy of the pool;
+    columnar stores ship as column subsets and snapshots are mapped by the
+    workers themselves. Shards are rebuilt and the workers restarted when
+    the dataset version changes, and results cross a process boundary, so
+    it pays off for large scans rather than many small ones. ``inline``
+    runs everything on the loop as before.
+    """
+
+    def __init__(self, mode: str = "thread", workers: int = 4, shards: int = 0):
+        if mode not in MODES:
+            raise ValueError(f"search executor must be one of: {', '.join(MODES)}")
+        self.mode = mode
+        self.workers = max(1, workers)
+        self.shards = shards or self.workers
+        self._threads: Optional[ThreadPoolExecutor] = None
+        # one single-process pool per worker, so each holds its own shards
+        self._processes: Optional[List[Executor]] = None
+        self._version: Optional[int] = None
+        self._rebuild: Dict[asyncio.AbstractEventLoop, asyncio.Lock] = {}
+
+    # ─── plumbing ─────────────────────────────────────────────────────
+    async def call(self, fn: Callable, *args) -> Any:
+        """``fn(*args)`` on the thread pool, or inline in ``inline`` mode."""
+        if self.mode == "inline":
+            return fn(*args)
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(self.workers, thread_name_prefix="search")
+        profile = profiling.current()
+        if profile is not None:
+            fn = profile.wrap(fn)
+        return await asyncio.get_running_loop().run_in_executor(self._threads, partial(fn, *args))
+
+    async def _pool(self) -> List[Executor]:
+        store = candidate_service.CANDIDATE_STORE
+        if self._processes is not None and self._version == store.version:
+            return self._processes
+        loop = asyncio.get_running_loop()
+        lock = self._rebuild.get(loop)
+        if lock is None:
+            # one per loop: asyncio locks are bound to the loop they first run on
+            self._rebuild = {loop: asyncio.Lock()}
+            lock = self._rebuild[loop]
+        async with lock:
+            store = candidate_service.CANDIDATE_STORE
+            if self._processes is None or self._version != store.version:
+                parts = await self.call(self._partition, store)
+                workers = min(self.workers, self.shards)
+                old, self._processes = self._processes, [
+                    ProcessPoolExecutor(1, initializer=_init_worker, initargs=(
+                        {shard: parts[shard] for shard in range(worker, self.shards, workers)},
+                        self.shards,
+                    ))
+                    for worker in range(workers)
+                ]
+                self._version = store.version
+                for pool in old or ():
+                    pool.shutdown(wait=False)
+                logger.info("Search shards rebuilt: %d shards, %d workers (version %d)",
+                            self.shards, self.workers, store.version)
+        return self._processes
+
+    def _partition(self, store: CandidateStore) -> List[Any]:
+        """What each worker needs to build every shard; see ``_shard_store``."""
+        path = getattr(store, "path", None)
+        if path is not None:
+            # a snapshot: workers map the file themselves
+            return [path] * self.shards
+        columns = getattr(store, "columns", None)
+        if columns is not None:
+            from app.services.candidate_columns import take_shard
+            return [take_shard(columns, i, self.shards) for i in range(self.shards)]
+        shards: List[List[Dict]] = [[] for _ in range(self.shards)]
+        for c in store.records():
+            shards[shard_of(c["id"], self.shards)].append(c)
+        return shards
+
+    async def _scatter(self, fn: Callable, *args) -> List[Any]:
+        pools = await self._pool()
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(*(
+            loop.run_in_executor(pools[shard % len(pools)], partial(fn, shard, *args))
+            for shard in range(self.shards)
+        ))
+
+    # ─── searches ─────────────────────────────────────────────────────
+    async def search(self, experience: int, location: str, department: str) -> List[Dict]:
+        if self.mode != "process":
+            return await self.call(candidate_service.search_candidates, experience, location, department)
+        parts = await self._scatter(_shard_search, experience, location, department)
+        rows, _ = await self.call(merge_pages, [(p, None) for p in parts], DEFAULT_SORT, None)
+        return rows
+
+    async def page(
+        self,
+        experience: int,
+        location: str,
+        department: str,
+        sort: str = DEFAULT_SORT,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[Any, str]] = None,
+    ) -> Page:
+        if self.mode != "process":
+            return await self.call(
+                candidate_service.search_page, experience, location, department, sort, limit, after)
+        pages = await self._scatter(_shard_page, experience, location, department, sort, limit, after)
+        return await self.call(merge_pages, pages, sort, limit)
+
+    def shutdown(self) -> None:
+        for pool in [self._threads, *(self._processes or ())]:
+            if pool is not None:
+                pool.shutdown(wait=False)
+        self._threads = self._processes = None
+        self._version = None
+
+
+SEARCH_EXECUTOR = SearchExecutor(config.SEARCH_EXECUTOR, config.SEARCH_WORKERS, config.SEARCH_SHARDS)
+
+
+async def shutdown() -> None:
+    SEARCH_EXECUTOR.shutdown()
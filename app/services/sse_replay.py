@@ -0,0 +1,183 @@
+# app/services/sse_replay.py
+
+import asyncio
+import secrets
+import time
+from collections import OrderedDict, deque
+from typing import AsyncIterator, Callable, Deque, Dict, Optional, Tuple
+
+from app import config
+
+
+def encode_event(event) -> bytes:
+    """An SSE frame without an id line; bytes are taken as already framed."""
+    if isinstance(event, bytes):
+        return event
+    from sse_starlette.sse import ServerSentEvent
+    return ServerSentEvent(**event).encode()
+
+
+class ReplayStream:
+    """
+    One logical SSE stream that can outlive its connections.
+
+    Events are pulled from ``source`` on demand, numbered, and kept in a
+    ring bounded by ``max_bytes``. A connection that drops leaves the
+    source suspended; a reconnect replays what it missed from the ring and
+    then carries on pulling. Only one connection pulls at a time.
+    """
+
+    def __init__(self, stream_id: str, subject: str, source: AsyncIterator, max_bytes: int):
+        self.id = stream_id
+        self.subject = subject
+        self.max_bytes = max_bytes
+        self.last_seq = 0
+        self.done = False
+        self.expires_at = 0.0
+        self._source = source
+        self._ring: Deque[Tuple[int, bytes]] = deque()
+        self._ring_bytes = 0
+        self._lock: Optional[asyncio.Lock] = None
+        self._pending: Optional[asyncio.Task] = None
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.id}-{seq}"
+
+    def can_resume(self, seq: int) -> bool:
+        """Whether every event after ``seq`` is still available."""
+        if not 0 <= seq <= self.last_seq:
+            return False
+        oldest = self._ring[0][0] if self._ring else self.last_seq + 1
+        return seq + 1 >= oldest
+
+    def _append(self, frame: bytes) -> Tuple[int, bytes]:
+        self.last_seq += 1
+        framed = b"id: %s\r\n%s" % (self.event_id(self.last_seq).encode("ascii"), frame)
+        self._ring.append((self.last_seq, framed))
+        self._ring_bytes += len(framed)
+        # always keep the newest event, however large
+        while self._ring_bytes > self.max_bytes and len(self._ring) > 1:
+            self._ring_bytes -= len(self._ring.popleft()[1])
+        return self.last_seq, framed
+
+    def _since(self, seq: int):
+        return [(s, f) for s, f in self._ring if s > seq]
+
+    async def _pull(self) -> Tuple[bool, object]:
+        try:
+            return False, await self._source.__anext__()
+        except StopAsyncIteration:
+            return True, None
+
+    async def _next(self) -> Tuple[bool, object]:
+        # The pull runs as its own task: a connection dropping mid-pull
+        # must not throw CancelledError into the shared source.
+        if self._pending is None:
+            self._pending = asyncio.ensure_future(self._pull())
+            self._pending.add_done_callback(lambda t: t.cancelled() or t.exception())
+        result = await asyncio.shield(self._pending)
+        # only a connection that received the event moves on; if this one
+        # was cancelled the result stays for the next puller
+        self._pending = None
+        return result
+
+    async def events(self, after: int = 0) -> AsyncIterator[bytes]:
+        """Framed events after sequence number ``after``, replayed then live."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        pos = after
+        while True:
+            for pos, frame in self._since(pos):
+                yield frame
+            if self.done:
+                return
+            async with self._lock:
+                if self.last_seq > pos or self.done:
+                    # another connection pulled while we waited
+                    continue
+                finished, event = await self._next()
+                if finished:
+                    self.done = True
+                    continue
+                pos, frame = self._append(encode_event(event))
+            yield frame
+
+
+class ReplayBuffer:
+    """Recent streams by id, LRU bounded and evicted ``ttl`` seconds after last use."""
+
+    def __init__(
+        self,
+        max_streams: int,
+        max_bytes: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_streams = max_streams
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._streams: "OrderedDict[str, ReplayStream]" = OrderedDict()
+        self.resumed = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_streams > 0
+
+    def __len__(self) -> int:
+        return len(self._streams)
+
+    def _touch(self, stream: ReplayStream) -> None:
+        stream.expires_at = self._clock() + self.ttl
+        self._streams[stream.id] = stream
+        self._streams.move_to_end(stream.id)
+        self._evict()
+
+    def _evict(self) -> None:
+        now = self._clock()
+        while self._streams:
+            oldest = next(iter(self._streams.values()))
+            if len(self._streams) <= self.max_streams and oldest.expires_at > now:
+                break
+            self._streams.popitem(last=False)
+
+    def open(self, subject: str, source: AsyncIterator) -> ReplayStream:
+        stream = ReplayStream(secrets.token_urlsafe(9), subject, source, self.max_bytes)
+        if self.enabled:
+            self._touch(stream)
+        return stream
+
+    def resume(self, last_event_id: str, subject: str) -> Optional[Tuple[ReplayStream, int]]:
+        """
+        The stream and sequence number to continue from for a
+        ``Last-Event-ID``, or None when it can't be resumed (unknown or
+        expired stream, another subject's stream, or events already
+        dropped from its ring).
+        """
+        self._evict()
+        stream_id, _, seq = last_event_id.rpartition("-")
+        stream = self._streams.get(stream_id)
+        if stream is None or stream.subject != subject or not seq.isdigit() or not stream.can_resume(int(seq)):
+            self.misses += 1
+            return None
+        self.resumed += 1
+        self._touch(stream)
+        return stream, int(seq)
+
+    async def events(self, stream: ReplayStream, after: int = 0) -> AsyncIterator[bytes]:
+        """``stream.events`` that keeps the stream fresh in the buffer as it goes."""
+        async for frame in stream.events(after):
+            if self.enabled:
+                self._touch(stream)
+            yield frame
+
+    def stats(self) -> Dict[str, int]:
+        return {"streams": len(self._streams), "resumed": self.resumed, "misses": self.misses}
+
+
+REPLAY_BUFFER = ReplayBuffer(
+    max_streams=config.SSE_REPLAY_STREAMS,
+    max_bytes=config.SSE_REPLAY_BYTES,
+    ttl=config.SSE_REPLAY_TTL,
+)
@@ -0,0 +1,310 @@
+# app/services/text_index.py
+
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Dict, Iterable, List, Set, Tuple
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Rebuild once tombstones reach this many and a quarter of all documents
+COMPACT_MIN_DELETED = 1024
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.casefold())
+
+
+def experience_level(years: int) -> str:
+    """Seniority word indexed with each profile so "senior" etc. match."""
+    if years >= 8:
+        return "senior"
+    if years >= 3:
+        return "mid"
+    return "junior"
+
+
+def candidate_tokens(candidate: Dict) -> List[str]:
+    """Tokens for every text field of a profile except its id."""
+    tokens: List[str] = []
+    for field, value in candidate.items():
+        if field == "id":
+            continue
+        if isinstance(value, str):
+            tokens.extend(tokenize(value))
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                if isinstance(item, str):
+                    tokens.extend(tokenize(item))
+    if isinstance(candidate.get("experience"), int):
+        tokens.append(experience_level(candidate["experience"]))
+    return tokens
+
+
+class _Postings:
+    """
+    Sorted doc ids with parallel term frequencies in compact arrays.
+
+    Skip pointers are implicit: every ``skip``-th entry is a jump target,
+    with ``skip`` ~ sqrt(len), so seeking forward is a jump along the skip
+    entries followed by a short linear walk. ``max_tf`` is the largest
+    term frequency ever appended, which bounds the term's BM25 score.
+    """
+
+    __slots__ = ("docs", "tfs", "max_tf")
+
+    def __init__(self):
+        self.docs = array("I")
+        self.tfs = array("H")
+        self.max_tf = 0
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def append(self, doc: int, tf: int) -> None:
+        tf = min(tf, 0xFFFF)
+        self.docs.append(doc)
+        self.tfs.append(tf)
+        self.max_tf = max(self.max_tf, tf)
+
+    def skip(self) -> int:
+        return max(1, int(math.sqrt(len(self.docs))))
+
+    def seek(self, i: int, target: int, skip: int) -> int:
+        """Smallest index >= i whose doc id is >= target."""
+        docs = self.docs
+        n = len(docs)
+        while i + skip < n and docs[i + skip] <= target:
+            i += skip
+        while i < n and docs[i] < target:
+            i += 1
+        return i
+
+    def copy(self) -> "_Postings":
+        postings = _Postings()
+        postings.docs = array("I", self.docs)
+        postings.tfs = array("H", self.tfs)
+        postings.max_tf = self.max_tf
+        return postings
+
+    def tf(self, doc: int) -> int:
+        i = bisect_left(self.docs, doc)
+        return self.tfs[i] if i < len(self.docs) and self.docs[i] == doc else 0
+
+
+class TextIndex:
+    """
+    In-memory inverted index over candidate profiles with BM25 ranking.
+
+    Documents get dense ids in insertion order, so adding a candidate only
+    appends to the posting lists it touches and they stay sorted. Removed
+    documents are tombstoned and skipped at query time; document
+    frequencies are kept for live documents only, so idf doesn't drift as
+    profiles are updated, and the index is rebuilt without the tombstones
+    once they make up a quarter of it.
+
+    ``copy`` shares the posting lists with the original, and both sides
+    give up ownership of them, so each side copies a list the first time
+    it appends to it.
+    """
+
+    def __init__(self, candidates: Iterable[Dict] = ()):
+        self._postings: Dict[str, _Postings] = {}
+        # term -> number of live documents containing it
+        self._df: Dict[str, int] = {}
+        self._owned: Set[str] = set()
+        self._docs: List[Dict] = []
+        self._lengths = array("I")
+        self._doc_ids: Dict[str, int] = {}
+        self._deleted = set()
+        self._total_length = 0
+        for c in candidates:
+            self.add(c)
+
+    def __len__(self) -> int:
+        return len(self._docs) - len(self._deleted)
+
+    def copy(self) -> "TextIndex":
+        index = TextIndex()
+        index._postings = dict(self._postings)
+        index._df = dict(self._df)
+        index._docs = list(self._docs)
+        index._lengths = array("I", self._lengths)
+        index._doc_ids = dict(self._doc_ids)
+        index._deleted = set(self._deleted)
+        index._total_length = self._total_length
+        # the lists are shared now, so this side must copy before appending too
+        self._owned = set()
+        return index
+
+    def add(self, candidate: Dict) -> None:
+        if candidate["id"] in self._doc_ids:
+            self.remove(candidate["id"])
+        doc = len(self._docs)
+        tokens = candidate_tokens(candidate)
+        counts: Dict[str, int] = {}
+        for t in tokens:
+            counts[t] = counts.get(t, 0) + 1
+        for term, tf in counts.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = _Postings()
+            elif term not in self._owned:
+                postings = self._postings[term] = postings.copy()
+            self._owned.add(term)
+            postings.append(doc, tf)
+            self._df[term] = self._df.get(term, 0) + 1
+        self._docs.append(candidate)
+        self._lengths.append(len(tokens))
+        self._doc_ids[candidate["id"]] = doc
+        self._total_length += len(tokens)
+
+    def remove(self, candidate_id: str) -> None:
+        doc = self._doc_ids.pop(candidate_id, None)
+        if doc is None:
+            return
+        self._deleted.add(doc)
+        self._total_length -= self._lengths[doc]
+        for term in set(candidate_tokens(self._docs[doc])):
+            self._df[term] -= 1
+            if not self._df[term]:
+                del self._df[term]
+        if len(self._deleted) >= max(COMPACT_MIN_DELETED, len(self._docs) // 4):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Re-index the live documents with fresh ids, dropping tombstones."""
+        live = [d for i, d in enumerate(self._docs) if i not in self._deleted]
+        self._postings = {}
+        self._df = {}
+        self._owned = set()
+        self._docs = []
+        self._lengths = array("I")
+        self._doc_ids = {}
+        self._deleted = set()
+        self._total_length = 0
+        for candidate in live:
+            self.add(candidate)
+
+    # ─── boolean retrieval ────────────────────────────────────────────
+    @staticmethod
+    def _intersect(lists: List[_Postings]) -> List[int]:
+        lists = sorted(lists, key=len)
+        if not lists or not len(lists[0]):
+            return []
+        result = list(lists[0].docs)
+        for postings in lists[1:]:
+            skip = postings.skip()
+            out, i = [], 0
+            for doc in result:
+                i = postings.seek(i, doc, skip)
+                if i == len(postings):
+                    break
+                if postings.docs[i] == doc:
+                    out.append(doc)
+            result = out
+            if not result:
+                break
+        return result
+
+    # ─── ranking ──────────────────────────────────────────────────────
+    def _norm(self, doc: int, avgdl: float) -> float:
+        return K1 * (1 - B + B * self._lengths[doc] / avgdl) if avgdl else K1
+
+    def _top_any(self, lists: List[_Postings], idf: List[float], limit: int, avgdl: float) -> List[Tuple[float, int]]:
+        """
+        Top ``limit`` (score, -doc) pairs over the union of ``lists``, with
+        MaxScore pruning: each term's score is bounded by its largest tf
+        in the shortest possible document, and once the heap is full the
+        terms whose bounds together can't beat its minimum only get probed
+        for documents the other terms found, never walked on their own.
+        """
+        norm_floor = K1 * (1 - B) if avgdl else K1
+        bounds = [w * p.max_tf * (K1 + 1) / (p.max_tf + norm_floor) * (1 + 1e-9) for p, w in zip(lists, idf)]
+        order = sorted(range(len(lists)), key=bounds.__getitem__)
+        lists = [lists[j] for j in order]
+        idf = [idf[j] for j in order]
+        # reach[j]: the most lists[0..j] can add to a document's score
+        reach = list(accumulate(bounds[j] for j in order))
+        skips = [p.skip() for p in lists]
+        pos = [0] * len(lists)
+        n = len(lists)
+
+        top: List[Tuple[float, int]] = []
+        threshold = -1.0
+        first = 0  # lists[first:] drive the walk; the rest are only probed
+        while first < n:
+            doc = min((lists[j].docs[pos[j]] for j in range(first, n) if pos[j] < len(lists[j])), default=None)
+            if doc is None:
+                break
+            norm = self._norm(doc, avgdl)
+            score = 0.0
+            for j in range(first, n):
+                postings = lists[j]
+                if pos[j] < len(postings) and postings.docs[pos[j]] == doc:
+                    tf = postings.tfs[pos[j]]
+                    score += idf[j] * tf * (K1 + 1) / (tf + norm)
+                    pos[j] += 1
+            if doc in self._deleted:
+                continue
+            for j in range(first - 1, -1, -1):
+                if score + reach[j] <= threshold:
+                    break
+                postings = lists[j]
+                pos[j] = postings.seek(pos[j], doc, skips[j])
+                if pos[j] < len(postings) and postings.docs[pos[j]] == doc:
+                    tf = postings.tfs[pos[j]]
+                    score += idf[j] * tf * (K1 + 1) / (tf + norm)
+            # later documents lose ties, so only a strictly higher score gets in
+            if len(top) < limit:
+                heapq.heappush(top, (score, -doc))
+            elif score > top[0][0]:
+                heapq.heapreplace(top, (score, -doc))
+            else:
+                continue
+            if len(top) == limit:
+                threshold = top[0][0]
+                while first < n and reach[first] <= threshold:
+                    first += 1
+        return sorted(top, reverse=True)
+
+    def search(self, query: str, limit: int = 20, match: str = "any") -> List[Tuple[float, Dict]]:
+        """
+        Top ``limit`` profiles for ``query`` as (score, candidate) pairs.
+        ``match="all"`` requires every query term, ``"any"`` at least one.
+        """
+        if limit <= 0:
+            return []
+        terms = list(dict.fromkeys(tokenize(query)))
+        present = [t for t in terms if t in self._df]
+        if not present or (match == "all" and len(present) < len(terms)):
+            return []
+        lists = [self._postings[t] for t in present]
+
+        n_docs = len(self)
+        avgdl = self._total_length / n_docs if n_docs else 0.0
+        idf = [math.log(1 + (n_docs - self._df[t] + 0.5) / (self._df[t] + 0.5)) for t in present]
+        if match != "all":
+            top = self._top_any(lists, idf, limit, avgdl)
+            return [(round(score, 4), self._docs[-neg]) for score, neg in top]
+
+        def scored():
+            for doc in self._intersect(lists):
+                if doc in self._deleted:
+                    continue
+                norm = self._norm(doc, avgdl)
+                score = 0.0
+                for postings, term_idf in zip(lists, idf):
+                    tf = postings.tf(doc)
+                    score += term_idf * tf * (K1 + 1) / (tf + norm)
+                yield score, doc
+
+        top = heapq.nlargest(limit, scored(), key=lambda pair: (pair[0], -pair[1]))
+        return [(round(score, 4), self._docs[doc]) for score, doc in top]
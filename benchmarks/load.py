@@ -0,0 +1,138 @@
+# benchmarks/load.py
+
+import asyncio
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.synthetic import DEPARTMENTS, LOCATIONS
+
+# A request factory gets the request index and returns httpx request kwargs
+RequestFactory = Callable[[int], Dict[str, Any]]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int,
+              ttfe: Optional[List[float]] = None) -> Dict[str, float]:
+    lat = sorted(latencies)
+    stats = {
+        "count": len(lat),
+        "errors": errors,
+        "throughput_rps": round(len(lat) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(lat, 50) * 1000, 3),
+        "p95_ms": round(percentile(lat, 95) * 1000, 3),
+        "p99_ms": round(percentile(lat, 99) * 1000, 3),
+    }
+    if ttfe is not None:
+        first = sorted(ttfe)
+        stats.update({
+            "ttfe_p50_ms": round(percentile(first, 50) * 1000, 3),
+            "ttfe_p95_ms": round(percentile(first, 95) * 1000, 3),
+            "ttfe_p99_ms": round(percentile(first, 99) * 1000, 3),
+        })
+    return stats
+
+
+# ─── scenarios ────────────────────────────────────────────────────────
+def sse_search_requests(seed: int = 7) -> RequestFactory:
+    rng = random.Random(seed)
+
+    def make(i: int) -> Dict[str, Any]:
+        return {
+            "method": "GET",
+            "url": "/tools/candidate/search/sse",
+            "params": {
+                "experience": rng.randint(0, 30),
+                "location": rng.choice(LOCATIONS),
+                "department": rng.choice(DEPARTMENTS),
+            },
+        }
+    return make
+
+
+def discovery_requests(etag: Optional[str] = None) -> RequestFactory:
+    headers = {"If-None-Match": etag} if etag else {}
+
+    def make(i: int) -> Dict[str, Any]:
+        return {"method": "GET", "url": "/.well-known/mcp.json", "headers": headers}
+    return make
+
+
+def register_requests(run_id: str) -> RequestFactory:
+    def make(i: int) -> Dict[str, Any]:
+        node_id = f"bench-{run_id}-{i}"
+        return {
+            "method": "POST",
+            "url": "/context",
+            "json": {
+                "id": node_id, "name": node_id, "description": "benchmark tool",
+                "prompt": "", "parameters": {},
+            },
+        }
+    return make
+
+
+# ─── driver ───────────────────────────────────────────────────────────
+async def _one(client: httpx.AsyncClient, req: Dict[str, Any], sse: bool):
+    """Returns (latency, time_to_first_event or None, ok)."""
+    start = time.perf_counter()
+    first = None
+    async with client.stream(**req) as resp:
+        if sse:
+            async for line in resp.aiter_lines():
+                if first is None and line.startswith("event:"):
+                    first = time.perf_counter() - start
+        else:
+            await resp.aread()
+        ok = resp.status_code < 400
+    return time.perf_counter() - start, first, ok
+
+
+async def drive(client: httpx.AsyncClient, factory: RequestFactory, requests: int,
+                concurrency: int, sse: bool = False) -> Dict[str, float]:
+    """Issue ``requests`` requests with ``concurrency`` in flight and summarize."""
+    latencies: List[float] = []
+    ttfe: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            try:
+                latency, first, ok = await _one(client, factory(i), sse)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            if not ok:
+                errors += 1
+                continue
+            latencies.append(latency)
+            if first is not None:
+                ttfe.append(first)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return summarize(latencies, elapsed, errors, ttfe if sse else None)
+
+
+async def run_scenarios(client: httpx.AsyncClient, requests: int, concurrency: int,
+                        run_id: str) -> Dict[str, Dict[str, float]]:
+    results = {
+        "sse_search": await drive(client, sse_search_requests(), requests, concurrency, sse=True),
+        "discovery": await drive(client, discovery_requests(), requests, concurrency),
+    }
+    etag = (await client.get("/.well-known/mcp.json")).headers.get("etag")
+    results["discovery_304"] = await drive(client, discovery_requests(etag), requests, concurrency)
+    results["register"] = await drive(client, register_requests(run_id), requests, concurrency)
+    return results
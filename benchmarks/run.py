@@ -0,0 +1,224 @@
+# benchmarks/run.py
+"""
+Benchmark and load-test the hot paths.
+
+    python -m benchmarks.run --rows 10k --mode asgi --output benchmarks/baseline.json
+    python -m benchmarks.run --rows 10k,1m --mode both --compare benchmarks/baseline.json
+
+Micro-benchmarks time ``search_candidates`` and ``event_generator``
+directly. The load driver hits the SSE search, discovery and register
+endpoints either in-process through ASGI or against a local uvicorn.
+Note that httpx's in-process ASGI transport buffers the whole response,
+so SSE time-to-first-event is only meaningful in uvicorn mode.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.load import run_scenarios, summarize
+from benchmarks.synthetic import DEPARTMENTS, LOCATIONS, generate_candidates, parse_size
+
+
+# Load scenarios open streams as a single client at full speed, which the
+# per-subject admission limits would mostly answer with 429. Benchmarks
+# measure the serving path, so they run with admission control off unless
+# these are set explicitly.
+ADMISSION_ENV = ("MCP_MAX_STREAMS", "MCP_MAX_STREAMS_PER_SUBJECT", "MCP_STREAM_RATE", "MCP_SUBJECT_STREAM_RATE")
+
+
+def disable_admission_limits() -> None:
+    """Must run before ``app`` is imported; config reads the environment once."""
+    for name in ADMISSION_ENV:
+        os.environ.setdefault(name, "0")
+
+
+def install_dataset(rows: int, text_index: bool = False) -> None:
+    """
+    Publish ``rows`` synthetic candidates as the app's candidate pool. No
+    scenario runs free-text searches, so the text index is left out unless
+    asked for; it dominates load time and memory at the larger sizes.
+    """
+    from app.services import candidate_service
+    from app.services.candidate_service import CandidateStore
+
+    candidate_service.replace(CandidateStore(generate_candidates(rows), text_index=text_index))
+
+
+def _queries(n: int, seed: int = 11):
+    rng = random.Random(seed)
+    return [
+        (rng.randint(0, 30), rng.choice(LOCATIONS), rng.choice(DEPARTMENTS))
+        for _ in range(n)
+    ]
+
+
+# ─── micro-benchmarks ─────────────────────────────────────────────────
+def bench_search(queries) -> Dict[str, float]:
+    from app.services.candidate_service import search_candidates
+
+    latencies = []
+    start = time.perf_counter()
+    for q in queries:
+        t0 = time.perf_counter()
+        search_candidates(*q)
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - start, 0)
+
+
+async def bench_event_generator(queries) -> Dict[str, float]:
+    from app.routers.tools import event_generator
+
+    latencies, ttfe = [], []
+    start = time.perf_counter()
+    for q in queries:
+        t0 = time.perf_counter()
+        first = None
+        async for _ in event_generator(*q):
+            if first is None:
+                first = time.perf_counter() - t0
+        latencies.append(time.perf_counter() - t0)
+        ttfe.append(first)
+    return summarize(latencies, time.perf_counter() - start, 0, ttfe)
+
+
+# ─── load drivers ─────────────────────────────────────────────────────
+async def bench_asgi(requests: int, concurrency: int) -> Dict[str, Dict[str, float]]:
+    from app.main import app
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        return await run_scenarios(client, requests, concurrency, uuid.uuid4().hex[:8])
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def bench_uvicorn(rows: str, requests: int, concurrency: int) -> Dict[str, Dict[str, float]]:
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.serve", "--rows", rows, "--port", str(port)],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60.0) as client:
+            deadline = time.monotonic() + 600
+            while True:
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if proc.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn did not come up")
+                await asyncio.sleep(0.2)
+            return await run_scenarios(client, requests, concurrency, uuid.uuid4().hex[:8])
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+# ─── baseline comparison ──────────────────────────────────────────────
+def _flatten(tree, prefix=""):
+    for key, value in tree.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            yield from _flatten(value, path)
+        else:
+            yield path, value
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float, floor_ms: float = 0.5) -> List[str]:
+    """
+    List metrics that got worse than the baseline by more than
+    ``tolerance``, and every scenario that had errors at all: latency and
+    throughput only cover the requests that succeeded, so they can't be
+    trusted once any failed.
+    """
+    base = dict(_flatten(baseline["results"]))
+    regressions = []
+    for path, value in _flatten(current["results"]):
+        if path.endswith(".errors") and value:
+            regressions.append(f"{path}: {base.get(path, 0)} -> {value} errors")
+            continue
+        old = base.get(path)
+        if old is None:
+            continue
+        if path.endswith("_ms") and value > old * (1 + tolerance) and value - old > floor_ms:
+            regressions.append(f"{path}: {old} -> {value} ms")
+        elif path.endswith("throughput_rps") and value < old * (1 - tolerance):
+            regressions.append(f"{path}: {old} -> {value} rps")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="10k", help="comma separated sizes: 10k, 1m, 10m or a number")
+    parser.add_argument("--mode", choices=["asgi", "uvicorn", "both", "micro"], default="asgi")
+    parser.add_argument("--queries", type=int, default=2000, help="micro-benchmark queries")
+    parser.add_argument("--requests", type=int, default=500, help="requests per load scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--output", help="write the report as JSON")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+    disable_admission_limits()
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "queries": args.queries,
+        },
+        "results": {},
+    }
+    for size in args.rows.split(","):
+        rows = parse_size(size)
+        t0 = time.perf_counter()
+        install_dataset(rows)
+        load_s = time.perf_counter() - t0
+        queries = _queries(args.queries)
+        section = report["results"][size] = {
+            "load_s": round(load_s, 3),
+            "micro": {
+                "search_candidates": bench_search(queries),
+                "event_generator": asyncio.run(bench_event_generator(queries)),
+            },
+        }
+        if args.mode in ("asgi", "both"):
+            section["asgi"] = asyncio.run(bench_asgi(args.requests, args.concurrency))
+        if args.mode in ("uvicorn", "both"):
+            section["uvicorn"] = asyncio.run(bench_uvicorn(size, args.requests, args.concurrency))
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print("REGRESSION", line, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+# benchmarks/serve.py
+"""Run the app under uvicorn with a synthetic candidate pool installed."""
+
+import argparse
+
+import uvicorn
+
+from benchmarks.run import disable_admission_limits, install_dataset
+from benchmarks.synthetic import parse_size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", default="10k")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    disable_admission_limits()
+    install_dataset(parse_size(args.rows))
+    from app.main import app
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# benchmarks/synthetic.py
+
+import csv
+import json
+import random
+from typing import Dict, Iterator
+
+LOCATIONS = [
+    "Mumbai", "Delhi", "Bengaluru", "Hyderabad", "Chennai", "Pune", "Kolkata",
+    "Ahmedabad", "Jaipur", "Noida", "Gurugram", "Kochi", "Indore", "Chandigarh",
+]
+DEPARTMENTS = [
+    "Engineering", "HR", "Sales", "Marketing", "Finance", "Operations",
+    "Support", "Legal", "Design", "Product",
+]
+FIRST = ["Aarav", "Diya", "Ishaan", "Kavya", "Rohan", "Saanvi", "Vihaan", "Anaya", "Arjun", "Meera"]
+LAST = ["Sharma", "Iyer", "Patel", "Reddy", "Gupta", "Nair", "Khan", "Das", "Singh", "Rao"]
+
+SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+
+
+def generate_candidates(n: int, seed: int = 42) -> Iterator[Dict]:
+    """Deterministic candidate rows with the same shape as CANDIDATES."""
+    rng = random.Random(seed)
+    for i in range(n):
+        yield {
+            "id": str(i),
+            "name": f"{rng.choice(FIRST)} {rng.choice(LAST)}",
+            "experience": rng.randint(0, 30),
+            "location": rng.choice(LOCATIONS),
+            "department": rng.choice(DEPARTMENTS),
+        }
+
+
+def write_csv(path: str, n: int, seed: int = 42) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["id", "name", "experience", "location", "department"])
+        writer.writeheader()
+        writer.writerows(generate_candidates(n, seed))
+
+
+def write_jsonl(path: str, n: int, seed: int = 42) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for row in generate_candidates(n, seed):
+            f.write(json.dumps(row))
+            f.write("\n")
+
+
+def parse_size(value: str) -> int:
+    return SIZES.get(value.lower()) or int(value)
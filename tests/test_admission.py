@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routers import tools
+from app.services.admission import AdmissionController, AdmissionRejected, TokenBucket
+
+client = TestClient(app)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_token_bucket_refills_at_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=2, clock=clock)
+    assert bucket.take() == 0 and bucket.take() == 0
+    assert bucket.take() == pytest.approx(0.5)
+    clock.now = 0.5
+    assert bucket.take() == 0
+
+def test_per_subject_limits_reject_with_429():
+    clock = FakeClock()
+    ctl = AdmissionController(max_per_subject=2, subject_rate=1, subject_burst=3, clock=clock)
+
+    async def scenario():
+        a = await ctl.acquire("alice")
+        await ctl.acquire("alice")
+        with pytest.raises(AdmissionRejected) as exc:
+            await ctl.acquire("alice")
+        assert (exc.value.status, exc.value.reason) == (429, "subject_concurrency")
+        await ctl.acquire("bob")
+        a.release()
+        a.release()  # idempotent
+        third = await ctl.acquire("alice")  # last token of the burst
+        third.release()
+        with pytest.raises(AdmissionRejected) as exc:
+            await ctl.acquire("alice")
+        assert (exc.value.reason, exc.value.retry_after) == ("subject_rate", 1)
+
+    asyncio.run(scenario())
+    assert ctl.rejected == {"subject_concurrency": 1, "subject_rate": 1}
+
+def test_global_limit_queues_then_rejects_with_503():
+    ctl = AdmissionController(max_streams=1, queue_size=1, queue_timeout=0.05)
+
+    async def scenario():
+        first = await ctl.acquire("a")
+        waiting = asyncio.ensure_future(ctl.acquire("b"))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as full:
+            await ctl.acquire("c")
+        assert (full.value.status, full.value.reason, full.value.retry_after) == (503, "queue_full", 1)
+
+        first.release()
+        second = await waiting
+        assert second.subject == "b"
+        with pytest.raises(AdmissionRejected) as timeout:
+            await ctl.acquire("d")
+        assert timeout.value.reason == "queue_timeout"
+        second.release()
+
+    asyncio.run(scenario())
+    stats = ctl.stats()
+    assert (stats["open"], stats["queued"], stats["subjects"]) == (0, 0, 0)
+    assert stats["rejected"] == {"queue_full": 1, "queue_timeout": 1}
+
+def test_sse_endpoint_rejects_over_limit_subject(monkeypatch):
+    ctl = AdmissionController(max_per_subject=1, subject_rate=0.01, subject_burst=1)
+    monkeypatch.setattr(tools, "ADMISSION", ctl)
+    params = {"experience": 0, "location": "Mumbai", "department": "Engineering"}
+
+    ok = client.get("/tools/candidate/search/sse", params=params)
+    assert ok.status_code == 200
+    assert ctl.stats()["open"] == 0  # released when the stream finished
+
+    limited = client.get("/tools/candidate/search/sse", params=params)
+    assert limited.status_code == 429
+    assert int(limited.headers["retry-after"]) >= 1
+    stats = client.get("/tools/candidate/search/admission").json()
+    assert stats["admitted"] == 1
+    assert stats["rejected"] == {"subject_rate": 1}
@@ -0,0 +1,41 @@
+from benchmarks.load import percentile
+from benchmarks.run import compare, install_dataset
+from benchmarks.synthetic import generate_candidates, parse_size
+
+def test_synthetic_candidates_are_deterministic():
+    first = list(generate_candidates(50, seed=1))
+    assert first == list(generate_candidates(50, seed=1))
+    assert set(first[0]) == {"id", "name", "experience", "location", "department"}
+    assert parse_size("1m") == 1_000_000
+    assert parse_size("1234") == 1234
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+def test_compare_flags_only_real_regressions():
+    baseline = {"results": {"10k": {"asgi": {"x": {"p95_ms": 10.0, "throughput_rps": 100.0}}}}}
+    same = {"results": {"10k": {"asgi": {"x": {"p95_ms": 10.2, "throughput_rps": 99.0}}}}}
+    worse = {"results": {"10k": {"asgi": {"x": {"p95_ms": 20.0, "throughput_rps": 50.0}}}}}
+    assert compare(same, baseline, 0.25) == []
+    assert len(compare(worse, baseline, 0.25)) == 2
+
+def test_compare_fails_on_any_errors():
+    baseline = {"results": {"10k": {"asgi": {"x": {"errors": 0, "p95_ms": 10.0}}}}}
+    flooded = {"results": {"10k": {"asgi": {"x": {"errors": 153, "p95_ms": 5.0},
+                                            "new": {"errors": 1}}}}}
+    assert compare(flooded, baseline, 0.25) == [
+        "10k.asgi.x.errors: 0 -> 153 errors",
+        "10k.asgi.new.errors: 0 -> 1 errors",
+    ]
+
+def test_install_dataset_publishes_a_store_without_text_index(monkeypatch):
+    from app.services import candidate_service
+    monkeypatch.setattr(candidate_service, "CANDIDATE_STORE", candidate_service.CANDIDATE_STORE)
+    before = candidate_service.dataset_version()
+    install_dataset(50)
+    assert len(candidate_service.CANDIDATE_STORE) == 50
+    assert candidate_service.dataset_version() > before
+    assert not candidate_service.text_index_enabled()
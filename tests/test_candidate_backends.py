@@ -0,0 +1,142 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import candidate_backends
+from app.services.candidate_backends import (
+    CandidateBackend,
+    Federation,
+    HTTPBackend,
+    MemoryBackend,
+    SQLiteBackend,
+    open_backend,
+    write_sqlite,
+)
+
+client = TestClient(app)
+
+EU = [
+    {"id": "eu-1", "name": "Ines", "experience": 6, "location": "Mumbai", "department": "Engineering"},
+    {"id": "eu-2", "name": "Jan", "experience": 2, "location": "Mumbai", "department": "Engineering"},
+]
+APAC = [
+    {"id": "ap-1", "name": "Kiri", "experience": 9, "location": "mumbai", "department": "engineering"},
+    {"id": "1", "name": "Alice", "experience": 5, "location": "Mumbai", "department": "Engineering"},
+]
+
+class RegionalServer:
+    """Stand-in regional store: /ok answers, /slow stalls, /broken fails."""
+
+    def __init__(self, candidates):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == "/broken":
+                    self.send_error(500)
+                    return
+                if url.path == "/slow":
+                    time.sleep(1)
+                q = {k: v[0] for k, v in parse_qs(url.query).items()}
+                rows = [
+                    c for c in candidates
+                    if c["experience"] >= int(q["experience"])
+                    and c["location"].casefold() == q["location"].casefold()
+                    and c["department"].casefold() == q["department"].casefold()
+                ]
+                body = json.dumps(rows[::-1]).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def federation(tmp_path, monkeypatch):
+    db = tmp_path / "eu.db"
+    write_sqlite(str(db), EU)
+    server = RegionalServer(APAC)
+    monkeypatch.setattr(candidate_backends, "_http_client", None)
+    fed = Federation([
+        MemoryBackend("local"),
+        SQLiteBackend(str(db), "eu"),
+        HTTPBackend(server.base + "/ok", "apac"),
+        HTTPBackend(server.base + "/slow", "slow", timeout=0.2),
+        HTTPBackend(server.base + "/broken", "broken"),
+    ], timeout=2.0)
+    monkeypatch.setattr(candidate_backends, "FEDERATION", fed)
+    yield fed
+    server.close()
+
+def test_scatter_gather_merges_and_reports_partial_results(federation):
+    async def scenario():
+        try:
+            return await federation.search(3, "MUMBAI", "Engineering")
+        finally:
+            await federation.close()
+
+    rows, shards = asyncio.run(scenario())
+    # Alice comes back from both local and apac; the first copy wins
+    assert [c["id"] for c in rows] == ["1", "eu-1", "ap-1"]
+    status = {s.backend: s.status for s in shards}
+    assert status == {"local": "ok", "eu": "ok", "apac": "ok", "slow": "timeout", "broken": "error"}
+    assert next(s for s in shards if s.backend == "slow").elapsed < 0.9
+
+def test_federated_sse_streams_each_backend_as_it_answers(federation):
+    qp = {"experience": 0, "location": "Mumbai", "department": "Engineering"}
+    events = []
+    with client.stream("GET", "/tools/candidate/federated/sse", params=qp) as resp:
+        assert resp.status_code == 200
+        name = None
+        for raw in resp.iter_lines():
+            line = (raw.decode() if isinstance(raw, bytes) else raw).strip()
+            if line.startswith("event: "):
+                name = line[7:]
+            elif line.startswith("data: "):
+                events.append((name, line[6:]))
+
+    shards = [json.loads(d)["backend"] for n, d in events if n == "shard"]
+    assert shards[-1] == "slow"  # the timeout is reported last
+    ids = [c["id"] for n, d in events if n == "results" for c in json.loads(d)]
+    assert sorted(ids) == ["1", "ap-1", "eu-1", "eu-2"]
+    done = json.loads(events[-1][1])
+    assert done["total"] == 4 and done["partial"] is True
+    assert {b["backend"]: b["status"] for b in done["backends"]}["broken"] == "error"
+
+def test_json_search_endpoint_speaks_the_http_backend_protocol():
+    r = client.get("/tools/candidate/search", params={"experience": 0, "location": "mumbai", "department": "engineering"})
+    assert r.status_code == 200
+    assert [c["name"] for c in r.json()] == ["Alice"]
+
+def test_backend_without_search_fails_at_instantiation():
+    class NoSearch(CandidateBackend):
+        name = "broken"
+
+    with pytest.raises(TypeError):
+        NoSearch()
+
+def test_open_backend_specs(tmp_path):
+    write_sqlite(str(tmp_path / "x.db"), [])
+    assert isinstance(open_backend("memory"), MemoryBackend)
+    assert open_backend(f"eu=sqlite:///{tmp_path / 'x.db'}").name == "eu"
+    http = open_backend("https://example.com/search?region=in")
+    assert isinstance(http, HTTPBackend) and http.url == "https://example.com/search?region=in"
+    with pytest.raises(ValueError):
+        open_backend("ftp://nope")
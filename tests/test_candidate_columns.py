@@ -0,0 +1,71 @@
+import json
+
+from app.services.candidate_columns import CandidateColumns
+from app.services.candidate_service import CANDIDATES, search_candidates
+
+def test_from_records_matches_search_candidates():
+    cols = CandidateColumns.from_records(CANDIDATES)
+    assert len(cols) == len(CANDIDATES)
+    for query in [(0, "Mumbai", "Engineering"), (3, "delhi", "hr"), (8, "Bengaluru", "Engineering")]:
+        assert cols.search(*query) == search_candidates(*query)
+
+def test_unknown_category_yields_empty_mask():
+    cols = CandidateColumns.from_records(CANDIDATES)
+    assert not cols.mask(0, "Goa", "HR").any()
+    assert cols.search(0, "Goa", "HR") == []
+
+def test_bulk_loaders(tmp_path):
+    csv_path = tmp_path / "c.csv"
+    csv_path.write_text(
+        "id,name,location,department,experience\n"
+        "10,Dev,Pune,Sales,4\n"
+        "11,Eve,pune,sales,6\n"
+    )
+    jsonl_path = tmp_path / "c.jsonl"
+    jsonl_path.write_text("\n".join(json.dumps(c) for c in CANDIDATES) + "\n")
+
+    from_csv = CandidateColumns.from_csv(str(csv_path))
+    assert [c["name"] for c in from_csv.search(5, "PUNE", "Sales")] == ["Eve"]
+    # dictionary encoding folds case onto the first spelling seen
+    assert from_csv.locations.values == ["Pune"]
+
+    from_jsonl = CandidateColumns.from_jsonl(str(jsonl_path))
+    assert from_jsonl.record(1) == CANDIDATES[1]
+
+def test_columnar_store_serves_the_search_path(tmp_path, monkeypatch):
+    from app import config
+    from app.services.candidate_columns import ColumnarCandidateStore
+    from app.services.candidate_ingest import load_store
+    from app.services.candidate_service import CandidateStore
+    from benchmarks.synthetic import generate_candidates
+
+    rows = list(generate_candidates(300, seed=3))
+    memory = CandidateStore(rows, text_index=False)
+    # a repeated id keeps its last row, like an upsert
+    columnar = ColumnarCandidateStore(CandidateColumns.from_records(rows + [dict(rows[0], experience=40)]))
+    memory = memory.apply(upserts=[dict(rows[0], experience=40)])
+    assert len(columnar) == len(memory)
+    loc, dept = rows[0]["location"], rows[0]["department"]
+    for exp in (0, 7, 40):
+        assert columnar.search(exp, loc.upper(), dept) == memory.search(exp, loc, dept)
+        assert columnar.page(exp, loc, dept, "name", 5)[0] == memory.page(exp, loc, dept, "name", 5)[0]
+    assert columnar.facets(experience=3, bucket_width=4) == memory.facets(experience=3, bucket_width=4)
+
+    path = tmp_path / "pool.jsonl"
+    path.write_text("\n".join(json.dumps(r) for r in rows) + "\n")
+    monkeypatch.setattr(config, "CANDIDATE_COLUMNAR", True)
+    loaded = load_store(str(path))
+    assert isinstance(loaded, ColumnarCandidateStore)
+    assert loaded.search(0, loc, dept) == CandidateStore(rows).search(0, loc, dept)
+
+def test_sorted_columns_orders_non_ascii_ids_like_str():
+    from app.services.candidate_columns import ColumnarCandidateStore
+    from app.services.candidate_service import CandidateStore
+
+    ids = ["b", "é", "a", "中", "ab", "a", "Z", "😀", "é"]
+    rows = [{"id": cid, "name": f"n{i}", "experience": 3, "location": "Pune", "department": "Ops"}
+            for i, cid in enumerate(ids)]
+    columnar = ColumnarCandidateStore(CandidateColumns.from_records(rows))
+    memory = CandidateStore(text_index=False).apply(upserts=rows)
+    assert columnar.search(0, "pune", "ops") == memory.search(0, "pune", "ops")
+    assert [c["id"] for c in columnar.search(0, "pune", "ops")] == sorted(set(ids))
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import config
+from app.main import app
+from app.services import candidate_service
+from app.services.candidate_ingest import FileWatcher, load_store, reload
+from app.services.candidate_service import CANDIDATES, CandidateStore, search_candidates
+
+client = TestClient(app)
+
+def make_candidate(cid, experience, location="Pune", department="Sales", **extra):
+    return dict(id=cid, name=f"Candidate {cid}", experience=experience,
+                location=location, department=department, **extra)
+
+@pytest.fixture(autouse=True)
+def fresh_store(monkeypatch):
+    monkeypatch.setattr(candidate_service, "CANDIDATE_STORE", CandidateStore(CANDIDATES))
+
+def test_apply_copies_only_touched_buckets():
+    old = CandidateStore([make_candidate("a", 2), make_candidate("b", 4), make_candidate("c", 1, "Delhi")])
+    new = old.apply(upserts=[make_candidate("a", 9, skills="kafka")], deletes=["b", "missing"])
+
+    assert [c["id"] for c in old.search(0, "Pune", "Sales")] == ["a", "b"]
+    assert [(c["id"], c["experience"]) for c in new.search(0, "Pune", "Sales")] == [("a", 9)]
+    assert len(old) == 3 and len(new) == 2
+    assert new.version > old.version
+    assert new._index[("delhi", "sales")] is old._index[("delhi", "sales")]
+    # the text index is copy-on-write too
+    assert [c["id"] for _, c in new.text.search("kafka")] == ["a"]
+    assert old.text.search("kafka") == []
+
+def test_writes_to_the_old_store_after_apply_leave_the_new_one_alone():
+    old = CandidateStore([make_candidate("a", 2), make_candidate("c", 1, "Delhi")])
+    new = old.apply(upserts=[make_candidate("b", 3)])
+    old.add(make_candidate("d", 5, "Delhi"))
+    old._discard("a")
+    assert [c["id"] for c in new.search(0, "Pune", "Sales")] == ["a", "b"]
+    assert [c["id"] for c in new.search(0, "Delhi", "Sales")] == ["c"]
+    assert new.facets(location="Delhi")["total"] == 1
+
+def test_open_stream_keeps_reading_the_store_it_started_on():
+    rows = candidate_service.iter_candidates(0, "Mumbai", "Engineering")
+    candidate_service.ingest(deletes=["1"])
+    assert [c["id"] for c in rows] == ["1"]
+    assert search_candidates(0, "Mumbai", "Engineering") == []
+
+def test_ingest_endpoint_publishes_a_new_version():
+    before = candidate_service.dataset_version()
+    r = client.post("/candidates/ingest", json={
+        "upsert": [make_candidate("9", 6, "Mumbai", "Engineering")],
+        "delete": ["1", "nope"],
+    })
+    assert r.status_code == 200
+    body = r.json()
+    assert body["version"] > before
+    assert (body["size"], body["upserted"], body["deleted"]) == (3, 1, 1)
+    assert [c["id"] for c in search_candidates(0, "mumbai", "engineering")] == ["9"]
+
+    bad = client.post("/candidates/ingest", json={"upsert": [{"id": "x", "experience": -1}]})
+    assert bad.status_code == 422
+
+def test_reload_needs_a_source(monkeypatch):
+    monkeypatch.setattr(config, "CANDIDATE_SOURCE", "")
+    assert client.post("/candidates/reload").status_code == 400
+
+def test_watcher_reloads_when_the_file_changes(tmp_path):
+    path = tmp_path / "pool.csv"
+    path.write_text("id,name,experience,location,department\n7,Gita,4,Goa,Ops\n")
+    watcher = FileWatcher(str(path), interval=60)
+
+    assert asyncio.run(watcher.poll())
+    assert [c["name"] for c in search_candidates(0, "Goa", "Ops")] == ["Gita"]
+    assert not asyncio.run(watcher.poll())
+
+    path.write_text("id,name,experience,location,department\n7,Gita,4,Goa,Ops\n8,Hari,2,Goa,Ops\n")
+    assert asyncio.run(watcher.poll())
+    assert [c["name"] for c in search_candidates(0, "Goa", "Ops")] == ["Hari", "Gita"]
+    assert watcher.reloads == 2
+
+def test_load_store_keeps_the_last_record_per_id(tmp_path):
+    path = tmp_path / "pool.csv"
+    path.write_text("id,name,experience,location,department\n"
+                    "7,Gita,4,Goa,Ops\n8,Hari,2,Goa,Ops\n7,Gita,9,Goa,Ops\n")
+    store = load_store(str(path))
+    assert len(store) == 2
+    assert store.facets(location="Goa")["experience"] == {"0-4": 1, "5-9": 1}
+    assert [c["experience"] for c in store.search(0, "Goa", "Ops")] == [2, 9]
+
+def test_reload_waits_for_in_flight_ingest(tmp_path):
+    path = tmp_path / "pool.csv"
+    path.write_text("id,name,experience,location,department\n7,Gita,4,Goa,Ops\n")
+    with candidate_service._ingest_lock:
+        worker = threading.Thread(target=reload, args=(str(path),))
+        worker.start()
+        worker.join(0.2)
+        # the reload can't publish while an ingest batch holds the lock
+        assert worker.is_alive()
+        assert search_candidates(0, "Goa", "Ops") == []
+    worker.join()
+    assert [c["name"] for c in search_candidates(0, "Goa", "Ops")] == ["Gita"]
@@ -0,0 +1,133 @@
+from app.services.candidate_service import CandidateStore, search_candidates
+
+def make_candidate(cid: str, experience: int, location="Pune", department="Sales"):
+    return {
+        "id": cid,
+        "name": f"Candidate {cid}",
+        "experience": experience,
+        "location": location,
+        "department": department,
+    }
+
+def test_search_candidates_matches_case_insensitively():
+    results = search_candidates(5, "mumbai", "ENGINEERING")
+    assert [c["name"] for c in results] == ["Alice"]
+
+def test_store_filters_by_experience_floor_in_order():
+    store = CandidateStore([
+        make_candidate("a", 9),
+        make_candidate("b", 2),
+        make_candidate("c", 5),
+        make_candidate("d", 5),
+        make_candidate("e", 1, location="Delhi"),
+    ])
+    assert len(store) == 5
+    # sorted by experience, ties ordered by id
+    assert [c["id"] for c in store.search(5, "Pune", "Sales")] == ["c", "d", "a"]
+    assert store.search(10, "Pune", "Sales") == []
+    assert store.search(0, "Goa", "Sales") == []
+
+def paged_store():
+    return CandidateStore(
+        make_candidate(str(i), exp, department="Eng") | {"name": name}
+        for i, (exp, name) in enumerate(
+            [(4, "Zed"), (9, "Amy"), (2, "Kim"), (9, "Bea"), (6, "Lee"), (4, "Ann"), (1, "Old")]
+        )
+    )
+
+def walk(store, sort, limit, experience=2):
+    pages, after = [], None
+    while True:
+        rows, after = store.page(experience, "pune", "eng", sort, limit, after)
+        pages.append([r["name"] for r in rows])
+        if after is None:
+            return pages
+
+def test_page_experience_desc_resumes_after_cursor():
+    store = paged_store()
+    assert walk(store, "experience_desc", 2) == [["Bea", "Amy"], ["Lee", "Ann"], ["Zed", "Kim"]]
+    assert walk(store, "experience_asc", 4) == [["Kim", "Zed", "Ann", "Lee"], ["Amy", "Bea"]]
+
+def test_page_name_uses_top_k():
+    store = paged_store()
+    assert walk(store, "name", 3) == [["Amy", "Ann", "Bea"], ["Kim", "Lee", "Zed"]]
+    rows, after = store.page(0, "Pune", "Eng", "name", None)
+    assert after is None
+    assert [r["name"] for r in rows] == ["Amy", "Ann", "Bea", "Kim", "Lee", "Old", "Zed"]
+
+def test_cursor_round_trip_and_validation():
+    import pytest
+    from app.services.candidate_service import decode_cursor, encode_cursor
+
+    token = encode_cursor("experience_desc", (9, "3"))
+    assert decode_cursor(token, "experience_desc") == (9, "3")
+    with pytest.raises(ValueError):
+        decode_cursor(token, "name")
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor", "name")
+
+def test_encode_array_reuses_pre_encoded_records():
+    import json
+
+    store = CandidateStore([make_candidate("a", 3), make_candidate("b", 4)])
+    rows = store.search(0, "Pune", "Sales")
+    payload = store.encode_array(rows, b"data: ", b"\n")
+    assert payload.startswith(b"data: [") and payload.endswith(b"]\n")
+    assert json.loads(payload[len(b"data: "):-1]) == rows
+    assert store.encode_array([]) == b"[]"
+
+    # a record the store didn't encode falls back to json.dumps
+    stranger = make_candidate("a", 99)
+    assert json.loads(store.encode_array([stranger])) == [stranger]
+
+def brute_force_facets(rows, experience=0, location=None, department=None, width=5):
+    matched = [c for c in rows if c["experience"] >= experience
+               and (location is None or c["location"].casefold() == location.casefold())
+               and (department is None or c["department"].casefold() == department.casefold())]
+    per = lambda field: {v: sum(1 for c in matched if c[field] == v) for v in {c[field] for c in matched}}
+    buckets = {}
+    for c in matched:
+        low = c["experience"] - c["experience"] % width
+        buckets[f"{low}-{low + width - 1}"] = buckets.get(f"{low}-{low + width - 1}", 0) + 1
+    return {"total": len(matched), "location": per("location"),
+            "department": per("department"), "experience": buckets}
+
+def test_facets_track_adds_deletes_and_derived_stores():
+    rows = [
+        make_candidate("a", 9, "Pune", "Sales"),
+        make_candidate("b", 2, "Pune", "HR"),
+        make_candidate("c", 5, "Delhi", "Sales"),
+        make_candidate("d", 6, "Delhi", "Sales"),
+    ]
+    store = CandidateStore(rows)
+    facets = store.facets(experience=5, department="sales")
+    assert facets == {
+        "total": 3,
+        "location": {"Delhi": 2, "Pune": 1},
+        "department": {"Sales": 3},
+        "experience": {"5-9": 3},
+    }
+    assert facets == brute_force_facets(rows, 5, department="sales")
+    assert store.facets(max_experience=5, bucket_width=1)["experience"] == {"2": 1, "5": 1}
+
+    updated = store.apply(upserts=[make_candidate("d", 1, "Delhi", "Sales")], deletes=["a"])
+    new_rows = [rows[1], rows[2], make_candidate("d", 1, "Delhi", "Sales")]
+    for filters in [{}, {"experience": 3}, {"location": "pune"}, {"location": "Delhi", "department": "Sales"}]:
+        assert updated.facets(**filters) == brute_force_facets(new_rows, **filters)
+        # the store it was derived from keeps its own counts
+        assert store.facets(**filters) == brute_force_facets(rows, **filters)
+    assert updated.facets(location="Pune", department="Sales")["total"] == 0
+
+def test_name_pages_never_rescan_emitted_rows():
+    from app.metrics import SEARCH_ROWS_SCANNED
+    store = CandidateStore(
+        make_candidate(str(i), i % 10, department="Eng") | {"name": f"n{(i * 7919) % 1000:03d}"}
+        for i in range(1000)
+    )
+    store = store.apply(upserts=[make_candidate("x", 9, department="Eng") | {"name": "n500"}], deletes=["3"])
+    before = SEARCH_ROWS_SCANNED.value()
+    pages = walk(store, "name", 10, experience=0)
+    names = [n for page in pages for n in page]
+    assert len(names) == 1000 and names == sorted(names)
+    # each page reads its rows plus the one that says there's more
+    assert SEARCH_ROWS_SCANNED.value() - before <= 1000 + len(pages)
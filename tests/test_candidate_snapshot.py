@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from app.services.candidate_columns import CandidateColumns
+from app.services.candidate_service import CandidateStore
+from app.services.candidate_snapshot import SnapshotCandidateStore, main, write_snapshot
+from benchmarks.synthetic import generate_candidates, write_jsonl
+
+@pytest.fixture
+def stores(tmp_path):
+    rows = list(generate_candidates(500, seed=7))
+    path = tmp_path / "pool.snap"
+    write_snapshot(CandidateColumns.from_records(rows), str(path))
+    return CandidateStore(rows, text_index=False), SnapshotCandidateStore(str(path))
+
+def test_snapshot_store_matches_memory_store(stores):
+    memory, snapshot = stores
+    assert len(snapshot) == len(memory)
+    row = next(iter(memory._encoded.values()))[0]
+    for query in [(0, row["location"], row["department"]), (5, row["location"].upper(), row["department"]),
+                  (0, "Atlantis", "Sales")]:
+        assert snapshot.search(*query) == memory.search(*query)
+        assert list(snapshot.iter_search(*query)) == list(memory.iter_search(*query))
+
+def test_snapshot_store_pages_like_memory_store(stores):
+    memory, snapshot = stores
+    row = next(iter(memory._encoded.values()))[0]
+    for sort in ("experience_asc", "experience_desc", "name"):
+        after, pages = None, []
+        while True:
+            page, after = snapshot.page(2, row["location"], row["department"], sort, 7, after)
+            pages.extend(page)
+            if after is None:
+                break
+        assert pages == memory.page(2, row["location"], row["department"], sort)[0]
+
+def test_snapshot_store_facets_match_memory_store(stores):
+    memory, snapshot = stores
+    row = next(iter(memory._encoded.values()))[0]
+    for filters in [{}, {"experience": 4, "bucket_width": 3}, {"department": row["department"].lower()},
+                    {"location": row["location"], "department": row["department"], "max_experience": 10}]:
+        assert snapshot.facets(**filters) == memory.facets(**filters)
+
+def test_snapshot_store_is_read_only(stores):
+    _, snapshot = stores
+    with pytest.raises(TypeError):
+        snapshot.add({"id": "x", "name": "X", "experience": 1, "location": "Pune", "department": "HR"})
+
+def test_build_and_info_cli(tmp_path, capsys):
+    src, dest = tmp_path / "pool.jsonl", tmp_path / "pool.snap"
+    write_jsonl(str(src), 50)
+    assert main(["build", str(src), str(dest)]) == 0
+    capsys.readouterr()
+    assert main(["info", str(dest)]) == 0
+    assert json.loads(capsys.readouterr().out)["rows"] == 50
+
+def test_rejects_non_snapshot_files(tmp_path):
+    path = tmp_path / "bogus.snap"
+    path.write_bytes(b"not a snapshot at all")
+    with pytest.raises(ValueError):
+        SnapshotCandidateStore(str(path))
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import zlib
+
+from fastapi.testclient import TestClient
+
+from app.compression import CompressionMiddleware, negotiate
+from app.main import app
+from app.services.discovery_cache import _etag_matches
+
+client = TestClient(app)
+
+
+def test_negotiate_honours_q_values():
+    assert negotiate("gzip, deflate") == "gzip"
+    assert negotiate("deflate, gzip;q=0.5") == "deflate"
+    assert negotiate("gzip;q=0, deflate") == "deflate"
+    assert negotiate("br, *") == "gzip"
+    assert negotiate("identity") is None
+    assert negotiate("") is None
+
+
+def test_large_json_is_gzipped_and_small_json_is_not():
+    resp = client.get("/.well-known/oauth-authorization-server", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["vary"]
+    assert resp.json()["jwks_uri"].endswith("/certs")
+
+    health = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in health.headers
+    assert health.json() == {"status": "ok"}
+
+
+def _run(app, headers):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    }
+    asyncio.run(app(scope, receive, send))
+    return sent
+
+
+def test_sse_events_are_flushed_one_by_one():
+    events = [b"event: tick\r\ndata: %d\r\n\r\n" % i for i in range(3)]
+
+    async def stream(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/event-stream")],
+        })
+        for event in events:
+            await send({"type": "http.response.body", "body": event, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    sent = _run(CompressionMiddleware(stream, min_size=1 << 20), {"Accept-Encoding": "gzip"})
+    headers = dict(sent[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+
+    # every chunk decompresses to exactly the event sent, without the rest of the stream
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    bodies = [m["body"] for m in sent[1:]]
+    assert [decoder.decompress(b) for b in bodies[:3]] == events
+    decoder.decompress(bodies[3])
+    assert decoder.eof
+
+
+def test_buffered_body_and_existing_encoding():
+    payload = json.dumps({"rows": ["x" * 20] * 100}).encode()
+
+    def app_with(headers):
+        async def endpoint(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            half = len(payload) // 2
+            await send({"type": "http.response.body", "body": payload[:half], "more_body": True})
+            await send({"type": "http.response.body", "body": payload[half:]})
+        return CompressionMiddleware(endpoint, min_size=256)
+
+    sent = _run(app_with([(b"content-type", b"application/json")]), {"Accept-Encoding": "deflate"})
+    assert dict(sent[0]["headers"])[b"content-encoding"] == b"deflate"
+    assert zlib.decompress(b"".join(m["body"] for m in sent[1:])) == payload
+
+    already = [(b"content-type", b"application/json"), (b"content-encoding", b"gzip")]
+    sent = _run(app_with(already), {"Accept-Encoding": "gzip"})
+    assert b"".join(m["body"] for m in sent[1:]) == payload
+
+    sent = _run(app_with([(b"content-type", b"application/json")]), {})
+    assert b"".join(m["body"] for m in sent[1:]) == payload
+
+
+def test_compressed_etag_is_weak_and_still_matches():
+    async def endpoint(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json"), (b"etag", b'"abc"')],
+        })
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    sent = _run(CompressionMiddleware(endpoint, min_size=0), {"Accept-Encoding": "gzip"})
+    etag = dict(sent[0]["headers"])[b"etag"].decode()
+    assert etag == 'W/"abc"'
+    assert _etag_matches(etag, '"abc"')
+    assert not _etag_matches('W/"abd"', '"abc"')
@@ -0,0 +1,79 @@
+import pytest
+
+from app.schema.common import ContextNode
+from app.services.context_store import (
+    ContextStore,
+    MemoryContextStore,
+    SQLiteContextStore,
+    open_context_store,
+)
+
+def make_node(node_id: str, description: str = "A test tool"):
+    return ContextNode(
+        id=node_id, name=f"Tool {node_id}", description=description, prompt="", parameters={}
+    )
+
+def test_memory_store_insert_and_version():
+    store = MemoryContextStore()
+    v0 = store.version
+    assert store.insert(make_node("a"))
+    assert not store.insert(make_node("a"))
+    assert store.version != v0
+    assert list(store) == ["a"]
+
+def test_sqlite_store_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / "contexts.db")
+    worker_1 = SQLiteContextStore(path)
+    worker_2 = SQLiteContextStore(path)
+
+    v_before = worker_2.version
+    assert worker_1.insert(make_node("a"))
+    assert worker_2.version != v_before
+    assert "a" in worker_2
+    # the second worker can't register an id the first one already took
+    assert not worker_2.insert(make_node("a"))
+
+    worker_2["a"] = make_node("a", "updated")
+    assert worker_1["a"].description == "updated"
+
+    del worker_1["a"]
+    assert len(worker_2) == 0
+
+def test_sqlite_discovery_etag_follows_other_connections(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.routers import register
+
+    path = str(tmp_path / "contexts.db")
+    monkeypatch.setattr(register, "STORE", SQLiteContextStore(path))
+    client = TestClient(app)
+    first = client.get("/context-all")
+    assert first.json() == []
+
+    # another worker registers through its own connection
+    SQLiteContextStore(path).insert(make_node("a"))
+    again = client.get("/context-all", headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 200
+    assert [n["id"] for n in again.json()] == ["a"]
+    assert again.headers["etag"] != first.headers["etag"]
+
+def test_sqlite_store_survives_restart(tmp_path):
+    path = str(tmp_path / "contexts.db")
+    store = SQLiteContextStore(path)
+    store.insert(make_node("a"))
+    store.insert(make_node("b"))
+    store.close()
+
+    reopened = open_context_store(f"sqlite:///{path}")
+    assert sorted(n.id for n in reopened.values()) == ["a", "b"]
+
+def test_unknown_store_url():
+    with pytest.raises(ValueError):
+        open_context_store("redis://localhost")
+
+def test_incomplete_backend_fails_at_instantiation():
+    class NoInsert(ContextStore):
+        __getitem__ = __setitem__ = __delitem__ = __iter__ = __len__ = lambda self, *a: None
+
+    with pytest.raises(TypeError):
+        NoInsert()
@@ -0,0 +1,110 @@
+import json
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+def rpc(req_id, method, params=None):
+    msg = {"jsonrpc": "2.0", "id": req_id, "method": method}
+    if params is not None:
+        msg["params"] = params
+    return msg
+
+def search_call(req_id, **arguments):
+    return rpc(req_id, "tools/call", {"name": "candidate_search", "arguments": arguments})
+
+def test_tools_list_includes_candidate_search():
+    resp = client.post("/mcp", json=rpc(1, "tools/list"))
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["id"] == 1
+    tools = {t["name"]: t for t in body["result"]["tools"]}
+    assert tools["candidate_search"]["inputSchema"]["required"] == ["experience", "location", "department"]
+
+def test_tools_call_runs_search():
+    body = client.post(
+        "/mcp", json=search_call(7, experience=3, location="Delhi", department="HR")
+    ).json()
+    results = json.loads(body["result"]["content"][0]["text"])
+    assert [c["name"] for c in results["candidates"]] == ["Bob"]
+    assert results["next_cursor"] is None
+
+def test_tools_call_search_pages_with_a_cursor(monkeypatch):
+    from app.services import candidate_service
+    from app.services.candidate_service import CandidateStore
+    monkeypatch.setattr(candidate_service, "CANDIDATE_STORE", CandidateStore(
+        {"id": str(i), "name": f"N{i:02d}", "experience": i % 7, "location": "Mumbai", "department": "Engineering"}
+        for i in range(25)
+    ))
+    names, cursor = [], None
+    while True:
+        args = dict(experience=0, location="Mumbai", department="Engineering", limit=10, sort="name")
+        if cursor:
+            args["cursor"] = cursor
+        result = json.loads(client.post("/mcp", json=search_call(1, **args)).json()["result"]["content"][0]["text"])
+        assert len(result["candidates"]) <= 10
+        names += [c["name"] for c in result["candidates"]]
+        cursor = result["next_cursor"]
+        if cursor is None:
+            break
+    assert names == [f"N{i:02d}" for i in range(25)]
+
+    # without a limit the response is still capped at the default page size
+    from app.routers import jsonrpc
+    monkeypatch.setattr(jsonrpc, "SEARCH_PAGE_DEFAULT", 20)
+    unpaged = client.post("/mcp", json=search_call(2, experience=0, location="Mumbai", department="Engineering"))
+    result = json.loads(unpaged.json()["result"]["content"][0]["text"])
+    assert len(result["candidates"]) == 20 and result["next_cursor"]
+
+    for bad in ({"limit": 0}, {"limit": 5000}, {"cursor": "garbage"}, {"sort": "random"}):
+        resp = client.post("/mcp", json=search_call(3, experience=0, location="Mumbai",
+                                                    department="Engineering", **bad))
+        assert resp.json()["error"]["code"] == -32602
+
+def test_tools_call_candidate_facets():
+    call = rpc(8, "tools/call", {"name": "candidate_facets",
+                                 "arguments": {"experience": 5, "department": "Engineering"}})
+    facets = json.loads(client.post("/mcp", json=call).json()["result"]["content"][0]["text"])
+    assert facets["location"] == {"Bengaluru": 1, "Mumbai": 1}
+
+    bad = rpc(9, "tools/call", {"name": "candidate_facets", "arguments": {"bucket": 0}})
+    assert client.post("/mcp", json=bad).json()["error"]["code"] == -32602
+
+def test_batch_returns_results_and_errors():
+    batch = [
+        search_call(1, experience=5, location="Mumbai", department="Engineering"),
+        rpc(2, "no/such/method"),
+        search_call(3, experience="lots"),
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+    ]
+    body = client.post("/mcp", json=batch).json()
+    by_id = {r["id"]: r for r in body}
+    assert set(by_id) == {1, 2, 3}
+    assert "result" in by_id[1]
+    assert by_id[2]["error"]["code"] == -32601
+    assert by_id[3]["error"]["code"] == -32602
+
+def test_batch_streams_each_response_as_an_event():
+    batch = [
+        search_call(1, experience=0, location="Mumbai", department="Engineering"),
+        search_call(2, experience=0, location="Bengaluru", department="Engineering"),
+        rpc(3, "ping"),
+    ]
+    with client.stream(
+        "POST", "/mcp", json=batch, headers={"Accept": "application/json, text/event-stream"}
+    ) as resp:
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        data = [
+            json.loads(line[len("data: "):])
+            for line in resp.iter_lines()
+            if line.startswith("data: ")
+        ]
+    assert sorted(r["id"] for r in data) == [1, 2, 3]
+
+def test_parse_error_and_notification_only():
+    bad = client.post("/mcp", content="{oops", headers={"Content-Type": "application/json"})
+    assert bad.json()["error"]["code"] == -32700
+
+    note = client.post("/mcp", json={"jsonrpc": "2.0", "method": "notifications/initialized"})
+    assert note.status_code == 202
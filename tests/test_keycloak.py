@@ -0,0 +1,138 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwk, jwt
+
+from app import keycloak
+
+def make_key(kid: str):
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public = jwk.construct(pem, "RS256").public_key().to_dict()
+    public.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return pem, public
+
+class StubJwks:
+    """Local JWKS endpoint that counts how often it is fetched."""
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.hits = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.hits += 1
+                body = json.dumps({"keys": stub.keys}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = HTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/certs"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+KEY_1 = make_key("k1")
+KEY_2 = make_key("k2")
+
+@pytest.fixture
+def stub(monkeypatch):
+    server = StubJwks([KEY_1[1]])
+    monkeypatch.setattr(keycloak, "JWKS_URL", server.url)
+    monkeypatch.setattr(keycloak, "_jwks", keycloak._JwksCache())
+    monkeypatch.setattr(keycloak, "_verified_tokens", keycloak._VerifiedTokenCache(10))
+    yield server
+    server.close()
+
+def sign(key, kid: str, **claims):
+    body = {
+        "iss": keycloak.ISSUER,
+        "aud": keycloak.AUDIENCE,
+        "sub": "agent-1",
+        "exp": int(time.time()) + 300,
+    }
+    body.update(claims)
+    return jwt.encode(body, key[0], algorithm="RS256", headers={"kid": kid})
+
+def creds(token: str):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+def run(coro_fn):
+    async def wrapper():
+        await keycloak.startup()
+        try:
+            return await coro_fn()
+        finally:
+            await keycloak.shutdown()
+    return asyncio.run(wrapper())
+
+def test_concurrent_cold_start_fetches_jwks_once(stub):
+    tokens = [sign(KEY_1, "k1", sub=f"agent-{i}") for i in range(5)]
+
+    async def go():
+        return await asyncio.gather(*(keycloak.verify_access_token(creds(t)) for t in tokens))
+
+    payloads = run(go)
+    assert [p["sub"] for p in payloads] == [f"agent-{i}" for i in range(5)]
+    assert stub.hits == 1
+
+def test_verified_token_cache_skips_decode(stub, monkeypatch):
+    token = sign(KEY_1, "k1")
+
+    async def go():
+        first = await keycloak.verify_access_token(creds(token))
+        monkeypatch.setattr(jwt, "decode", lambda *a, **k: pytest.fail("decoded twice"))
+        second = await keycloak.verify_access_token(creds(token))
+        return first, second
+
+    first, second = run(go)
+    assert first == second
+
+def test_unknown_kid_triggers_single_refetch(stub):
+    rotated = sign(KEY_2, "k2")
+    unknown = sign(KEY_2, "k3")
+
+    async def go():
+        await keycloak.verify_access_token(creds(sign(KEY_1, "k1")))
+        stub.keys = [KEY_1[1], KEY_2[1]]
+        payload = await keycloak.verify_access_token(creds(rotated))
+        with pytest.raises(HTTPException) as exc:
+            await keycloak.verify_access_token(creds(unknown))
+        return payload, exc.value
+
+    payload, exc = run(go)
+    assert payload["sub"] == "agent-1"
+    assert exc.status_code == 401
+    # initial fetch + one refetch for k2; k3 is within the refetch interval
+    assert stub.hits == 2
+
+def test_bad_signature_rejected(stub):
+    forged = sign(KEY_2, "k1")
+
+    async def go():
+        with pytest.raises(HTTPException) as exc:
+            await keycloak.verify_access_token(creds(forged))
+        return exc.value
+
+    assert run(go).status_code == 401
@@ -0,0 +1,36 @@
+from fastapi.testclient import TestClient
+
+from app import metrics
+from app.main import app
+
+client = TestClient(app)
+
+def test_histogram_renders_cumulative_buckets():
+    h = metrics.Histogram("t_seconds", "test", ("route",), buckets=(0.1, 1.0))
+    h.observe(0.05, ("/a",))
+    h.observe(0.5, ("/a",))
+    h.observe(5.0, ("/a",))
+    text = "\n".join(h.render())
+    assert 't_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 't_seconds_bucket{route="/a",le="1.0"} 2' in text
+    assert 't_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 't_seconds_count{route="/a"} 3' in text
+
+def test_metrics_endpoint_reports_routes_streams_and_search():
+    client.get("/context/does-not-exist")
+    with client.stream(
+        "GET", "/tools/candidate/search/sse",
+        params={"experience": 0, "location": "Mumbai", "department": "Engineering"},
+    ) as resp:
+        list(resp.iter_lines())
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    text = resp.text
+    # path parameters are folded into the route template
+    assert 'mcp_http_requests_total{method="GET",route="/context/{node_id}",status="404"}' in text
+    assert 'mcp_sse_time_to_first_event_seconds_count{route="/tools/candidate/search/sse"}' in text
+    assert "mcp_sse_open_streams 0" in text
+    assert "mcp_context_store_size " in text
+    assert metrics.SEARCH_ROWS_RETURNED.value() >= 1
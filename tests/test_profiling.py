@@ -0,0 +1,66 @@
+import marshal
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import profiling
+from app.keycloak import verify_access_token
+from app.main import app
+from app.profiling import ProfileRing, ProfilingMiddleware, RequestProfile
+
+client = TestClient(app)
+
+@pytest.fixture
+def ring(monkeypatch):
+    ring = ProfileRing(4)
+    monkeypatch.setattr(profiling, "PROFILES", ring)
+    monkeypatch.setattr("app.routers.profiles.PROFILES", ring)
+    app.dependency_overrides[verify_access_token] = lambda: {"sub": "admin"}
+    yield ring
+    app.dependency_overrides.pop(verify_access_token, None)
+
+def profiled(ring, **kwargs):
+    return TestClient(ProfilingMiddleware(app, ring=ring, **kwargs))
+
+def test_admin_header_profiles_request_and_profile_downloads(ring):
+    params = {"experience": 3, "location": "Delhi", "department": "HR"}
+    plain = profiled(ring, token="secret").get("/tools/candidate/search", params=params)
+    assert "x-mcp-profile-id" not in plain.headers
+    assert ring.list() == []
+
+    resp = profiled(ring, token="secret").get(
+        "/tools/candidate/search", params=params, headers={"X-MCP-Profile": "secret"})
+    assert resp.status_code == 200
+    profile_id = resp.headers["x-mcp-profile-id"]
+
+    (summary,) = client.get("/debug/profiles").json()["profiles"]
+    assert summary["id"] == int(profile_id)
+    assert summary["path"] == "/tools/candidate/search"
+    assert (summary["status"], summary["trigger"]) == (200, "header")
+
+    # the search ran on the thread pool and is merged into the report
+    report = client.get(f"/debug/profiles/{profile_id}").text
+    assert "candidate_service.py" in report
+    raw = client.get(f"/debug/profiles/{profile_id}", params={"format": "pstats"})
+    assert raw.headers["content-type"] == "application/octet-stream"
+    assert isinstance(marshal.loads(raw.content), dict)
+    assert client.get("/debug/profiles/999999").status_code == 404
+
+def test_sampling_and_allocation_tracing(ring):
+    resp = profiled(ring, sample_rate=1.0, trace_allocations=True).get("/health")
+    profile = ring.get(int(resp.headers["x-mcp-profile-id"]))
+    assert profile.trigger == "sample"
+    assert isinstance(profile.allocations, list)
+
+def test_ring_keeps_most_recent_profiles():
+    ring = ProfileRing(2)
+    profiles = [RequestProfile("GET", f"/{i}", "sample") for i in range(3)]
+    for p in profiles:
+        p.start()
+        p.stop()
+        ring.add(p)
+    assert [s["path"] for s in ring.list()] == ["/2", "/1"]
+    assert ring.get(profiles[0].id) is None
+
+def test_profiles_require_authentication():
+    assert client.get("/debug/profiles").status_code == 401
@@ -1,3 +1,4 @@
+import json
 import pytest
 from fastapi.testclient import TestClient
 
@@ -25,11 +26,11 @@ def make_node(node_id: str):
 def test_list_contexts_empty():
     resp = client.get("/context")
     assert resp.status_code == 200
-    # We always auto-seed the built-in "candidate_search"
+    # We always auto-seed the built-in search tools
     body = resp.json()
     ids = {t["id"] for t in body["tools"]}
 
-    assert ids == {"candidate_search"}
+    assert ids == {"candidate_search", "candidate_text_search", "candidate_facets"}
 
 def test_register_and_get_context():
     node = make_node("test1")
@@ -64,5 +65,92 @@ def test_list_multiple_contexts():
     tools = resp.json()["tools"]
     # Ensure both IDs are present
     ids = {t["id"] for t in tools}
-    # Should include both user-registered plus the built-in
-    assert ids == {"candidate_search", "one", "two"}
+    # Should include both user-registered plus the built-ins
+    assert ids == {"candidate_search", "candidate_text_search", "candidate_facets", "one", "two"}
+
+def test_discovery_etag_and_conditional_get():
+    resp = client.get("/context")
+    etag = resp.headers["etag"]
+    assert etag.startswith('"')
+
+    not_modified = client.get("/context", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    # /.well-known/mcp.json serves the same cached document
+    alias = client.get("/.well-known/mcp.json", headers={"If-None-Match": etag})
+    assert alias.status_code == 304
+
+    # registering a node changes the document and its ETag
+    client.post("/context", json=make_node("fresh"))
+    changed = client.get("/context", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert "fresh" in {t["id"] for t in changed.json()["tools"]}
+
+def test_flat_and_tools_discovery_are_conditional():
+    client.post("/context", json=make_node("flat"))
+    for path in ("/context-all", "/mcp/.well-known/mcp-tools"):
+        first = client.get(path)
+        assert first.status_code == 200
+        again = client.get(path, headers={"If-None-Match": first.headers["etag"]})
+        assert again.status_code == 304
+    assert [n["id"] for n in client.get("/context-all").json()] == ["flat"]
+
+def test_bulk_register_reports_per_item_status():
+    client.post("/context", json=make_node("existing"))
+    batch = [
+        make_node("a"),
+        make_node("existing"),
+        {"id": "broken"},
+        make_node("a"),
+        make_node("b"),
+    ]
+    resp = client.post("/context/bulk", json=batch)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["applied"] is True
+    assert [i["status"] for i in body["items"]] == [
+        "created", "conflict", "invalid", "conflict", "created",
+    ]
+    assert (body["created"], body["conflicts"], body["invalid"]) == (2, 2, 1)
+    assert {"a", "b", "existing"} <= set(STORE)
+
+def test_bulk_register_atomic_applies_nothing_on_conflict():
+    client.post("/context", json=make_node("existing"))
+    batch = [make_node("x"), make_node("existing")]
+    body = client.post("/register/bulk?atomic=true", json=batch).json()
+    assert body["applied"] is False
+    assert [i["status"] for i in body["items"]] == ["skipped", "conflict"]
+    assert "x" not in STORE
+
+def test_bulk_register_ndjson():
+    lines = [json.dumps(make_node("n1")), "{not json", json.dumps(make_node("n2"))]
+    resp = client.post(
+        "/context/bulk",
+        content="\n".join(lines),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    statuses = [i["status"] for i in resp.json()["items"]]
+    assert statuses == ["created", "invalid", "created"]
+
+def test_resolve_partial_lists_missing():
+    client.post("/context", json=make_node("one"))
+    strict = client.post("/resolve", json=["one", "nope"])
+    assert strict.status_code == 404
+
+    full = client.post("/resolve", json=["one"]).json()
+    assert set(full) == {"bundle"}
+
+    partial = client.post("/resolve?partial=true", json=["one", "nope"]).json()
+    assert [n["id"] for n in partial["bundle"]] == ["one"]
+    assert partial["missing"] == ["nope"]
+
+def test_text_search_is_not_listed_without_the_text_index(monkeypatch):
+    from app import config
+    monkeypatch.setattr(config, "TEXT_INDEX_ENABLED", False)
+    ids = {t["id"] for t in client.get("/context").json()["tools"]}
+    assert ids == {"candidate_search", "candidate_facets"}
+    r = client.post("/mcp", json={"jsonrpc": "2.0", "id": 1, "method": "tools/list"})
+    assert "candidate_text_search" not in {t["name"] for t in r.json()["result"]["tools"]}
@@ -0,0 +1,123 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.search_cache import SearchCache
+
+ROWS = [
+    {"id": str(i), "name": f"C{i}", "experience": i, "location": "Pune", "department": "Sales"}
+    for i in range(10)
+]
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_compute(calls):
+    def compute(floor, location, department):
+        calls.append((floor, location, department))
+        return [r for r in ROWS if r["experience"] >= floor]
+    return compute
+
+def test_hit_reuses_bucket_and_filters_experience():
+    cache = SearchCache(maxsize=4, ttl=60, bucket=5)
+    calls = []
+    compute = make_compute(calls)
+
+    first = asyncio.run(cache.get_or_compute(6, "Pune", "Sales", 1, compute))
+    second = asyncio.run(cache.get_or_compute(8, "PUNE", "sales", 1, compute))
+
+    assert [r["experience"] for r in first] == [6, 7, 8, 9]
+    assert [r["experience"] for r in second] == [8, 9]
+    assert calls == [(5, "Pune", "Sales")]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+def test_version_change_and_ttl_invalidate():
+    clock = FakeClock()
+    cache = SearchCache(maxsize=4, ttl=10, clock=clock)
+    calls = []
+    compute = make_compute(calls)
+
+    asyncio.run(cache.get_or_compute(1, "Pune", "Sales", 1, compute))
+    asyncio.run(cache.get_or_compute(1, "Pune", "Sales", 2, compute))
+    clock.now = 11
+    asyncio.run(cache.get_or_compute(1, "Pune", "Sales", 2, compute))
+
+    assert len(calls) == 3
+    stats = cache.stats()
+    assert stats["invalidations"] == 1
+    assert stats["expirations"] == 1
+
+def test_lru_eviction():
+    cache = SearchCache(maxsize=2, ttl=60)
+    compute = make_compute([])
+    for exp in (1, 2, 1, 3):
+        asyncio.run(cache.get_or_compute(exp, "Pune", "Sales", 1, compute))
+    # 2 was least recently used when 3 came in
+    assert set(cache._entries) == {("pune", "sales", 1), ("pune", "sales", 3)}
+    assert cache.stats()["evictions"] == 1
+
+def test_concurrent_misses_compute_once():
+    cache = SearchCache(maxsize=4, ttl=60)
+    calls = []
+
+    async def compute(floor, location, department):
+        calls.append(floor)
+        await asyncio.sleep(0.01)
+        return ROWS
+
+    async def run():
+        return await asyncio.gather(
+            *(cache.get_or_compute(0, "Pune", "Sales", 1, compute) for _ in range(5))
+        )
+
+    results = asyncio.run(run())
+    assert calls == [0]
+    assert all(r == ROWS for r in results)
+    assert cache.stats()["coalesced"] == 4
+
+def test_cancelled_leader_does_not_fail_waiters():
+    cache = SearchCache(maxsize=4, ttl=60)
+
+    async def compute(floor, location, department):
+        await asyncio.sleep(0.02)
+        return ROWS
+
+    async def run():
+        leader = asyncio.ensure_future(cache.get_or_compute(0, "Pune", "Sales", 1, compute))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(cache.get_or_compute(0, "Pune", "Sales", 1, compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower, leader.cancelled()
+
+    rows, leader_cancelled = asyncio.run(run())
+    assert rows == ROWS
+    assert leader_cancelled
+    assert cache.stats()["size"] == 1
+
+def test_cache_stats_endpoint():
+    resp = TestClient(app).get("/tools/candidate/search/cache")
+    assert resp.status_code == 200
+    assert {"hits", "misses", "evictions", "size"} <= set(resp.json())
+
+def test_buckets_larger_than_max_rows_bypass_the_cache(monkeypatch):
+    from app.services.search_cache import SEARCH_CACHE, cached_search
+
+    monkeypatch.setattr(SEARCH_CACHE, "max_rows", 0)
+    before = SEARCH_CACHE.stats()
+    rows = asyncio.run(cached_search(0, "Mumbai", "Engineering"))
+    with TestClient(app).stream(
+        "GET", "/tools/candidate/search/sse",
+        params={"experience": 0, "location": "Mumbai", "department": "Engineering"},
+    ) as resp:
+        body = "".join(resp.iter_text())
+    assert [c["name"] for c in rows] == ["Alice"]
+    assert '"name": "Alice"' in body
+    after = SEARCH_CACHE.stats()
+    assert (after["hits"], after["misses"], after["size"]) == (before["hits"], before["misses"], before["size"])
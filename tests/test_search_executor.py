@@ -0,0 +1,147 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services import candidate_service
+from app.services.candidate_service import SORTS, CandidateStore
+from app.services.search_executor import SearchExecutor, merge_pages, shard_of
+from benchmarks.synthetic import generate_candidates
+
+ROWS = list(generate_candidates(600, seed=3))
+QUERY = (2, ROWS[0]["location"], ROWS[0]["department"])
+
+@pytest.fixture
+def store(monkeypatch):
+    store = CandidateStore(ROWS, text_index=False)
+    monkeypatch.setattr(candidate_service, "CANDIDATE_STORE", store)
+    return store
+
+def walk(page_fn, sort, limit):
+    rows, after = [], None
+    while True:
+        page, after = page_fn(*QUERY, sort, limit, after)
+        rows.extend(page)
+        if after is None:
+            return rows
+
+def test_merged_shard_pages_match_a_single_store(store):
+    shards = [CandidateStore([c for c in ROWS if shard_of(c["id"], 3) == i], text_index=False) for i in range(3)]
+
+    def sharded_page(*args):
+        return merge_pages([s.page(*args) for s in shards], args[3], args[4])
+
+    for sort in SORTS:
+        expected = store.page(*QUERY, sort)[0]
+        assert walk(sharded_page, sort, 7) == expected
+        assert sharded_page(*QUERY, sort, None, None)[0] == expected
+
+def test_process_mode_scans_shards_in_parallel_workers(store, monkeypatch):
+    executor = SearchExecutor("process", workers=2, shards=3)
+
+    async def scenario():
+        found = await executor.search(*QUERY)
+        page = await executor.page(*QUERY, "name", 5)
+        # a new dataset version rebuilds the shards
+        monkeypatch.setattr(candidate_service, "CANDIDATE_STORE", store.apply(deletes=[found[0]["id"]]))
+        after_delete = await executor.search(*QUERY)
+        return found, page, after_delete
+
+    try:
+        found, page, after_delete = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+    assert found == store.search(*QUERY)
+    assert page == store.page(*QUERY, "name", 5)
+    assert after_delete == found[1:]
+
+def test_thread_mode_keeps_the_loop_responsive(monkeypatch):
+    class SlowStore(CandidateStore):
+        def search(self, *args):
+            time.sleep(0.3)
+            return super().search(*args)
+
+    monkeypatch.setattr(candidate_service, "CANDIDATE_STORE", SlowStore(ROWS, text_index=False))
+
+    async def ticks_during_search(executor):
+        search = asyncio.ensure_future(executor.search(*QUERY))
+        ticks = 0
+        while not search.done():
+            await asyncio.sleep(0.01)
+            ticks += 1
+        return ticks
+
+    threaded = SearchExecutor("thread", workers=2)
+    try:
+        assert asyncio.run(ticks_during_search(threaded)) >= 10
+    finally:
+        threaded.shutdown()
+    assert asyncio.run(ticks_during_search(SearchExecutor("inline"))) <= 1
+
+def test_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        SearchExecutor("gpu")
+
+def test_oversized_sse_search_streams_from_the_shards(store, monkeypatch):
+    import json
+    from app.routers import tools
+    from app.services.search_cache import SEARCH_CACHE
+
+    executor = SearchExecutor("process", workers=2, shards=3)
+    scatters = []
+    scatter = executor._scatter
+
+    async def counting_scatter(fn, *args):
+        scatters.append(fn.__name__)
+        return await scatter(fn, *args)
+
+    monkeypatch.setattr(executor, "_scatter", counting_scatter)
+    monkeypatch.setattr(tools, "SEARCH_EXECUTOR", executor)
+    monkeypatch.setattr(SEARCH_CACHE, "max_rows", 0)
+
+    async def stream():
+        return [event async for event in tools.event_generator(*QUERY, batch_size=4)]
+
+    try:
+        events = asyncio.run(stream())
+    finally:
+        executor.shutdown()
+    frames = [e[len(b"event: results\r\ndata: "):-4] for e in events if isinstance(e, bytes)]
+    streamed = [c for frame in frames for c in json.loads(frame)]
+    expected = store.search(*QUERY)
+    assert streamed == expected
+    assert len(scatters) == -(-len(expected) // 4) and set(scatters) == {"_shard_page"}
+    assert json.loads(events[-1]["data"]) == {"total": len(expected)}
+
+def _held_shards():
+    from app.services import search_executor
+    return sorted(search_executor._worker_shards)
+
+@pytest.mark.parametrize("kind", ["columnar", "snapshot"])
+def test_workers_hold_only_their_own_column_shards(kind, tmp_path, monkeypatch):
+    from app.services.candidate_columns import CandidateColumns, ColumnarCandidateStore
+    from app.services.candidate_snapshot import SnapshotCandidateStore, write_snapshot
+
+    columns = CandidateColumns.from_records(ROWS)
+    if kind == "snapshot":
+        write_snapshot(columns, str(tmp_path / "pool.snap"))
+        store = SnapshotCandidateStore(str(tmp_path / "pool.snap"))
+    else:
+        store = ColumnarCandidateStore(columns)
+    monkeypatch.setattr(candidate_service, "CANDIDATE_STORE", store)
+    executor = SearchExecutor("process", workers=2, shards=4)
+
+    async def scenario():
+        found = await executor.search(*QUERY)
+        pages = [await executor.page(*QUERY, sort, 5) for sort in SORTS]
+        loop = asyncio.get_running_loop()
+        held = [await loop.run_in_executor(pool, _held_shards) for pool in executor._processes]
+        return found, pages, held
+
+    try:
+        found, pages, held = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+    assert found == store.search(*QUERY)
+    assert pages == [store.page(*QUERY, sort, 5) for sort in SORTS]
+    assert held == [[0, 2], [1, 3]]
@@ -0,0 +1,129 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.routing import Route
+
+from app import config
+from app.main import app
+from app.routers.tools import _event_source
+from app.services.sse_replay import ReplayBuffer
+
+client = TestClient(app)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def counting_source(n, calls):
+    async def source():
+        calls.append(1)
+        for i in range(n):
+            yield {"event": "n", "data": str(i)}
+    return source()
+
+def data_lines(frames):
+    return [line for f in frames for line in f.decode().split("\r\n") if line.startswith("data: ")]
+
+def test_reconnect_resumes_without_restarting_the_source():
+    buffer, calls = ReplayBuffer(max_streams=4, max_bytes=1 << 16, ttl=60), []
+
+    async def scenario():
+        stream = buffer.open("alice", counting_source(5, calls))
+        first = buffer.events(stream)
+        got = [await first.__anext__(), await first.__anext__()]
+        await first.aclose()  # connection dropped after event 2
+        assert got[1].startswith(f"id: {stream.id}-2\r\n".encode())
+
+        resumed, seq = buffer.resume(f"{stream.id}-1", "alice")
+        return [f async for f in buffer.events(resumed, seq)]
+
+    rest = asyncio.run(scenario())
+    assert data_lines(rest) == ["data: 1", "data: 2", "data: 3", "data: 4"]
+    assert len(calls) == 1
+    assert buffer.stats()["resumed"] == 1
+
+def test_unresumable_ids_fall_back():
+    clock = FakeClock()
+    buffer = ReplayBuffer(max_streams=4, max_bytes=60, ttl=10, clock=clock)
+
+    async def drain(stream):
+        return [f async for f in buffer.events(stream)]
+
+    stream = buffer.open("alice", counting_source(5, []))
+    asyncio.run(drain(stream))
+    assert buffer.resume(f"{stream.id}-4", "alice") is not None
+    # another subject, a malformed id, an event trimmed from the ring
+    assert buffer.resume(f"{stream.id}-4", "mallory") is None
+    assert buffer.resume("garbage", "alice") is None
+    assert buffer.resume(f"{stream.id}-1", "alice") is None
+    clock.now = 11
+    assert buffer.resume(f"{stream.id}-4", "alice") is None
+    assert len(buffer) == 0
+
+def test_dropped_connection_mid_pull_does_not_break_the_source():
+    buffer = ReplayBuffer(max_streams=4, max_bytes=1 << 16, ttl=60)
+
+    async def scenario():
+        gate = asyncio.Event()
+
+        async def source():
+            await gate.wait()
+            yield {"event": "late", "data": "x"}
+
+        stream = buffer.open("alice", source())
+        reader = asyncio.ensure_future(buffer.events(stream).__anext__())
+        await asyncio.sleep(0)
+        reader.cancel()
+        gate.set()
+        resumed, seq = buffer.resume(f"{stream.id}-0", "alice")
+        return [f async for f in buffer.events(resumed, seq)]
+
+    assert data_lines(asyncio.run(scenario())) == ["data: x"]
+
+def test_sse_endpoint_honours_last_event_id():
+    qp = {"experience": 0, "location": "Mumbai", "department": "Engineering"}
+
+    def read(headers=None):
+        ids, names = [], []
+        with client.stream("GET", "/tools/candidate/search/sse", params=qp, headers=headers or {}) as resp:
+            assert resp.status_code == 200
+            for raw in resp.iter_lines():
+                line = (raw.decode() if isinstance(raw, bytes) else raw).strip()
+                if line.startswith("id: "):
+                    ids.append(line[4:])
+                elif line.startswith("event: "):
+                    names.append(line[7:])
+        return ids, names
+
+    ids, names = read()
+    assert names == ["prompt", "results", "done"]
+    resumed_ids, resumed_names = read({"Last-Event-ID": ids[0]})
+    assert resumed_names == ["results", "done"]
+    assert resumed_ids == ids[1:]
+    # an unknown id starts a fresh stream
+    _, fresh = read({"Last-Event-ID": "expired-3"})
+    assert fresh == ["prompt", "results", "done"]
+
+def _stream_body(monkeypatch, heartbeat):
+    monkeypatch.setattr(config, "SSE_HEARTBEAT", heartbeat)
+
+    async def events():
+        await asyncio.sleep(0.2)
+        yield {"event": "done", "data": "{}"}
+
+    stream_app = Starlette(routes=[Route("/s", lambda request: _event_source(events()))])
+    with TestClient(stream_app).stream("GET", "/s") as resp:
+        return "".join(resp.iter_text())
+
+def test_heartbeat_is_a_comment_and_zero_disables_it(monkeypatch):
+    body = _stream_body(monkeypatch, 0.05)
+    assert ": keepalive" in body
+    assert "event: ping" not in body
+
+    body = _stream_body(monkeypatch, 0)
+    assert body.count("keepalive") == 0
+    assert "event: done" in body
@@ -0,0 +1,28 @@
+import subprocess
+import sys
+
+# Measured at ~0.4s cumulative for app.main (mostly fastapi/pydantic) on a
+# warm cache; the budget leaves headroom for slow CI machines.
+IMPORT_BUDGET_SECONDS = 1.5
+DEFERRED_MODULES = ("jose", "cryptography", "httpx", "sse_starlette", "uvicorn", "numpy")
+
+def import_app():
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         "import sys, app.main; print(' '.join(sorted(sys.modules)))"],
+        capture_output=True, text=True, check=True,
+    )
+
+def test_heavy_dependencies_are_not_imported_with_the_app():
+    loaded = set(import_app().stdout.split())
+    assert not [m for m in DEFERRED_MODULES if m in loaded]
+
+def test_app_import_stays_within_budget():
+    # -X importtime lines: "import time: self [us] | cumulative | name"
+    result = import_app()
+    cumulative = next(
+        int(line.split("|")[1])
+        for line in result.stderr.splitlines()
+        if line.split("|")[-1].strip() == "app.main"
+    )
+    assert cumulative / 1e6 < IMPORT_BUDGET_SECONDS
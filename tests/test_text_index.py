@@ -0,0 +1,104 @@
+from app.services.text_index import TextIndex, tokenize
+
+PROFILES = [
+    {"id": "1", "name": "Asha Rao", "experience": 9, "location": "Bengaluru",
+     "department": "Engineering", "skills": ["python", "backend", "django"]},
+    {"id": "2", "name": "Vikram Shah", "experience": 2, "location": "Bengaluru",
+     "department": "Engineering", "skills": ["python", "data"]},
+    {"id": "3", "name": "Neha Iyer", "experience": 10, "location": "Mumbai",
+     "department": "Engineering", "skills": ["java", "backend"]},
+    {"id": "4", "name": "Ravi Menon", "experience": 6, "location": "Delhi",
+     "department": "HR", "skills": []},
+]
+
+def test_tokenize_folds_case():
+    assert tokenize("Python, BACKEND/Bengaluru") == ["python", "backend", "bengaluru"]
+
+def test_bm25_ranks_best_match_first():
+    index = TextIndex(PROFILES)
+    ranked = index.search("python backend Bengaluru senior", limit=3)
+    ids = [c["id"] for _, c in ranked]
+    assert ids[0] == "1"
+    assert set(ids) == {"1", "2", "3"}
+    scores = [s for s, _ in ranked]
+    assert scores == sorted(scores, reverse=True)
+
+def test_match_all_intersects():
+    index = TextIndex(PROFILES)
+    assert {c["id"] for _, c in index.search("backend senior", match="all")} == {"1", "3"}
+    assert index.search("backend hr", match="all") == []
+    assert index.search("nosuchterm", match="any") == []
+
+def test_incremental_add_and_update():
+    index = TextIndex(PROFILES[:2])
+    assert index.search("java") == []
+    index.add(PROFILES[2])
+    assert [c["id"] for _, c in index.search("java")] == ["3"]
+    index.add(dict(PROFILES[2], skills=["go"]))
+    assert index.search("java") == []
+    assert [c["id"] for _, c in index.search("go")] == ["3"]
+    assert len(index) == 3
+
+def test_intersection_with_skips_on_long_lists():
+    docs = [
+        {"id": str(i), "name": "x", "experience": 1, "location": "even" if i % 2 == 0 else "odd",
+         "department": "triple" if i % 3 == 0 else "other"}
+        for i in range(1000)
+    ]
+    index = TextIndex(docs)
+    hits = index.search("even triple", limit=1000, match="all")
+    assert sorted(int(c["id"]) for _, c in hits) == list(range(0, 1000, 6))
+
+def test_updates_keep_ranking_and_idf_stable():
+    index = TextIndex(PROFILES)
+    before = index.search("python backend Bengaluru senior")
+    # churn every profile many times without changing its content
+    for _ in range(50):
+        for profile in PROFILES:
+            index.add(dict(profile))
+    after = index.search("python backend Bengaluru senior")
+    assert [(s, c["id"]) for s, c in after] == [(s, c["id"]) for s, c in before]
+    assert all(score > 0 for score, _ in after)
+    assert index.search("hr", match="all")[0][0] > 0
+
+def test_tombstones_are_compacted():
+    docs = [{"id": str(i), "name": f"n{i}", "experience": 1, "location": "pune",
+             "department": "eng"} for i in range(100)]
+    index = TextIndex(docs)
+    for _ in range(30):
+        for d in docs:
+            index.add(dict(d))
+    assert len(index) == 100
+    assert len(index._docs) < 100 + 1024 + 100
+    hits = index.search("pune eng", limit=1000, match="all")
+    assert sorted(int(c["id"]) for _, c in hits) == list(range(100))
+
+def test_copy_is_isolated_from_later_writes_to_the_original():
+    index = TextIndex(PROFILES[:2])
+    snapshot = index.copy()
+    index.add({"id": "9", "name": "Kiran", "experience": 4, "location": "Pune",
+               "department": "Engineering", "skills": ["python"]})
+    assert {c["id"] for _, c in snapshot.search("python", limit=10)} == {"1", "2"}
+    assert {c["id"] for _, c in index.search("python", limit=10)} == {"1", "2", "9"}
+
+def test_any_match_prunes_without_changing_the_top_k(monkeypatch):
+    import random
+    rng = random.Random(7)
+    words = ["python", "rust", "go", "java", "kafka", "spark", "sql", "react"]
+    docs = [
+        {"id": str(i), "name": "x", "experience": rng.randrange(12), "location": "pune",
+         "department": "eng", "skills": ["python"] + rng.choices(words, k=rng.randrange(1, 6))}
+        for i in range(3000)
+    ]
+    index = TextIndex(docs)
+    for query in ("python rust", "kafka spark sql", "rust go senior", "python java react junior"):
+        assert index.search(query, limit=10) == index.search(query, limit=len(docs))[:10]
+
+    scored = []
+    norm = TextIndex._norm
+    monkeypatch.setattr(TextIndex, "_norm", lambda self, doc, avgdl: scored.append(doc) or norm(self, doc, avgdl))
+    docs[1500]["skills"] = ["rust"] * 5
+    index = TextIndex(docs)
+    assert index.search("python rust", limit=1)[0][1]["id"] == "1500"
+    # once the rare term's best document is in, the common term stops driving the walk
+    assert len(scored) < len(docs)
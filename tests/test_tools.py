@@ -18,13 +18,20 @@ def test_candidate_search_sse_stream():
         assert resp.headers["content-type"].startswith("text/event-stream")
 
         # Read lines while the stream is open
-        lines = []
+        lines, ids = [], []
         for raw in resp.iter_lines():
             if not raw or not raw.strip():
                 continue
             line = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+            if line.startswith("id: "):
+                ids.append(line.strip()[len("id: "):])
+                continue
             lines.append(line)
 
+    # Every event carries an id: <stream>-1, <stream>-2, ...
+    stream = ids[0].rsplit("-", 1)[0]
+    assert ids == [f"{stream}-{n}" for n in range(1, len(ids) + 1)]
+
     # Expect four lines: event/prompt, data/prompt, event/results, data/results
       # strip off any trailing newline when comparing
     assert lines[0].strip() == "event: prompt"
@@ -52,3 +59,90 @@ def test_tools_health_and_discovery():
     assert "tools" in body
     ids = {t["id"] for t in body["tools"]}
     assert "candidate_search" in ids
+
+def read_events(resp):
+    """Collect (event, data) pairs from an SSE response."""
+    events, name = [], None
+    for raw in resp.iter_lines():
+        line = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+        line = line.strip()
+        if line.startswith("event: "):
+            name = line[len("event: "):]
+        elif line.startswith("data: "):
+            events.append((name, line[len("data: "):]))
+    return events
+
+def test_candidate_search_sse_streams_batches(monkeypatch):
+    from app.services import candidate_service
+    from app.services.candidate_service import CandidateStore
+
+    store = CandidateStore(
+        {"id": str(i), "name": f"C{i}", "experience": i % 10,
+         "location": "Pune", "department": "Sales"}
+        for i in range(25)
+    )
+    monkeypatch.setattr(candidate_service, "CANDIDATE_STORE", store)
+
+    qp = {"experience": 0, "location": "Pune", "department": "Sales", "batch_size": 10}
+    with client.stream("GET", "/tools/candidate/search/sse", params=qp) as resp:
+        events = read_events(resp)
+
+    names = [e for e, _ in events]
+    assert names == ["prompt", "results", "results", "results", "done"]
+    sizes = [len(json.loads(d)) for e, d in events if e == "results"]
+    assert sizes == [10, 10, 5]
+    assert json.loads(events[-1][1]) == {"total": 25}
+
+def test_candidate_search_sse_pages_with_cursor(monkeypatch):
+    from app.services import candidate_service
+    from app.services.candidate_service import CandidateStore
+
+    store = CandidateStore(
+        {"id": f"{i:02d}", "name": f"C{i}", "experience": i,
+         "location": "Pune", "department": "Sales"}
+        for i in range(7)
+    )
+    monkeypatch.setattr(candidate_service, "CANDIDATE_STORE", store)
+
+    seen, cursor = [], None
+    while True:
+        qp = {"experience": 1, "location": "Pune", "department": "Sales",
+              "sort": "experience_desc", "limit": 4}
+        if cursor:
+            qp["cursor"] = cursor
+        with client.stream("GET", "/tools/candidate/search/sse", params=qp) as resp:
+            events = read_events(resp)
+        for name, data in events:
+            if name == "results":
+                seen.extend(c["experience"] for c in json.loads(data))
+        cursor = json.loads(events[-1][1])["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [6, 5, 4, 3, 2, 1]
+
+def test_candidate_search_sse_rejects_bad_cursor():
+    qp = {"experience": 1, "location": "Pune", "department": "Sales", "cursor": "junk"}
+    assert client.get("/tools/candidate/search/sse", params=qp).status_code == 400
+    qp = {"experience": 1, "location": "Pune", "department": "Sales", "sort": "salary"}
+    assert client.get("/tools/candidate/search/sse", params=qp).status_code == 400
+
+def test_candidate_text_search_sse():
+    qp = {"q": "engineering bengaluru", "limit": 5}
+    with client.stream("GET", "/tools/candidate/text-search/sse", params=qp) as resp:
+        assert resp.status_code == 200
+        events = read_events(resp)
+    assert [e for e, _ in events] == ["prompt", "results", "done"]
+    results = json.loads(events[1][1])
+    assert results[0]["name"] == "Charlie"
+    assert results[0]["score"] > results[-1]["score"]
+
+def test_candidate_facets_endpoint():
+    resp = client.get("/tools/candidate/facets", params={"experience": 5, "department": "engineering"})
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "total": 2,
+        "location": {"Bengaluru": 1, "Mumbai": 1},
+        "department": {"Engineering": 2},
+        "experience": {"5-9": 2},
+    }
+    assert client.get("/tools/candidate/facets", params={"bucket": 0}).status_code == 422